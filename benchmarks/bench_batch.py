@@ -0,0 +1,49 @@
+"""Scaling of ``sweetmorse.batch`` over worker processes.
+
+Converts plain text to binary and back with 1, 2, 4 and 8 jobs.  One job
+converts in this process, the baseline for the speedups shown.
+"""
+import sweetmorse.constants as c
+from sweetmorse import batch
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+
+def main():
+    parser = argument_parser(__doc__, default_sizes='1M')
+    parser.add_argument(
+        '--jobs',
+        default='1,2,4,8',
+        type=lambda value: [int(jobs) for jobs in value.split(',')],
+        help='comma separated numbers of worker processes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        plain_text = plain_text_corpus(SIZES[size])
+        binary = Morse.from_plain_text(plain_text).binary
+
+        for name, value, from_format, to_format in [
+            ('PLAIN to BINARY', plain_text, c.PLAIN, c.BINARY),
+            ('BINARY to PLAIN', binary, c.BINARY, c.PLAIN),
+        ]:
+            baseline = None
+            for jobs in args.jobs:
+                seconds = best_of(
+                    lambda: batch.convert(
+                        value, from_format, to_format, jobs=jobs
+                    ),
+                    repeat=args.repeat,
+                )
+                report(
+                    '{} ({} jobs)'.format(name, jobs),
+                    size,
+                    seconds,
+                    baseline=baseline,
+                )
+                if baseline is None:
+                    baseline = seconds
+
+
+if __name__ == '__main__':
+    main()
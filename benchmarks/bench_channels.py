@@ -0,0 +1,127 @@
+"""Decoding many CW channels from one audio stream.
+
+Mixes 1, 10 and 50 synthetic channels spread over 400-3400 Hz and decodes
+them with one ``MultiToneDecoder``, against one ``ToneDecoder`` per
+channel that reads all of the samples again.  Reports seconds of audio
+decoded per CPU-second and how many channels decoded correctly.
+"""
+import argparse
+import random
+import time
+
+from sweetmorse import audio, tone
+from sweetmorse.morse import Morse
+from sweetmorse.timing import AdaptiveTiming, wpm_to_unit_duration
+
+_WPM = 15
+_LOW = 400
+_HIGH = 3400
+
+
+def cpu_seconds(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+    return min(timings)
+
+
+def channels(count, repeat_message, seed=0):
+    rng = random.Random(seed)
+    frequencies = [
+        _LOW + (_HIGH - _LOW) * index / max(1, count - 1)
+        for index in range(count)
+    ] if count > 1 else [audio.DEFAULT_FREQUENCY]
+    messages = [
+        ' '.join(
+            ['CQ DE K{}ABC {}'.format(index, rng.randint(0, 999))] *
+            repeat_message
+        )
+        for index in range(count)
+    ]
+
+    mixed = tone.np.zeros(0)
+    for frequency, message in zip(frequencies, messages):
+        samples = tone.np.frombuffer(
+            Morse.from_plain_text(message).to_pcm(
+                wpm=_WPM * rng.uniform(0.9, 1.1), frequency=frequency
+            ),
+            dtype='<i2',
+        )
+        if len(samples) > len(mixed):
+            mixed = tone.np.append(
+                mixed, tone.np.zeros(len(samples) - len(mixed))
+            )
+        mixed[:len(samples)] += samples / float(count)
+    return frequencies, messages, mixed.astype('<i2').tobytes()
+
+
+def decode_together(frequencies, pcm):
+    decoder = tone.MultiToneDecoder(
+        frequencies,
+        timing=lambda: AdaptiveTiming(wpm_to_unit_duration(_WPM)),
+    )
+    return [
+        fed + finished
+        for fed, finished in zip(decoder.feed(pcm), decoder.finish())
+    ]
+
+
+def decode_apart(frequencies, pcm):
+    decoded = []
+    for frequency in frequencies:
+        decoder = tone.ToneDecoder(
+            frequency=frequency,
+            timing=AdaptiveTiming(wpm_to_unit_duration(_WPM)),
+        )
+        try:
+            decoded.append(decoder.feed(pcm) + decoder.finish())
+        except ValueError:
+            decoded.append(None)
+    return decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--channels',
+        default='1,10,50',
+        type=lambda value: [int(count) for count in value.split(',')])
+    parser.add_argument(
+        '--repeat-message',
+        default=5,
+        type=int,
+        help='times each channel repeats its message')
+    parser.add_argument('--repeat', default=3, type=int)
+    args = parser.parse_args()
+    if tone.np is None:
+        raise SystemExit('NumPy is not installed')
+
+    for count in args.channels:
+        frequencies, messages, pcm = channels(count, args.repeat_message)
+        audio_seconds = len(pcm) / 2.0 / audio.DEFAULT_SAMPLE_RATE
+
+        for name, decode in [('MultiToneDecoder', decode_together),
+                             ('ToneDecoder per channel', decode_apart)]:
+            decoded = decode(frequencies, pcm)
+            correct = sum(
+                text is not None and text.strip() == message
+                for text, message in zip(decoded, messages)
+            )
+            seconds = cpu_seconds(
+                lambda: decode(frequencies, pcm), args.repeat
+            )
+            print(
+                '{name:<28} {count:>3} channels {rate:>8.0f}x real time '
+                '{correct:>3}/{count} correct'.format(
+                    name=name,
+                    count=count,
+                    rate=audio_seconds / seconds,
+                    correct=correct,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
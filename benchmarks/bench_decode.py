@@ -0,0 +1,62 @@
+"""Binary decoding throughput.
+
+Compares ``Morse.from_binary()`` with the multi-pass split/set/validate
+decoder it replaced.
+"""
+import itertools
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+
+def split_and_validate(value):
+    processed_value = value.strip()
+    if set(processed_value).difference({'0', '1'}):
+        raise ValueError(value)
+
+    words = processed_value.split(c.BINARY_WORD_GAP)
+    distinct_characters = set(
+        itertools.chain(
+            char
+            for word in words
+            for char in word.split(c.BINARY_CHAR_GAP)
+            if char
+        )
+    )
+    if distinct_characters.difference(c.BINARY_CHARS):
+        raise ValueError(value)
+
+    return [
+        ''.join(
+            c.BINARY_TO_PLAIN_TEXT[char]
+            for char in word.split(c.BINARY_CHAR_GAP)
+            if char
+        )
+        for word in words
+    ]
+
+
+def main():
+    args = argument_parser(__doc__).parse_args()
+
+    for size in args.sizes:
+        binary = Morse.from_plain_text(plain_text_corpus(SIZES[size])).binary
+        # Throughput is reported per byte of binary input
+        SIZES[size] = len(binary)
+
+        baseline = best_of(
+            lambda: split_and_validate(binary), repeat=args.repeat
+        )
+        report('from_binary (split and validate)', size, baseline)
+        report(
+            'from_binary (single pass)',
+            size,
+            best_of(lambda: Morse.from_binary(binary), repeat=args.repeat),
+            baseline=baseline,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Plain text to human-readable and binary encoding.
+
+Compares the precomputed tables behind ``Morse.human_readable`` and
+``Morse.binary`` with the per-character generators they replaced.
+"""
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+
+def per_character(words, plain_text_to_encoded, char_gap, word_gap):
+    return word_gap.join(
+        char_gap.join(plain_text_to_encoded[char] for char in word)
+        for word in words
+    )
+
+
+def uncached(morse):
+    # Morse caches what it encodes, so every run encodes a new one
+    return Morse._from_plain_text(morse.plain_text)
+
+
+def main():
+    args = argument_parser(__doc__).parse_args()
+
+    for size in args.sizes:
+        morse = Morse.from_plain_text(plain_text_corpus(SIZES[size]))
+
+        for name, table, char_gap, word_gap, encode in (
+            (
+                'human_readable',
+                c.PLAIN_TEXT_TO_HUMAN_READABLE,
+                c.HUMAN_READABLE_CHAR_GAP,
+                c.HUMAN_READABLE_WORD_GAP,
+                lambda: uncached(morse).human_readable,
+            ),
+            (
+                'binary',
+                c.PLAIN_TEXT_TO_BINARY,
+                c.BINARY_CHAR_GAP,
+                c.BINARY_WORD_GAP,
+                lambda: uncached(morse).binary,
+            ),
+        ):
+            baseline = best_of(
+                lambda: per_character(
+                    morse.plain_text_words, table, char_gap, word_gap
+                ),
+                repeat=args.repeat,
+            )
+            report(name + ' (per character)', size, baseline)
+            report(
+                name + ' (table)',
+                size,
+                best_of(encode, repeat=args.repeat),
+                baseline=baseline,
+            )
+
+
+if __name__ == '__main__':
+    main()
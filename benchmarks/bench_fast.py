@@ -0,0 +1,50 @@
+"""NumPy keying unit codec against the ``Morse`` string round trip."""
+from sweetmorse import fast
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+_BINARY_TO_UNITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def via_morse(data):
+    binary = Morse.from_plain_text(data.decode('ascii')).binary
+    return binary.encode('ascii').translate(_BINARY_TO_UNITS)
+
+
+def main():
+    args = argument_parser(__doc__).parse_args()
+    if fast.np is None:
+        raise SystemExit('NumPy is not installed')
+
+    for size in args.sizes:
+        data = plain_text_corpus(SIZES[size]).encode('ascii')
+
+        baseline = best_of(lambda: via_morse(data), repeat=args.repeat)
+        report('encode (Morse)', size, baseline)
+        report(
+            'encode (NumPy)',
+            size,
+            best_of(lambda: fast.encode_binary(data), repeat=args.repeat),
+            baseline=baseline,
+        )
+
+        units = fast.encode_binary(data)
+        binary = units.tobytes().translate(
+            bytes.maketrans(b'\x00\x01', b'01')
+        ).decode('ascii')
+        baseline = best_of(
+            lambda: Morse.from_binary(binary).plain_text, repeat=args.repeat
+        )
+        report('decode (Morse)', size, baseline)
+        report(
+            'decode (NumPy)',
+            size,
+            best_of(lambda: fast.decode_binary(units), repeat=args.repeat),
+            baseline=baseline,
+        )
+        assert fast.decode_binary(units) == data.decode('ascii')
+
+
+if __name__ == '__main__':
+    main()
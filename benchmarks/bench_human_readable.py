@@ -0,0 +1,77 @@
+"""Human-readable decoding throughput.
+
+Compares ``Morse.from_human_readable()``, which splits the input once and
+looks every piece up, with the multi-pass split/set/validate decoder it
+replaced and with a walk of the array-indexed code tree, a symbol at a
+time, that ``Morse`` keeps for finding errors.
+"""
+import itertools
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+
+def split_and_validate(value):
+    processed_value = value.strip()
+    words = processed_value.split(c.HUMAN_READABLE_WORD_GAP)
+    distinct_characters = set(
+        itertools.chain(
+            char
+            for word in words
+            for char in word.split(c.HUMAN_READABLE_CHAR_GAP)
+            if char
+        )
+    )
+    if distinct_characters.difference(c.HUMAN_READABLE_CHARS):
+        raise ValueError(value)
+
+    return c.PLAIN_TEXT_WORD_GAP.join(
+        ''.join(
+            c.HUMAN_READABLE_TO_PLAIN_TEXT[char]
+            for char in word.split(c.HUMAN_READABLE_CHAR_GAP)
+            if char
+        )
+        for word in words
+    )
+
+
+def main():
+    args = argument_parser(__doc__).parse_args()
+
+    for size in args.sizes:
+        human_readable = Morse.from_plain_text(
+            plain_text_corpus(SIZES[size])
+        ).human_readable
+        # Throughput is reported per byte of human-readable input
+        SIZES[size] = len(human_readable)
+
+        baseline = best_of(
+            lambda: split_and_validate(human_readable), repeat=args.repeat
+        )
+        report('from_human_readable (split and validate)', size, baseline)
+        report(
+            'from_human_readable (code tree)',
+            size,
+            best_of(
+                lambda: Morse._human_readable_tree_to_plain_text(
+                    human_readable
+                ),
+                repeat=args.repeat,
+            ),
+            baseline=baseline,
+        )
+        report(
+            'from_human_readable (single pass)',
+            size,
+            best_of(
+                lambda: Morse.from_human_readable(human_readable),
+                repeat=args.repeat,
+            ),
+            baseline=baseline,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Peak memory of converting a binary Morse file with the CLI.
+
+Compares reading the file from stdin with ``--input``, which memory-maps
+it.  Every conversion runs in its own process, so its peak resident set
+size is measured on its own.  Rates are per byte of plain text.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+from common import (
+    SIZES, argument_parser, plain_text_corpus, report, run_cli,
+)
+
+
+def write_input(size, input_path):
+    with open(input_path, 'w') as input_file:
+        input_file.write(
+            Morse.from_plain_text(plain_text_corpus(SIZES[size])).binary
+        )
+
+
+def main():
+    if sys.argv[1:2] == ['--write-input']:
+        write_input(*sys.argv[2:])
+        return
+
+    args = argument_parser(__doc__, default_sizes='1M,100M').parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            input_path = os.path.join(directory, size)
+            # Made in a process of its own, see run_cli()
+            subprocess.check_call(
+                [sys.executable, __file__, '--write-input', size, input_path]
+            )
+
+            for name, arguments in (
+                ('stdin', [c.BINARY, c.PLAIN]),
+                ('--input', ['--input', input_path, c.BINARY, c.PLAIN]),
+            ):
+                runs = [
+                    run_cli(arguments, input_path) for _ in range(args.repeat)
+                ]
+                if None in runs:
+                    # Typically killed for running out of memory
+                    print('{:<40} {:>6} failed'.format(name, size))
+                    continue
+                seconds, peak = min(runs)
+                report(name, size, seconds)
+                print('{:<40} {:>6} {:>10.1f} MB peak RSS'.format(
+                    name, size, peak
+                ))
+
+
+if __name__ == '__main__':
+    main()
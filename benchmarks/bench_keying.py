@@ -0,0 +1,62 @@
+"""Keying events against runs split out of the binary string.
+
+Times ``Morse.iter_keying_events()`` and ``Morse.from_keying_events()``
+against grouping ``Morse.binary`` into runs and decoding it back with
+``Morse.from_binary()``.
+"""
+import itertools
+
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+
+def binary_runs(morse):
+    # Morse caches its binary, which would leave the encoding out
+    binary = Morse._from_plain_text(morse.plain_text).binary
+    return [
+        (level == '1', len(list(units)))
+        for level, units in itertools.groupby(binary)
+    ]
+
+
+def main():
+    args = argument_parser(__doc__, default_sizes='1K,1M').parse_args()
+
+    for size in args.sizes:
+        morse = Morse.from_plain_text(plain_text_corpus(SIZES[size]))
+
+        baseline = best_of(lambda: binary_runs(morse), repeat=args.repeat)
+        report('runs of binary', size, baseline)
+        report(
+            'iter_keying_events',
+            size,
+            best_of(
+                lambda: list(morse.iter_keying_events()), repeat=args.repeat
+            ),
+            baseline=baseline,
+        )
+
+        events = list(morse.iter_keying_events())
+        baseline = best_of(
+            lambda: Morse.from_binary(''.join(
+                ('1' if level else '0') * units for level, units in events
+            )),
+            repeat=args.repeat,
+        )
+        report('from_binary of runs', size, baseline)
+        report(
+            'from_keying_events',
+            size,
+            best_of(
+                lambda: Morse.from_keying_events(events), repeat=args.repeat
+            ),
+            baseline=baseline,
+        )
+        print('{:<40} {:>6} {:>10.2f} units per event'.format(
+            'event volume', size, len(morse.binary) / float(len(events))
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Decoding noisy binary Morse.
+
+Compares ``Morse.decode_lenient()`` with decoding every word on its own
+and replacing the words that fail, the way to find bad spots without it.
+One character in a hundred is corrupted.
+"""
+import random
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse, MorseDecodeError
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+_NOISE = 0.01
+
+
+def noisy_binary(plain_text, seed=0):
+    rng = random.Random(seed)
+    return c.BINARY_CHAR_GAP.join(
+        '1111' if char != c.PLAIN_TEXT_WORD_GAP and rng.random() < _NOISE
+        else c.PLAIN_TEXT_TO_BINARY.get(char, '0')
+        for char in plain_text
+    )
+
+
+def word_by_word(binary):
+    words = []
+    for word in binary.split(c.BINARY_WORD_GAP):
+        try:
+            words.append(Morse.from_binary(word).plain_text)
+        except MorseDecodeError:
+            words.append('?')
+    return c.PLAIN_TEXT_WORD_GAP.join(words)
+
+
+def main():
+    args = argument_parser(__doc__).parse_args()
+
+    for size in args.sizes:
+        binary = noisy_binary(plain_text_corpus(SIZES[size]))
+        # Throughput is reported per byte of binary input
+        SIZES[size] = len(binary)
+
+        baseline = best_of(lambda: word_by_word(binary), repeat=args.repeat)
+        report('word by word', size, baseline)
+        report(
+            'decode_lenient()',
+            size,
+            best_of(
+                lambda: Morse.decode_lenient(binary, c.BINARY),
+                repeat=args.repeat,
+            ),
+            baseline=baseline,
+        )
+        report(
+            'decode_lenient(nearest=True)',
+            size,
+            best_of(
+                lambda: Morse.decode_lenient(binary, c.BINARY, nearest=True),
+                repeat=args.repeat,
+            ),
+            baseline=baseline,
+        )
+
+
+if __name__ == '__main__':
+    main()
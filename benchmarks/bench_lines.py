@@ -0,0 +1,59 @@
+"""Converting many short messages, one per line.
+
+Compares a run of ``sweetmorse --lines`` over all the messages with one
+run of the CLI per message, the way to convert them without it, in
+microseconds per message.  The per-message runs are timed on a sample
+only, as they take a while.
+"""
+import os
+import tempfile
+
+import sweetmorse.constants as c
+
+from common import argument_parser, plain_text_corpus, run_cli
+
+_MESSAGES = 100000
+_WORDS_PER_MESSAGE = 5
+_SAMPLE = 20
+
+
+def write_lines(path, messages):
+    with open(path, 'w') as input_file:
+        input_file.write('\n'.join(messages) + '\n')
+
+
+def main():
+    parser = argument_parser(__doc__)
+    args = parser.parse_args()
+
+    words = plain_text_corpus(_MESSAGES * 50).split()
+    messages = [
+        ' '.join(words[start:start + _WORDS_PER_MESSAGE])
+        for start in range(0, len(words), _WORDS_PER_MESSAGE)
+    ][:_MESSAGES]
+    with tempfile.TemporaryDirectory() as directory:
+        all_path = os.path.join(directory, 'all')
+        write_lines(all_path, messages)
+        lines_seconds = min(
+            run_cli(['--lines', c.PLAIN, c.BINARY], all_path)[0]
+            for _ in range(args.repeat)
+        )
+
+        one_path = os.path.join(directory, 'one')
+        one_seconds = 0
+        for message in messages[:_SAMPLE]:
+            write_lines(one_path, [message])
+            one_seconds += run_cli([c.PLAIN, c.BINARY], one_path)[0]
+
+    per_process = one_seconds / _SAMPLE
+    per_line = lines_seconds / len(messages)
+    print('{:<40} {:>10.1f} us/message'.format(
+        'one process per message', per_process * 1e6
+    ))
+    print('{:<40} {:>10.1f} us/message {:>10.1f}x'.format(
+        '--lines', per_line * 1e6, per_process / per_line
+    ))
+
+
+if __name__ == '__main__':
+    main()
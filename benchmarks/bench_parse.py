@@ -0,0 +1,51 @@
+"""Format detection in ``Morse.parse()``.
+
+Compares ``Morse.parse()`` with the detection it replaced, which upper
+cased the whole input and built the set of its symbols before handing the
+raw input to a ``Morse.from_<format>()`` constructor that stripped and
+scanned it again.  Both decode with the same constructors, so the
+difference is the cost of detection.  Rates are per byte of plain text.
+"""
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus, report
+
+
+def parse_with_sets(value):
+    distinct_input_symbols = set(value.strip().upper())
+    if distinct_input_symbols <= c.BINARY_SYMBOLS:
+        return Morse.from_binary(value)
+    elif distinct_input_symbols <= c.HUMAN_READABLE_SYMBOLS:
+        return Morse.from_human_readable(value)
+    elif distinct_input_symbols <= c.PLAIN_TEXT_SYMBOLS:
+        return Morse.from_plain_text(value)
+    raise ValueError(value)
+
+
+def main():
+    args = argument_parser(__doc__).parse_args()
+
+    for size in args.sizes:
+        morse = Morse.from_plain_text(plain_text_corpus(SIZES[size]))
+        for format_, value in (
+            (c.PLAIN, morse.plain_text.lower()),
+            (c.HUMAN_READABLE, morse.human_readable),
+            (c.BINARY, morse.binary),
+        ):
+            # Input typically ends in a newline
+            value += '\n'
+            baseline = best_of(
+                lambda: parse_with_sets(value), repeat=args.repeat
+            )
+            report('parse {} (symbol set)'.format(format_), size, baseline)
+            report(
+                'parse {} (byte table)'.format(format_),
+                size,
+                best_of(lambda: Morse.parse(value), repeat=args.repeat),
+                baseline=baseline,
+            )
+
+
+if __name__ == '__main__':
+    main()
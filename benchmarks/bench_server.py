@@ -0,0 +1,121 @@
+"""Latency of conversions served by ``sweetmorse serve`` under load.
+
+Starts a server on a Unix socket and keeps it busy from several
+connections at once, every one with a number of requests in flight, then
+reports throughput and the median and 99th percentile latency of a
+request.  One run of the CLI per request is the baseline.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import sweetmorse.constants as c
+from sweetmorse.server import AsyncClient
+
+from common import SHORT_MESSAGE, argument_parser, run_cli
+
+_CLI_RUNS = 20
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(
+        len(sorted_values) - 1, int(len(sorted_values) * fraction)
+    )]
+
+
+async def load(path, connections, in_flight, requests):
+    # Latencies in seconds of ``requests`` requests on every connection
+    latencies = []
+
+    async def send(client, slots):
+        async with slots:
+            start = time.perf_counter()
+            await client.convert(SHORT_MESSAGE, c.PLAIN, c.BINARY)
+            latencies.append(time.perf_counter() - start)
+
+    async def connection():
+        client = await AsyncClient.connect(path=path)
+        slots = asyncio.Semaphore(in_flight)
+        try:
+            await asyncio.gather(*(
+                send(client, slots) for _ in range(requests)
+            ))
+        finally:
+            client.close()
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return latencies
+
+
+def wait_for(path, timeout=10):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        if time.time() > deadline:
+            raise RuntimeError('The server did not start')
+        time.sleep(0.01)
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument(
+        '--connections',
+        default=8,
+        type=int,
+        help='connections sending requests at once')
+    parser.add_argument(
+        '--in-flight',
+        default=16,
+        type=int,
+        help='requests sent ahead of their responses on every connection')
+    parser.add_argument(
+        '--requests',
+        default=5000,
+        type=int,
+        help='requests on every connection')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'input')
+        with open(input_path, 'w') as input_file:
+            input_file.write(SHORT_MESSAGE + '\n')
+        cli = sorted(
+            run_cli([c.PLAIN, c.BINARY], input_path)[0]
+            for _ in range(_CLI_RUNS)
+        )
+
+        path = os.path.join(directory, 'socket')
+        server = subprocess.Popen([
+            sys.executable, '-m', 'sweetmorse.main', 'serve', '--socket', path,
+        ])
+        try:
+            wait_for(path)
+            loop = asyncio.new_event_loop()
+            start = time.perf_counter()
+            latencies = sorted(loop.run_until_complete(load(
+                path, args.connections, args.in_flight, args.requests
+            )))
+            seconds = time.perf_counter() - start
+            loop.close()
+        finally:
+            server.terminate()
+            server.wait()
+
+    print('{:<32} {:>12} {:>10} {:>10}'.format(
+        '', 'requests/s', 'p50 ms', 'p99 ms'
+    ))
+    print('{:<32} {:>12,.0f} {:>10.3f} {:>10.3f}'.format(
+        'one CLI run per request', 1 / percentile(cli, 0.5),
+        percentile(cli, 0.5) * 1000, percentile(cli, 0.99) * 1000,
+    ))
+    print('{:<32} {:>12,.0f} {:>10.3f} {:>10.3f}'.format(
+        'serve, {} x {} in flight'.format(args.connections, args.in_flight),
+        len(latencies) / seconds,
+        percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000,
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Start-up time of the CLI, as run over and over by shell scripts.
+
+Times whole runs of ``sweetmorse`` on a short message, with the formats
+alone and with an option, which makes it go through argparse.  An
+interpreter that does nothing at all is the floor under both.  On Python
+3.7 and newer, also reports the time ``python -X importtime`` gives for
+importing ``sweetmorse.main``, not counting what the interpreter imports
+anyway, which tests/test_startup.py holds to ``IMPORT_BUDGET_MS``.
+"""
+import os
+import subprocess
+import sys
+import time
+
+import sweetmorse.constants as c
+
+from common import SHORT_MESSAGE, argument_parser
+
+_COMMANDS = (
+    ('python -c pass', ['-c', 'pass']),
+    ('sweetmorse PLAIN BINARY', ['-m', 'sweetmorse.main', c.PLAIN, c.BINARY]),
+    (
+        'sweetmorse PLAIN BINARY --wpm 20',
+        ['-m', 'sweetmorse.main', c.PLAIN, c.BINARY, '--wpm', '20'],
+    ),
+)
+
+
+def seconds_per_run(arguments, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + arguments,
+            input=SHORT_MESSAGE.encode('ascii'),
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def import_ms(repeat):
+    # Cumulative microseconds from lines like
+    # ``import time:   self [us] | cumulative | imported package``
+    env = dict(os.environ)
+    # Written bytecode, so that only the first run compiles the source
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    best = float('inf')
+    for _ in range(repeat):
+        stderr = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             'import sweetmorse.main'],
+            stderr=subprocess.PIPE, universal_newlines=True, env=env,
+            check=True,
+        ).stderr
+        for line in stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == 'sweetmorse.main':
+                best = min(best, int(fields[1]) / 1000.0)
+    return best
+
+
+def main():
+    parser = argument_parser(__doc__)
+    # Single runs are short and noisy, so take the best of many
+    parser.set_defaults(repeat=50)
+    args = parser.parse_args()
+
+    floor = None
+    for name, arguments in _COMMANDS:
+        seconds = seconds_per_run(arguments, args.repeat)
+        line = '{:<40} {:>10.3f} ms'.format(name, seconds * 1000)
+        if floor is None:
+            floor = seconds
+        else:
+            line += ' {:>+10.3f} ms over python'.format(
+                (seconds - floor) * 1000
+            )
+        print(line)
+
+    if sys.version_info >= (3, 7):
+        print('{:<40} {:>10.3f} ms'.format(
+            'import sweetmorse.main', import_ms(args.repeat)
+        ))
+
+
+if __name__ == '__main__':
+    main()
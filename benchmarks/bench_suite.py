@@ -0,0 +1,233 @@
+"""Throughput and peak memory of every conversion, to catch regressions.
+
+Covers ``Morse.parse()``, every ``Morse.from_*()`` constructor, every
+output format and the CLI end to end on stdin, over three corpora:
+
+* ``short``: a short message, as typed into a keyer
+* ``paragraph``: a paragraph of prose with punctuation
+* ``log``: log lines, 100M characters unless ``--log-size`` says otherwise
+
+Throughput is in plain text characters per second whatever the format, so
+rows compare across formats.  Peak memory is what Python objects allocate
+during one call, or the peak RSS of the process for the CLI.
+
+Save the results of a release with ``--save`` and compare a later run
+with ``--compare``: results more than ``--tolerance`` slower or larger are
+marked with ``!`` and make the exit status 1.  The full log corpus takes a
+while; ``--log-size 1M`` is a quick check.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+from common import (
+    PARAGRAPH, SHORT_MESSAGE, SIZES, argument_parser, best_of, log_corpus,
+    peak_memory, run_cli,
+)
+
+CORPORA = ('short', 'paragraph', 'log')
+# Peaks below this are all as good, so noise in them is no regression
+_MEMORY_FLOOR_MB = 1.0
+_CLI_CONVERSIONS = (
+    (c.PLAIN, c.HUMAN_READABLE),
+    (c.PLAIN, c.BINARY),
+    (c.HUMAN_READABLE, c.PLAIN),
+    (c.BINARY, c.PLAIN),
+)
+
+
+def corpus(name, log_size):
+    if name == 'short':
+        return SHORT_MESSAGE
+    elif name == 'paragraph':
+        return PARAGRAPH
+    return log_corpus(SIZES[log_size])
+
+
+def formats(plain_text):
+    morse = Morse.from_plain_text(plain_text)
+    return {
+        c.PLAIN: plain_text,
+        c.HUMAN_READABLE: morse.human_readable,
+        c.BINARY: morse.binary,
+        c.BINARY_PACKED: morse.binary_bytes,
+    }
+
+
+def uncached(plain_text):
+    # Morse caches what it encodes, so every call encodes a new one
+    return Morse._from_plain_text(plain_text)
+
+
+def cases(plain_text):
+    # (name, function) for every conversion in the library
+    values = formats(plain_text)
+    events = list(uncached(plain_text).iter_keying_events())
+    plain = values[c.PLAIN]
+    human_readable = values[c.HUMAN_READABLE]
+    binary = values[c.BINARY]
+    binary_bytes = values[c.BINARY_PACKED]
+    return (
+        ('parse PLAIN', lambda: Morse.parse(plain)),
+        ('parse HUMAN_READABLE', lambda: Morse.parse(human_readable)),
+        ('parse BINARY', lambda: Morse.parse(binary)),
+        ('from_plain_text', lambda: Morse.from_plain_text(plain)),
+        (
+            'from_human_readable',
+            lambda: Morse.from_human_readable(human_readable),
+        ),
+        ('from_binary', lambda: Morse.from_binary(binary)),
+        ('from_binary_bytes', lambda: Morse.from_binary_bytes(binary_bytes)),
+        ('from_keying_events', lambda: Morse.from_keying_events(events)),
+        ('plain_text', lambda: uncached(plain).plain_text),
+        ('human_readable', lambda: uncached(plain).human_readable),
+        ('binary', lambda: uncached(plain).binary),
+        ('binary_bytes', lambda: uncached(plain).binary_bytes),
+        (
+            'iter_keying_events',
+            lambda: list(uncached(plain).iter_keying_events()),
+        ),
+    )
+
+
+def write_inputs(directory, corpus_name, log_size):
+    for format_, value in formats(corpus(corpus_name, log_size)).items():
+        if format_ == c.BINARY_PACKED:
+            continue
+        path = os.path.join(directory, '{}.{}'.format(corpus_name, format_))
+        with open(path, 'w') as input_file:
+            input_file.write(value + '\n')
+
+
+def cli_results(args, directory):
+    # CLI runs come first, while this process is still small, see run_cli()
+    results = {}
+    for corpus_name in args.corpora:
+        subprocess.check_call([
+            sys.executable, __file__, '--write-inputs', directory,
+            corpus_name, args.log_size,
+        ])
+        length = len(corpus(corpus_name, args.log_size))
+        for from_format, to_format in _CLI_CONVERSIONS:
+            input_path = os.path.join(
+                directory, '{}.{}'.format(corpus_name, from_format)
+            )
+            runs = [
+                run_cli([from_format, to_format], input_path)
+                for _ in range(args.repeat)
+            ]
+            key = '{} cli {} {}'.format(corpus_name, from_format, to_format)
+            if None in runs:
+                # Typically killed for running out of memory
+                results[key] = None
+                continue
+            seconds, peak = min(runs)
+            results[key] = {
+                'chars_per_second': length / seconds,
+                'peak_mb': peak,
+            }
+            print_result(key, results[key], args.baseline, args.tolerance)
+    return results
+
+
+def library_results(args):
+    results = {}
+    for corpus_name in args.corpora:
+        plain_text = corpus(corpus_name, args.log_size)
+        for name, func in cases(plain_text):
+            key = '{} {}'.format(corpus_name, name)
+            results[key] = {
+                'chars_per_second':
+                    len(plain_text) / best_of(func, repeat=args.repeat),
+                'peak_mb': peak_memory(func) / 1024.0 ** 2,
+            }
+            print_result(key, results[key], args.baseline, args.tolerance)
+    return results
+
+
+def regressions(result, baseline, tolerance):
+    # Ratios of result to baseline speed and memory, and whether either
+    # is worse than the tolerance allows
+    speed = result['chars_per_second'] / baseline['chars_per_second']
+    memory = (
+        max(result['peak_mb'], _MEMORY_FLOOR_MB) /
+        max(baseline['peak_mb'], _MEMORY_FLOOR_MB)
+    )
+    return speed, memory, speed < 1 - tolerance or memory > 1 + tolerance
+
+
+def print_result(key, result, baseline, tolerance):
+    if result is None:
+        print('{:<44} failed'.format(key))
+        return
+
+    line = '{:<44} {:>14,.0f} chars/s {:>10.3f} MB'.format(
+        key, result['chars_per_second'], result['peak_mb']
+    )
+    if baseline and baseline.get(key):
+        speed, memory, regressed = regressions(
+            result, baseline[key], tolerance
+        )
+        line += '  speed {:>5.2f}x  memory {:>5.2f}x{}'.format(
+            speed, memory, '  !' if regressed else ''
+        )
+    print(line)
+
+
+def main():
+    if sys.argv[1:2] == ['--write-inputs']:
+        write_inputs(*sys.argv[2:])
+        return
+
+    parser = argument_parser(__doc__)
+    parser.add_argument(
+        '--corpora',
+        default=','.join(CORPORA),
+        type=lambda value: value.split(','),
+        help='comma separated corpora out of {}'.format(list(CORPORA)))
+    parser.add_argument(
+        '--log-size',
+        default='100M',
+        choices=sorted(SIZES),
+        help='characters of the log corpus')
+    parser.add_argument(
+        '--save',
+        help='write the results to this JSON file')
+    parser.add_argument(
+        '--compare',
+        help='compare with the results saved in this JSON file')
+    parser.add_argument(
+        '--tolerance',
+        default=0.2,
+        type=float,
+        help='fraction slower or larger than the saved results that counts '
+             'as a regression')
+    args = parser.parse_args()
+    args.baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            args.baseline = json.load(baseline_file)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = cli_results(args, directory)
+    results.update(library_results(args))
+
+    if args.save:
+        with open(args.save, 'w') as results_file:
+            json.dump(results, results_file, indent=2, sort_keys=True)
+
+    if args.baseline and any(
+        regressions(result, args.baseline[key], args.tolerance)[2]
+        for key, result in results.items()
+        if result and args.baseline.get(key)
+    ):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
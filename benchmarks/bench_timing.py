@@ -0,0 +1,88 @@
+"""Edge decoding with fixed and adaptive timing on jittered signals.
+
+Signals are keyed at a speed drifting from 12 to 30 WPM, with every edge
+off by up to ``--jitter`` of a unit.  Reports edges decoded per second and
+the share of plain text characters decoded correctly.
+"""
+import difflib
+import random
+
+from sweetmorse.edges import decode_edges
+from sweetmorse.morse import Morse
+from sweetmorse.timing import AdaptiveTiming, wpm_to_unit_duration
+
+from common import SIZES, argument_parser, best_of, plain_text_corpus
+
+_START_WPM = 12
+_END_WPM = 30
+# Comparing long texts is quadratic, only score their start
+_ACCURACY_CHARS = 16 * 1024
+
+
+def jittered_edges(binary, jitter, seed=0):
+    rng = random.Random(seed)
+    edges = []
+    timestamp = 0.0
+    level = '0'
+    for index, value in enumerate(binary + '0'):
+        unit = wpm_to_unit_duration(
+            _START_WPM + (_END_WPM - _START_WPM) * index / len(binary)
+        )
+        if value != level:
+            edges.append(
+                (timestamp + rng.uniform(-jitter, jitter) * unit, value)
+            )
+            level = value
+        timestamp += unit
+    return edges
+
+
+def accuracy(decoded, expected):
+    matcher = difflib.SequenceMatcher(None, decoded, expected, autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks()) / float(
+        len(expected)
+    )
+
+
+def main():
+    parser = argument_parser(__doc__, default_sizes='1K,1M')
+    parser.add_argument('--jitter', default=0.25, type=float)
+    args = parser.parse_args()
+
+    timings = [
+        ('fixed', lambda: {'unit_duration': wpm_to_unit_duration(20)}),
+        ('adaptive', lambda: {'timing': AdaptiveTiming(
+            wpm_to_unit_duration(20)
+        )}),
+    ]
+    for size in args.sizes:
+        plain_text = plain_text_corpus(SIZES[size])
+        edges = jittered_edges(
+            Morse.from_plain_text(plain_text).binary, args.jitter
+        )
+
+        for name, timing in timings:
+            # Characters that do not decode come out as replacements and
+            # count against the accuracy
+            decoded = decode_edges(edges, **timing())
+
+            seconds = best_of(
+                lambda: decode_edges(edges, **timing()),
+                repeat=args.repeat,
+            )
+            print(
+                '{name:<40} {size:>6} {rate:>10.3f} M edges/s '
+                'accuracy {accuracy:>7.2%}'.format(
+                    name='decode edges ({})'.format(name),
+                    size=size,
+                    rate=len(edges) / seconds / 1e6,
+                    accuracy=accuracy(
+                        decoded[:_ACCURACY_CHARS],
+                        plain_text[:_ACCURACY_CHARS],
+                    ),
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
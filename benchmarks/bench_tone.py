@@ -0,0 +1,67 @@
+"""Tone decoding throughput, in seconds of audio decoded per CPU-second.
+
+Audio is synthesized with ``Morse.to_pcm()`` from a corpus of the given
+size in plain text characters.  At 20 WPM, 1K characters make about ten
+minutes of audio.
+"""
+import time
+
+from sweetmorse import audio, tone
+from sweetmorse.morse import Morse
+from sweetmorse.timing import AdaptiveTiming
+
+from common import SIZES, argument_parser, plain_text_corpus
+
+
+def cpu_seconds(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argument_parser(__doc__, default_sizes='1K')
+    parser.add_argument(
+        '--sample-rate', default=audio.DEFAULT_SAMPLE_RATE, type=int
+    )
+    args = parser.parse_args()
+
+    backends = [('NumPy', tone.np), ('Python', None)]
+    if tone.np is None:
+        backends = backends[1:]
+
+    for size in args.sizes:
+        morse = Morse.from_plain_text(plain_text_corpus(SIZES[size]))
+        pcm = morse.to_pcm(sample_rate=args.sample_rate)
+        audio_seconds = len(pcm) / 2.0 / args.sample_rate
+
+        for name, np in backends:
+            tone.np = np
+            decoded = tone.decode_pcm(
+                pcm, sample_rate=args.sample_rate, timing=AdaptiveTiming()
+            )
+            assert decoded == morse
+            seconds = cpu_seconds(
+                lambda: tone.decode_pcm(
+                    pcm,
+                    sample_rate=args.sample_rate,
+                    timing=AdaptiveTiming(),
+                ),
+                args.repeat,
+            )
+            print(
+                '{name:<40} {size:>6} {audio:>8.0f} s audio '
+                '{rate:>10.0f}x real time'.format(
+                    name='decode tone ({})'.format(name),
+                    size=size,
+                    audio=audio_seconds,
+                    rate=audio_seconds / seconds,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
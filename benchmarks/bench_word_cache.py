@@ -0,0 +1,105 @@
+"""Converting word by word through the word cache, on radio-like traffic.
+
+Words are drawn from a vocabulary by a Zipf distribution, as in real
+traffic where a few words such as ``CQ``, ``DE`` and callsigns make up
+most of it.  Every conversion is timed without the cache and with a warm
+one, and the memory the caches hold is what Python allocated to fill
+them.
+"""
+import random
+import tracemalloc
+
+import sweetmorse.morse
+from sweetmorse.morse import Morse
+
+from common import SIZES, argument_parser, best_of, report
+
+_COMMON_WORDS = (
+    'CQ', 'DE', 'K', '73', 'TU', 'UR', 'RST', '5NN', 'QTH', 'QRZ?', 'TEST',
+    'W1AW', 'K1ABC', 'N0XYZ', 'G4ABC', 'DL1ABC', 'JA1XYZ', 'VK2ABC',
+)
+_CALLSIGN_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+
+def zipf_corpus(size, vocabulary_size, exponent, seed=0):
+    rng = random.Random(seed)
+    vocabulary = list(_COMMON_WORDS)
+    while len(vocabulary) < vocabulary_size:
+        vocabulary.append(''.join(
+            rng.choice(_CALLSIGN_CHARS) for _ in range(rng.randint(2, 8))
+        ))
+    weights = [1 / rank ** exponent for rank in range(1, vocabulary_size + 1)]
+
+    words = []
+    length = 0
+    while length < size:
+        for word in rng.choices(vocabulary, weights, k=1024):
+            words.append(word)
+            length += len(word) + 1
+    return ' '.join(words)[:size].strip()
+
+
+def cases(plain_text):
+    morse = Morse.from_plain_text(plain_text)
+    human_readable = morse.human_readable
+    binary = morse.binary
+    return (
+        (
+            'human_readable',
+            lambda: Morse._from_plain_text(plain_text).human_readable,
+        ),
+        ('binary', lambda: Morse._from_plain_text(plain_text).binary),
+        (
+            'from_human_readable',
+            lambda: Morse.from_human_readable(human_readable),
+        ),
+        ('from_binary', lambda: Morse.from_binary(binary)),
+    )
+
+
+def main():
+    parser = argument_parser(__doc__, default_sizes='1K,1M')
+    parser.add_argument(
+        '--vocabulary',
+        default=5000,
+        type=int,
+        help='different words in the corpus')
+    parser.add_argument(
+        '--exponent',
+        default=1.1,
+        type=float,
+        help='exponent of the Zipf distribution, higher repeats more')
+    parser.add_argument(
+        '--cache-size',
+        default=sweetmorse.morse.DEFAULT_WORD_CACHE_SIZE,
+        type=int,
+        help='words kept by every cache')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        plain_text = zipf_corpus(SIZES[size], args.vocabulary, args.exponent)
+        for name, func in cases(plain_text):
+            sweetmorse.morse.cache_words(0)
+            uncached = best_of(func, repeat=args.repeat)
+            report(name, size, uncached)
+
+            sweetmorse.morse.cache_words(args.cache_size)
+            # Starting from an empty cache, as after a restart
+            tracemalloc.start()
+            func()
+            cache_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            info = list(sweetmorse.morse.word_cache_info().values())
+            hits = sum(cache.hits for cache in info)
+            lookups = hits + sum(cache.misses for cache in info)
+
+            report(name + ' cached', size, best_of(func, repeat=args.repeat),
+                   baseline=uncached)
+            print('{:<47} {:>10.3f} MB {:>10.1%} hits when cold'.format(
+                '', cache_bytes / 1024.0 ** 2, hits / lookups
+            ))
+    sweetmorse.morse.cache_words(0)
+
+
+if __name__ == '__main__':
+    main()
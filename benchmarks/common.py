@@ -0,0 +1,164 @@
+"""Helpers shared by the benchmark scripts in this directory.
+
+Run a benchmark from the repository root, e.g.::
+
+    $ PYTHONPATH=. python benchmarks/bench_encode.py --sizes 1K,1M
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import sweetmorse.constants as c
+
+SIZES = {
+    '1K': 1024,
+    '1M': 1024 ** 2,
+    '100M': 100 * 1024 ** 2,
+}
+
+_WORD_CHARS = sorted(c.PLAIN_TEXT_CHARS)
+
+
+def plain_text_corpus(size, seed=0):
+    """Upper case plain text of exactly ``size`` characters.
+
+    Words of 1-8 characters separated by single spaces.  A short block is
+    generated and repeated so that large corpora are cheap to build.
+    """
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < min(size, 64 * 1024):
+        word = ''.join(
+            rng.choice(_WORD_CHARS) for _ in range(rng.randint(1, 8))
+        )
+        words.append(word)
+        length += len(word) + 1
+    block = c.PLAIN_TEXT_WORD_GAP.join(words) + c.PLAIN_TEXT_WORD_GAP
+
+    corpus = (block * (size // len(block) + 1))[:size]
+    # Keep the corpus free of an empty word at its end
+    return corpus.rstrip().ljust(size, 'E')
+
+
+# Realistic messages, in the plain text alphabet
+SHORT_MESSAGE = 'SOS SOS DE W1AW K'
+PARAGRAPH = (
+    'THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG. "SAFE ARRIVAL AT 14:30," '
+    'SHE WROTE; THE REPLY CAME BACK: (ROGER) - 73 & GOOD LUCK! IS THE NET '
+    'STILL ON 7.040? PLEASE QSL VIA THE BUREAU, OR EMAIL OP@EXAMPLE.ORG. '
+    "WX HERE IS CLOUDY, 12 C, WIND 270 AT 15; PWR 100 W, ANT IS A DIPOLE. "
+    "IT'S BEEN A PLEASURE; HOPE TO CUL ON 40 M. 1/2 OF THE BAND WAS QUIET."
+)
+_LOG_LEVELS = ('DEBUG', 'INFO', 'INFO', 'INFO', 'WARN', 'ERROR')
+_LOG_EVENTS = (
+    'REQUEST GET /API/V1/MESSAGES STATUS=200',
+    'REQUEST POST /API/V1/ENCODE STATUS=201',
+    'CACHE MISS KEY=MSG:{}',
+    'WORKER {} STARTED',
+    'RETRYING CONNECTION TO 10.0.0.{} (ATTEMPT 2/5)',
+    'QUEUE DEPTH={} HIGH WATER MARK',
+)
+
+
+def log_corpus(size, seed=0):
+    """Log-like plain text of exactly ``size`` characters: timestamped
+    lines of levels and events, one word gap apart, as the plain text
+    alphabet has no newline."""
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < min(size, 64 * 1024):
+        line = '2017-06-{:02d} {:02d}:{:02d}:{:02d} {} {}'.format(
+            rng.randint(1, 30), rng.randint(0, 23), rng.randint(0, 59),
+            rng.randint(0, 59), rng.choice(_LOG_LEVELS),
+            rng.choice(_LOG_EVENTS).format(rng.randint(1, 254)),
+        )
+        lines.append(line)
+        length += len(line) + 1
+    block = c.PLAIN_TEXT_WORD_GAP.join(lines) + c.PLAIN_TEXT_WORD_GAP
+
+    corpus = (block * (size // len(block) + 1))[:size]
+    return corpus.rstrip().ljust(size, 'E')
+
+
+def best_of(func, repeat=3, number=None):
+    """Best wall-clock seconds for one call of ``func``."""
+    if number is None:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        number = max(1, int(0.2 / elapsed)) if elapsed else 1000
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def peak_memory(func):
+    """Peak bytes allocated by Python objects during one call of ``func``.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_cli(arguments, input_path):
+    """Seconds taken and peak RSS in MB of one run of the CLI with
+    ``input_path`` on stdin, or None if it fails.
+
+    The peak RSS of a child starts from its parent's at the fork, so run
+    this before the benchmark itself allocates much.
+    """
+    with open(input_path, 'rb') as input_file, \
+            open(os.devnull, 'wb') as output_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'sweetmorse.main'] + arguments,
+            stdin=input_file,
+            stdout=output_file,
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+    if status:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, usage.ru_maxrss / 1024.0
+
+
+def report(name, size, seconds, baseline=None):
+    line = '{name:<40} {size:>6} {ms:>10.3f} ms {rate:>10.2f} MB/s'.format(
+        name=name,
+        size=size,
+        ms=seconds * 1000,
+        rate=SIZES[size] / seconds / 1024 ** 2,
+    )
+    if baseline is not None:
+        line += '  {:>6.1f}x'.format(baseline / seconds)
+    print(line)
+
+
+def argument_parser(description, default_sizes='1K,1M,100M'):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--sizes',
+        default=default_sizes,
+        type=lambda value: value.split(','),
+        help='comma separated input sizes out of {}'.format(sorted(SIZES)))
+    parser.add_argument(
+        '--repeat',
+        default=3,
+        type=int,
+        help='how many timing runs to take the best of')
+    return parser
@@ -14,7 +14,7 @@ Morse code tools from read to write, analog to digital.
 Compatibility
 -------------
 
-Targets Python3, tested against against Python 3.3-3.6.
+Targets Python3, tested against against Python 3.5-3.7.
 
 More info
 ---------
@@ -53,8 +53,6 @@ setup(
         'License :: OSI Approved :: MIT License',
 
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
@@ -72,7 +70,12 @@ setup(
     # https://packaging.python.org/en/latest/requirements.html
     install_requires=[],
 
-    python_requires='~=3.0',
+    # Optional backends, e.g. `pip install sweetmorse[fast]`
+    extras_require={
+        'fast': ['numpy'],
+    },
+
+    python_requires='~=3.5',
 
     package_data={},
 
@@ -0,0 +1,387 @@
+"""Morse alphabets, compiled once into the tables that encoding and
+decoding look up.
+
+An alphabet maps plain text tokens to human-readable Morse.  Tokens are
+single characters or, like the prosigns ``<AR>`` and ``<SK>``, runs of
+characters sent as one Morse character.  Everything else, binary forms,
+reverse maps, encoding tables with the gaps baked in, the code tree,
+keying events and the tables that validate plain text, is derived when the
+alphabet is made, so ``Morse`` only ever does lookups.
+"""
+import re
+
+import sweetmorse.constants as c
+
+_HUMAN_READABLE_MARKS = {'.': '1', '_': '111'}
+_BINARY_MARK_SPACE = '0'
+
+# Word gaps are marked with a symbol that is not in the format before the
+# input is split on char gaps, see Morse._binary_to_pieces()
+BINARY_WORD_MARK = c.PLAIN_TEXT_WORD_GAP
+HUMAN_READABLE_WORD_MARK = '/'
+
+# Human-readable codes as a binary tree in an array: the root is 0, and
+# the node after a dot or a dash from node i is 2i+1 or 2i+2
+HUMAN_READABLE_TREE_ROOT = 0
+HUMAN_READABLE_TREE_BRANCHES = {'.': 1, '_': 2}
+
+
+def _consists_of(value, symbol_bytes):
+    # Deleting the symbols through a 256-entry byte table is a single pass
+    # at C speed, several times faster than building a set of the input.
+    try:
+        return not value.encode('ascii').translate(None, symbol_bytes)
+    except UnicodeEncodeError:
+        return False
+
+
+def _encoding_table(plain_text_to_encoded, char_gap, word_gap):
+    # Every character carries its trailing char gap, and the plain text
+    # word gap supplies the rest of the word gap.  Encoding a whole text
+    # then leaves exactly one surplus char gap at the end.
+    table = {
+        char: encoded + char_gap
+        for char, encoded in plain_text_to_encoded.items()
+    }
+    table[c.PLAIN_TEXT_WORD_GAP] = word_gap[len(char_gap):]
+    return table
+
+
+def _human_readable_to_binary(human_readable):
+    return _BINARY_MARK_SPACE.join(
+        _HUMAN_READABLE_MARKS[mark] for mark in human_readable
+    )
+
+
+def _decoding_table(encoded_to_plain_text, word_mark):
+    # See Morse._binary_to_pieces()
+    table = dict(encoded_to_plain_text)
+    # Left by char gaps at either end or right next to each other
+    table[''] = c.PLAIN_TEXT_CHAR_GAP
+    table[word_mark] = c.PLAIN_TEXT_WORD_GAP
+    return table
+
+
+def _edit_distance(one, other):
+    # Levenshtein distance, a row of the table at a time
+    previous = list(range(len(other) + 1))
+    for index, symbol in enumerate(one, 1):
+        current = [index]
+        for other_index, other_symbol in enumerate(other, 1):
+            current.append(min(
+                previous[other_index] + 1,
+                current[other_index - 1] + 1,
+                previous[other_index - 1] + (symbol != other_symbol),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def _human_readable_tree(human_readable_to_plain_text):
+    # Tokens at the nodes of their codes, None at nodes that are no code
+    depth = max(map(len, human_readable_to_plain_text))
+    tree = [None] * (2 ** (depth + 1) - 1)
+    for human_readable, token in human_readable_to_plain_text.items():
+        node = HUMAN_READABLE_TREE_ROOT
+        for mark in human_readable:
+            node = 2 * node + HUMAN_READABLE_TREE_BRANCHES[mark]
+        tree[node] = token
+    return tree
+
+
+class Alphabet(object):
+    """Plain text tokens and their Morse codes, from a mapping of tokens to
+    human-readable Morse such as ``{'A': '._', '<AR>': '._._.'}``, or an
+    iterable of ``(token, code)`` pairs.
+
+    Plain text is upper-cased before it is looked up, so tokens are given
+    in upper case.  Where several tokens share a code, the last one given
+    is what the code decodes to.  Give pairs or an ordered mapping then, as
+    dicts keep no order before Python 3.6.
+    """
+
+    def __init__(self, plain_text_to_human_readable, name=None):
+        if hasattr(plain_text_to_human_readable, 'items'):
+            plain_text_to_human_readable = plain_text_to_human_readable.items()
+        self.name = name
+        self.plain_text_to_human_readable = {}
+        # (token, code) in the order given, which decides shared codes
+        self._pairs = []
+        for token, human_readable in plain_text_to_human_readable:
+            if (
+                token == c.PLAIN_TEXT_WORD_GAP and
+                human_readable == c.HUMAN_READABLE_CHAR_GAP
+            ):
+                # The word gap entry of the constants tables
+                continue
+            self._check_token(token, human_readable)
+            self.plain_text_to_human_readable[token] = human_readable
+            self._pairs.append((token, human_readable))
+        if not self.plain_text_to_human_readable:
+            raise ValueError('An alphabet needs at least one token')
+        self._check_multi_char_tokens()
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set.  Everything derived
+        # from the mapping is made on first use, so that alphabets nobody
+        # uses cost next to nothing at import.
+        if not name.startswith('__') and not self.__dict__.get('_compiled'):
+            self._compile()
+        # Looked up again even when compiled, by another thread since the
+        # attribute was missed
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(
+                '{!r} object has no attribute {!r}'
+                .format(self.__class__.__name__, name)
+            ) from None
+
+    @staticmethod
+    def _check_token(token, human_readable):
+        if not isinstance(token, str) or not token or any(
+            char.isspace() for char in token
+        ):
+            raise ValueError(
+                'Plain text tokens must be non-empty strings without '
+                'whitespace.  Given: {!r}'.format(token)
+            )
+        if token != token.upper():
+            raise ValueError(
+                'Plain text tokens must be upper case.  Given: {!r}'
+                .format(token)
+            )
+        if (
+            not isinstance(human_readable, str) or
+            not human_readable or
+            set(human_readable).difference(_HUMAN_READABLE_MARKS)
+        ):
+            raise ValueError(
+                'Codes must be human-readable Morse characters made of '
+                '{}.  Given: {!r} for {!r}'
+                .format(
+                    ' and '.join(sorted(_HUMAN_READABLE_MARKS)),
+                    human_readable,
+                    token,
+                )
+            )
+
+    def _check_multi_char_tokens(self):
+        # Plain text must cut into tokens one way only, or it would not
+        # encode to what it was decoded from.  It does when no token of
+        # several characters starts with a single character token, and
+        # none is the start of another.
+        tokens = self.plain_text_to_human_readable
+        multi_char_tokens = sorted(token for token in tokens if len(token) > 1)
+        for index, token in enumerate(multi_char_tokens):
+            if token[0] in tokens:
+                raise ValueError(
+                    'Token {!r} starts with the token {!r}'
+                    .format(token, token[0])
+                )
+            following = multi_char_tokens[index + 1:index + 2]
+            if following and following[0].startswith(token):
+                raise ValueError(
+                    'Token {!r} starts with the token {!r}'
+                    .format(following[0], token)
+                )
+
+    def _compile(self):
+        # The tables are built on a bare copy, where a missing attribute
+        # raises rather than compiling again, and only then copied over
+        # with the flag last.  Threads that touch the alphabet meanwhile
+        # find every table they look up complete, or build their own.
+        copy = object.__new__(type(self))
+        copy.__dict__.update(self.__dict__)
+        copy._compiled = True
+        copy._build_tables()
+        del copy._compiled
+        self.__dict__.update(copy.__dict__)
+        self._compiled = True
+
+    def _build_tables(self):
+        # Skipping codes of tokens that were given again with another
+        self.human_readable_to_plain_text = {
+            human_readable: token
+            for token, human_readable in self._pairs
+            if self.plain_text_to_human_readable[token] == human_readable
+        }
+        self.plain_text_to_binary = {
+            token: _human_readable_to_binary(human_readable)
+            for token, human_readable in
+            self.plain_text_to_human_readable.items()
+        }
+        self.binary_to_plain_text = {
+            binary: token
+            for token, binary in self.plain_text_to_binary.items()
+        }
+        self.plain_text_chars = set(self.plain_text_to_human_readable)
+        self.human_readable_chars = set(self.human_readable_to_plain_text)
+        self.binary_chars = set(self.binary_to_plain_text)
+        self.plain_text_alphabet = self.plain_text_chars.union(
+            {c.PLAIN_TEXT_WORD_GAP}
+        )
+
+        self._binary_decoding = _decoding_table(
+            self.binary_to_plain_text, BINARY_WORD_MARK
+        )
+        self._human_readable_decoding = _decoding_table(
+            self.human_readable_to_plain_text, HUMAN_READABLE_WORD_MARK
+        )
+        self._human_readable_tree = _human_readable_tree(
+            self.human_readable_to_plain_text
+        )
+
+        self._human_readable_table = _encoding_table(
+            self.plain_text_to_human_readable,
+            c.HUMAN_READABLE_CHAR_GAP,
+            c.HUMAN_READABLE_WORD_GAP,
+        )
+        self._binary_table = _encoding_table(
+            self.plain_text_to_binary,
+            c.BINARY_CHAR_GAP,
+            c.BINARY_WORD_GAP,
+        )
+
+        # Every character is its marks with a single unit of space between
+        # them, see Morse.iter_keying_events()
+        self._keying_events = {
+            token: tuple(
+                event
+                for index, mark in enumerate(
+                    binary.split(_BINARY_MARK_SPACE)
+                )
+                for event in (
+                    ((False, len(_BINARY_MARK_SPACE)),) if index else ()
+                ) + ((True, len(mark)),)
+            )
+            for token, binary in self.plain_text_to_binary.items()
+        }
+
+        # Plain text validates in one pass through a byte table when every
+        # token is ASCII, else through a str.translate() table
+        symbols = ''.join(sorted(
+            set(''.join(self.plain_text_chars)) | {c.PLAIN_TEXT_WORD_GAP}
+        ))
+        try:
+            self._plain_text_symbol_bytes = symbols.encode('ascii')
+        except UnicodeEncodeError:
+            self._plain_text_symbol_bytes = None
+        self._plain_text_symbol_deletions = dict.fromkeys(map(ord, symbols))
+        self.plain_text_symbols = set(symbols)
+
+        # Longest tokens first, so that prosigns win over their characters
+        multi_char_tokens = sorted(
+            (token for token in self.plain_text_chars if len(token) > 1),
+            key=len,
+            reverse=True,
+        )
+        self._tokenizer = re.compile(
+            '|'.join(map(re.escape, multi_char_tokens)) + '|.',
+            re.DOTALL,
+        ) if multi_char_tokens else None
+
+    def tokens(self, plain_text):
+        """The tokens and word gaps of ``plain_text``, in order.
+
+        Anything that is no token comes out a character at a time.
+        """
+        if self._tokenizer is None:
+            return plain_text
+        return self._tokenizer.findall(plain_text)
+
+    def count_chars(self, plain_text):
+        """The number of tokens in ``plain_text``, word gaps aside."""
+        return (
+            len(self.tokens(plain_text)) -
+            plain_text.count(c.PLAIN_TEXT_WORD_GAP)
+        )
+
+    def is_plain_text(self, value):
+        """Whether upper-case ``value`` is made of tokens and word gaps."""
+        if self._plain_text_symbol_bytes is not None:
+            consists_of_symbols = _consists_of(
+                value, self._plain_text_symbol_bytes
+            )
+        else:
+            consists_of_symbols = not value.translate(
+                self._plain_text_symbol_deletions
+            )
+        if not consists_of_symbols or self._tokenizer is None:
+            return consists_of_symbols
+        return not self.invalid_plain_text(value)
+
+    def invalid_plain_text(self, value):
+        """The set of whatever in upper-case ``value`` is no token."""
+        return set(self.tokens(value)).difference(self.plain_text_alphabet)
+
+    def nearest_human_readable(self, code):
+        """The token whose human-readable code is the fewest edits
+        (insertions, deletions or substitutions of symbols) from ``code``.
+        """
+        return self._nearest(code, self.human_readable_to_plain_text)
+
+    def nearest_binary(self, code):
+        """The token whose binary code is the fewest edits from ``code``."""
+        return self._nearest(code, self.binary_to_plain_text)
+
+    @staticmethod
+    def _nearest(code, encoded_to_plain_text):
+        # Ties go to the shorter code, the likelier one
+        return encoded_to_plain_text[min(
+            encoded_to_plain_text,
+            key=lambda encoded: (
+                _edit_distance(code, encoded), len(encoded), encoded
+            ),
+        )]
+
+    @property
+    def example(self):
+        """A token for showing the shape of codes in error messages."""
+        if 'L' in self.plain_text_to_human_readable:
+            return 'L'
+        return min(
+            self.plain_text_to_human_readable,
+            key=lambda token: (
+                -len(self.plain_text_to_human_readable[token]), token
+            ),
+        )
+
+    def union(self, other, name=None):
+        """An alphabet of the tokens of both, ``other`` winning shared
+        codes."""
+        return type(self)(self._pairs + other._pairs, name=name)
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self is other or (
+                self.plain_text_to_human_readable ==
+                other.plain_text_to_human_readable and
+                self.human_readable_to_plain_text ==
+                other.human_readable_to_plain_text
+            )
+        else:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(frozenset(self.plain_text_to_human_readable.items()))
+
+    def __repr__(self):
+        if self.name is not None:
+            return '<{} {}>'.format(self.__class__.__name__, self.name)
+        return '{}({!r})'.format(
+            self.__class__.__name__, self.plain_text_to_human_readable
+        )
+
+
+INTERNATIONAL = Alphabet(c.PLAIN_TEXT_TO_HUMAN_READABLE, name='INTERNATIONAL')
+PROSIGNS = INTERNATIONAL.union(
+    Alphabet(c.PROSIGNS_TO_HUMAN_READABLE), name='PROSIGNS'
+)
+CYRILLIC = Alphabet(c.CYRILLIC_TO_HUMAN_READABLE, name='CYRILLIC')
+GREEK = Alphabet(c.GREEK_TO_HUMAN_READABLE, name='GREEK')
+WABUN = Alphabet(c.WABUN_TO_HUMAN_READABLE, name='WABUN')
@@ -0,0 +1,116 @@
+"""Render binary Morse as a keyed tone in 16-bit PCM audio.
+
+Every keying unit is the same length, so the audio of a dot, a dash and a
+unit of silence is computed once and the whole signal is made by joining
+those blocks.  Marks fade in and out along a raised cosine, which keeps
+the tone free of the clicks a hard on/off edge would make.
+"""
+import functools
+import math
+import struct
+import sys
+from array import array
+
+import sweetmorse.constants as c
+from sweetmorse.timing import wpm_to_unit_duration
+
+# Kept in constants, so that Morse.to_pcm() can default to them without
+# importing this module
+DEFAULT_SAMPLE_RATE = c.DEFAULT_SAMPLE_RATE
+DEFAULT_WPM = c.DEFAULT_WPM
+DEFAULT_FREQUENCY = c.DEFAULT_FREQUENCY
+
+# Seconds for a mark to fade in or out, at most half of a dot
+_RAMP_DURATION = 0.005
+_AMPLITUDE = 0.8
+_SAMPLE_WIDTH = 2
+_MAX_SAMPLE = 2 ** (8 * _SAMPLE_WIDTH - 1) - 1
+_INTRA_CHAR_GAP = '0'
+# Marks rendered per chunk while streaming
+_CHUNK_MARKS = 4096
+
+
+def samples_per_unit(sample_rate=DEFAULT_SAMPLE_RATE, wpm=DEFAULT_WPM):
+    """Samples in one keying unit, rounded to a whole sample."""
+    return max(1, int(round(sample_rate * wpm_to_unit_duration(wpm))))
+
+
+@functools.lru_cache(maxsize=16)
+def _blocks(sample_rate, wpm, frequency):
+    # PCM of every mark a binary character is made of, and of one unit of
+    # silence
+    unit = samples_per_unit(sample_rate, wpm)
+    ramp = min(int(round(sample_rate * _RAMP_DURATION)), unit // 2)
+    fade = [
+        0.5 - 0.5 * math.cos(math.pi * (index + 0.5) / ramp)
+        for index in range(ramp)
+    ]
+
+    marks = {}
+    for binary in c.BINARY_TO_PLAIN_TEXT:
+        for mark in binary.split(_INTRA_CHAR_GAP):
+            if mark in marks:
+                continue
+            length = len(mark) * unit
+            envelope = fade + [1.0] * (length - 2 * ramp) + fade[::-1]
+            marks[mark] = _pcm(
+                _AMPLITUDE * _MAX_SAMPLE * level *
+                math.sin(2 * math.pi * frequency * index / sample_rate)
+                for index, level in enumerate(envelope)
+            )
+    # Consecutive gap units split to empty strings
+    marks[''] = b''
+
+    return marks, _pcm([0] * unit)
+
+
+def _pcm(samples):
+    pcm = array('h', (int(round(sample)) for sample in samples))
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def iter_pcm(binary, sample_rate=DEFAULT_SAMPLE_RATE, wpm=DEFAULT_WPM,
+             frequency=DEFAULT_FREQUENCY):
+    """Yield the PCM of keying ``binary`` Morse in chunks of bytes.
+
+    Samples are signed 16-bit little-endian mono, ``samples_per_unit()``
+    of them for every unit of ``binary``.
+    """
+    marks, silence = _blocks(sample_rate, wpm, frequency)
+
+    # Splitting on the intra-character gap leaves the marks, with one unit
+    # of silence between every two items.
+    parts = binary.split(_INTRA_CHAR_GAP)
+    for start in range(0, len(parts), _CHUNK_MARKS):
+        pcm = silence.join(
+            map(marks.__getitem__, parts[start:start + _CHUNK_MARKS])
+        )
+        if start + _CHUNK_MARKS < len(parts):
+            pcm += silence
+        yield pcm
+
+
+def write_wav(output_file, binary, sample_rate=DEFAULT_SAMPLE_RATE,
+              wpm=DEFAULT_WPM, frequency=DEFAULT_FREQUENCY):
+    """Write a WAV file of keying ``binary`` Morse to a binary file object.
+
+    The audio is written a chunk at a time and the file is never seeked,
+    so ``output_file`` may be a pipe.
+    """
+    sample_count = len(binary) * samples_per_unit(sample_rate, wpm)
+    output_file.write(_wav_header(sample_count, sample_rate))
+    for pcm in iter_pcm(binary, sample_rate, wpm, frequency):
+        output_file.write(pcm)
+
+
+def _wav_header(sample_count, sample_rate):
+    data_size = sample_count * _SAMPLE_WIDTH
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * _SAMPLE_WIDTH,
+        _SAMPLE_WIDTH, 8 * _SAMPLE_WIDTH,
+        b'data', data_size,
+    )
@@ -0,0 +1,167 @@
+"""Convert large inputs and batches of files on all CPU cores.
+
+Inputs are cut at word gaps, where every piece can be converted without
+knowing its neighbours, and the pieces are converted in worker processes.
+Output is written in input order while later pieces are still converting.
+"""
+import collections
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Pieces start at the first symbol of a word gap, so the whole gap goes to
+# the piece it leads.
+_WORD_GAPS = {
+    c.PLAIN: c.PLAIN_TEXT_WORD_GAP,
+    c.HUMAN_READABLE: c.HUMAN_READABLE_WORD_GAP,
+    c.BINARY: c.BINARY_WORD_GAP,
+}
+# Pieces converting or waiting for their turn to be written, per worker
+_IN_FLIGHT_PER_JOB = 2
+
+
+def convert(value, from_format, to_format, jobs=None,
+            chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert a string like ``Morse.from_<format>(value).<format>``, on
+    ``jobs`` processes (all CPU cores by default)."""
+    output_file = io.StringIO()
+    convert_file(
+        io.StringIO(value), output_file, from_format, to_format,
+        jobs=jobs, chunk_size=chunk_size,
+    )
+    return output_file.getvalue()
+
+
+def convert_file(input_file, output_file, from_format, to_format, jobs=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert between text file objects on ``jobs`` processes.
+
+    Input is read about ``chunk_size`` characters at a time, so files of
+    any size convert in bounded memory as long as their word gaps are
+    closer together than that.
+    """
+    _check_formats(from_format, to_format)
+    tasks = (
+        (None, (piece, from_format, to_format, offset))
+        for offset, piece in _pieces(input_file, from_format, chunk_size)
+    )
+    for _, converted in _convert_in_order(tasks, jobs):
+        output_file.write(converted)
+
+
+def convert_files(input_paths, output_dir, from_format, to_format, jobs=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert files into ``output_dir`` under the same names.
+
+    Pieces of all the files share one pool of ``jobs`` processes, so a
+    batch of small files keeps every core busy too.  Like the CLI, every
+    output file ends in a newline.
+    """
+    _check_formats(from_format, to_format)
+
+    def tasks():
+        for input_path in input_paths:
+            output_path = os.path.join(
+                output_dir, os.path.basename(input_path)
+            )
+            with open(input_path) as input_file:
+                for offset, piece in _pieces(
+                    input_file, from_format, chunk_size
+                ):
+                    yield output_path, (piece, from_format, to_format, offset)
+            # End of the file
+            yield output_path, None
+
+    output_file = None
+    for output_path, converted in _convert_in_order(tasks(), jobs):
+        if output_file is None:
+            output_file = open(output_path, 'w')
+        if converted is None:
+            output_file.write('\n')
+            output_file.close()
+            output_file = None
+        else:
+            output_file.write(converted)
+
+
+def _check_formats(from_format, to_format):
+    for format_ in (from_format, to_format):
+        if format_ not in _WORD_GAPS:
+            raise ValueError('Unknown format: {}'.format(format_))
+
+
+def _pieces(input_file, from_format, chunk_size):
+    # Yield (offset, piece) for the stripped input, cut right before the
+    # word gap closest to the end of every chunk read.
+    word_gap = _WORD_GAPS[from_format]
+    buffer = ''
+    offset = 0
+    started = False
+    for chunk in iter(lambda: input_file.read(chunk_size), ''):
+        buffer += chunk
+        if not started:
+            stripped = buffer.lstrip()
+            offset += len(buffer) - len(stripped)
+            buffer = stripped
+            started = bool(buffer)
+
+        # Trailing whitespace is held back like in stream._IncrementalCoder,
+        # as a cut within it would leave a piece of whitespace on its own
+        cut = buffer.rfind(word_gap, 1, len(buffer.rstrip()))
+        while cut > 0 and buffer[cut - 1] == word_gap[0]:
+            cut -= 1
+        if cut > 0:
+            yield offset, buffer[:cut]
+            offset += cut
+            buffer = buffer[cut:]
+
+    buffer = buffer.rstrip()
+    if buffer:
+        yield offset, buffer
+
+
+def _convert_piece(piece, from_format, to_format, offset):
+    # A piece after the first starts with a word gap, which decodes to a
+    # leading empty word and encodes back to the same word gap, so the
+    # converted pieces simply concatenate.
+    plain_text = Morse._to_plain_text(piece, from_format, offset=offset)
+    morse = Morse._from_plain_text(plain_text)
+    return (
+        morse.plain_text
+        if to_format == c.PLAIN
+        else morse.human_readable
+        if to_format == c.HUMAN_READABLE
+        else morse.binary
+    )
+
+
+def _convert_in_order(tasks, jobs):
+    # Yield (key, converted) for (key, arguments) tasks in order, passing
+    # on tasks without arguments as (key, None).
+    if jobs == 1:
+        for key, arguments in tasks:
+            yield key, _convert_piece(*arguments) if arguments else None
+        return
+
+    jobs = jobs or cpu_count()
+    pending = collections.deque()
+    with ProcessPoolExecutor(jobs) as executor:
+        for key, arguments in tasks:
+            pending.append((
+                key,
+                executor.submit(_convert_piece, *arguments)
+                if arguments else None,
+            ))
+            while len(pending) > _IN_FLIGHT_PER_JOB * jobs:
+                key, future = pending.popleft()
+                yield key, future.result() if future else None
+
+        while pending:
+            key, future = pending.popleft()
+            yield key, future.result() if future else None
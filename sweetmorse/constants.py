@@ -4,6 +4,8 @@ import string
 PLAIN = 'PLAIN'
 HUMAN_READABLE = 'HUMAN_READABLE'
 BINARY = 'BINARY'
+BINARY_PACKED = 'BINARY_PACKED'
+WAV = 'WAV'
 
 # PLAIN
 LOWERCASE_CHARS = set(string.ascii_lowercase)
@@ -155,3 +157,139 @@ BINARY_CHAR_GAP = '000'
 BINARY_WORD_GAP = '0000000'
 BINARY_ALPHABET = BINARY_CHARS.union({BINARY_CHAR_GAP, BINARY_WORD_GAP})
 BINARY_SYMBOLS = {'0', '1'}
+
+# WAV
+DEFAULT_SAMPLE_RATE = 8000
+DEFAULT_WPM = 20
+DEFAULT_FREQUENCY = 700
+
+# Other alphabets, as plain text to human-readable.  Prosigns are written
+# as their letters in angle brackets, and share codes with the punctuation
+# of the international alphabet.
+PROSIGNS_TO_HUMAN_READABLE = {
+    '<AA>': '._._',
+    '<AR>': '._._.',
+    '<AS>': '._...',
+    '<BK>': '_..._._',
+    '<BT>': '_..._',
+    '<CL>': '_._.._..',
+    '<CT>': '_._._',
+    '<KN>': '_.__.',
+    '<SK>': '..._._',
+    '<SN>': '..._.',
+    '<SOS>': '...___...',
+}
+CYRILLIC_TO_HUMAN_READABLE = {
+    'А': '._',
+    'Б': '_...',
+    'В': '.__',
+    'Г': '__.',
+    'Д': '_..',
+    'Е': '.',
+    'Ж': '..._',
+    'З': '__..',
+    'И': '..',
+    'Й': '.___',
+    'К': '_._',
+    'Л': '._..',
+    'М': '__',
+    'Н': '_.',
+    'О': '___',
+    'П': '.__.',
+    'Р': '._.',
+    'С': '...',
+    'Т': '_',
+    'У': '.._',
+    'Ф': '.._.',
+    'Х': '....',
+    'Ц': '_._.',
+    'Ч': '___.',
+    'Ш': '____',
+    'Щ': '__._',
+    'Ъ': '__.__',
+    'Ы': '_.__',
+    'Ь': '_.._',
+    'Э': '.._..',
+    'Ю': '..__',
+    'Я': '._._',
+}
+GREEK_TO_HUMAN_READABLE = {
+    'Α': '._',
+    'Β': '_...',
+    'Γ': '__.',
+    'Δ': '_..',
+    'Ε': '.',
+    'Ζ': '__..',
+    'Η': '....',
+    'Θ': '_._.',
+    'Ι': '..',
+    'Κ': '_._',
+    'Λ': '._..',
+    'Μ': '__',
+    'Ν': '_.',
+    'Ξ': '_.._',
+    'Ο': '___',
+    'Π': '.__.',
+    'Ρ': '._.',
+    'Σ': '...',
+    'Τ': '_',
+    'Υ': '_.__',
+    'Φ': '.._.',
+    'Χ': '____',
+    'Ψ': '__._',
+    'Ω': '.__',
+}
+# Japanese Wabun code, in katakana
+WABUN_TO_HUMAN_READABLE = {
+    'ア': '__.__',
+    'イ': '._',
+    'ウ': '.._',
+    'エ': '_.___',
+    'オ': '._...',
+    'カ': '._..',
+    'キ': '_._..',
+    'ク': '..._',
+    'ケ': '_.__',
+    'コ': '____',
+    'サ': '_._._',
+    'シ': '__._.',
+    'ス': '___._',
+    'セ': '.___.',
+    'ソ': '___.',
+    'タ': '_.',
+    'チ': '.._.',
+    'ツ': '.__.',
+    'テ': '._.__',
+    'ト': '.._..',
+    'ナ': '._.',
+    'ニ': '_._.',
+    'ヌ': '....',
+    'ネ': '__._',
+    'ノ': '..__',
+    'ハ': '_...',
+    'ヒ': '__.._',
+    'フ': '__..',
+    'ヘ': '.',
+    'ホ': '_..',
+    'マ': '_.._',
+    'ミ': '.._._',
+    'ム': '_',
+    'メ': '_..._',
+    'モ': '_.._.',
+    'ヤ': '.__',
+    'ユ': '_..__',
+    'ヨ': '__',
+    'ラ': '...',
+    'リ': '__.',
+    'ル': '_.__.',
+    'レ': '___',
+    'ロ': '._._',
+    'ワ': '_._',
+    'ヰ': '._.._',
+    'ヱ': '.__..',
+    'ヲ': '.___',
+    'ン': '._._.',
+    '゛': '..',
+    '゜': '..__.',
+    'ー': '.__._',
+}
@@ -0,0 +1,184 @@
+"""Decode Morse from the timing of signal edges.
+
+A receiver only has to record when its input changes level, e.g. from a GPIO
+interrupt, and hand those edges to an ``EdgeDecoder``.  The time between two
+edges is turned into keying units directly, so the work done is per edge
+rather than per unit of signal.
+"""
+import collections
+
+import sweetmorse.constants as c
+from sweetmorse.morse import (
+    REPLACEMENT_CHARACTER,
+    ErrorSpan,
+    MorseDecodeError,
+)
+from sweetmorse.timing import FixedTiming
+
+_MARK = '1'
+_INTRA_CHAR_GAP = '0'
+
+
+class EdgeDecoder(object):
+    """Turn ``(timestamp, level)`` edges into plain text as they happen.
+
+    ``push()`` only appends to a deque, so it is cheap enough to call from an
+    interrupt handler or another thread.  ``read()`` decodes every edge
+    pushed so far and returns the plain text completed by them.
+
+    Give either the ``unit_duration`` in seconds of a steady sender, or a
+    ``timing`` object such as ``sweetmorse.timing.AdaptiveTiming`` that
+    works out the speed as it goes.
+
+    A received character that is not Morse decodes to ``replacement`` and
+    gets an ``ErrorSpan`` of the units it took up in ``errors``, like
+    ``Morse.decode_lenient()``, so that a noisy signal does not stop the
+    decoding.  With ``replacement=None`` it raises ``MorseDecodeError``
+    instead.
+    """
+
+    def __init__(self, unit_duration=None, timing=None,
+                 replacement=REPLACEMENT_CHARACTER):
+        if (unit_duration is None) == (timing is None):
+            raise ValueError('Give exactly one of unit_duration and timing')
+
+        self.timing = timing or FixedTiming(unit_duration)
+        self.replacement = replacement
+        self.errors = []
+        self.edges = collections.deque()
+        self._level = False
+        self._since = None
+        # Marks of the character being received
+        self._marks = []
+        # Units decoded so far, for error offsets
+        self._position = 0
+        self._char_position = 0
+        # Word gaps already emitted for the current space
+        self._word_gaps = 0
+        # (level, duration) of the runs held until the timing is acquired
+        self._held = None if self.timing.acquired else []
+
+    def push(self, timestamp, level):
+        """Record that the signal changed to ``level`` at ``timestamp``.
+
+        ``level`` is anything ``int()`` accepts, so ``1``, ``True`` and
+        ``'1'`` are all high.  Timestamps are seconds from a monotonic clock.
+        """
+        self.edges.append((timestamp, level))
+
+    def read(self, now=None):
+        """Decode all pushed edges and return the newly completed text.
+
+        Pass the current time as ``now`` to also complete a character (or a
+        word) once the signal has been low for long enough, instead of
+        waiting for the next edge.  Like ``Morse.from_binary()``, a space of
+        several word gaps decodes to several word gaps, but only the first
+        is reported before the space ends.
+        """
+        decoded = []
+        while True:
+            try:
+                timestamp, level = self.edges.popleft()
+            except IndexError:
+                break
+
+            level = bool(int(level))
+            if level == self._level:
+                continue
+
+            if self._since is not None:
+                decoded.append(self._run(
+                    self._level, timestamp - self._since, ended=True
+                ))
+            self._level = level
+            self._since = timestamp
+
+        if now is not None and not self._level and self._since is not None:
+            decoded.append(self._run(False, now - self._since, ended=False))
+
+        return ''.join(decoded)
+
+    def finish(self):
+        """Decode all pushed edges and the character still being received.
+        """
+        decoded = self.read()
+        if self._held is not None:
+            self.timing.settle()
+            decoded += self._release()
+        if self._marks:
+            decoded += self._end_char()
+        return decoded
+
+    def _run(self, level, duration, ended):
+        if self._held is not None:
+            if ended:
+                self._held.append((level, duration))
+            if not self.timing.acquire(duration, level, final=ended):
+                return ''
+            decoded = self._release()
+            if ended:
+                return decoded
+            return decoded + self._run(level, duration, ended)
+
+        if level:
+            units = self.timing.mark_units(duration)
+            if not self._marks:
+                self._char_position = self._position
+            self._marks.append(_MARK * units)
+            self._position += units
+            return ''
+
+        units = self.timing.space_units(duration, final=ended)
+
+        decoded = ''
+        if self._marks and units >= len(c.BINARY_CHAR_GAP):
+            decoded = self._end_char()
+
+        word_gaps = units // len(c.BINARY_WORD_GAP)
+        if not ended:
+            word_gaps = min(word_gaps, 1)
+        decoded += c.PLAIN_TEXT_WORD_GAP * (word_gaps - self._word_gaps)
+        self._word_gaps = word_gaps
+
+        if ended:
+            self._position += units
+            self._word_gaps = 0
+        return decoded
+
+    def _release(self):
+        # Decode the runs held while the timing was being acquired
+        held, self._held = self._held, None
+        return ''.join(
+            self._run(level, duration, ended=True) for level, duration in held
+        )
+
+    def _end_char(self):
+        binary = _INTRA_CHAR_GAP.join(self._marks)
+        self._marks = []
+        try:
+            return c.BINARY_TO_PLAIN_TEXT[binary]
+        except KeyError:
+            if self.replacement is None:
+                raise MorseDecodeError(
+                    'Character received that is not binary Morse encoded: '
+                    '{} at unit {}'.format(binary, self._char_position),
+                    self._char_position,
+                )
+        self.errors.append(ErrorSpan(
+            self._char_position,
+            self._char_position + len(binary),
+            binary,
+            self.replacement,
+        ))
+        return self.replacement
+
+
+def decode_edges(edges, unit_duration=None, timing=None,
+                 replacement=REPLACEMENT_CHARACTER):
+    """Decode a whole list of ``(timestamp, level)`` edges to plain text."""
+    decoder = EdgeDecoder(
+        unit_duration=unit_duration, timing=timing, replacement=replacement
+    )
+    for timestamp, level in edges:
+        decoder.push(timestamp, level)
+    return decoder.finish()
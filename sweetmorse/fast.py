@@ -0,0 +1,247 @@
+"""Vectorized binary Morse encoding and decoding for bulk data.
+
+Keying units are exchanged as arrays of ``0``/``1`` bytes rather than
+``'0'``/``'1'`` strings.  NumPy is optional: without it the same functions
+run on the pure Python ``Morse`` implementation and return ``bytes``.
+"""
+import sweetmorse.constants as c
+from sweetmorse.alphabet import INTERNATIONAL
+from sweetmorse.morse import Morse
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Characters are encoded in blocks so the per-block arrays stay small.  Even,
+# so that no block splits a pair of characters.
+_BLOCK_SIZE = 64 * 1024
+
+_UNITS_TO_BINARY = bytes.maketrans(b'\x00\x01', b'01')
+_BINARY_TO_UNITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+if np is not None:
+    _WORD_GAP_UNITS = len(c.BINARY_WORD_GAP)
+    _CHAR_GAP_UNITS = len(c.BINARY_CHAR_GAP)
+    _MAX_CODE_UNITS = max(map(len, c.BINARY_TO_PLAIN_TEXT))
+
+    # Per byte value: the units of its character followed by a char gap,
+    # as a number, and how many units that is.  Like the str tables in
+    # ``sweetmorse.morse``, the word gap only adds to the char gap before it.
+    _CODES = np.zeros(256, dtype=np.uint64)
+    _UNIT_COUNTS = np.zeros(256, dtype=np.uint64)
+    _ENCODABLE = np.zeros(256, dtype=bool)
+    for _char, _binary in c.PLAIN_TEXT_TO_BINARY.items():
+        _CODES[ord(_char)] = int(_binary + c.BINARY_CHAR_GAP, 2)
+        _UNIT_COUNTS[ord(_char)] = len(_binary) + _CHAR_GAP_UNITS
+        _ENCODABLE[ord(_char)] = True
+    _UNIT_COUNTS[ord(c.PLAIN_TEXT_WORD_GAP)] = (
+        _WORD_GAP_UNITS - _CHAR_GAP_UNITS
+    )
+    _ENCODABLE[ord(c.PLAIN_TEXT_WORD_GAP)] = True
+
+    # The same for every pair of bytes, read as a little-endian uint16, with
+    # the units at the top of a uint64.  A word gap straight after another
+    # one has no char gap to build on.  At most 44 units, so a pair spans
+    # two words of the output at most.
+    _FIRST = np.arange(1 << 16) & 0xff
+    _SECOND = np.arange(1 << 16) >> 8
+    _SECOND_COUNTS = _UNIT_COUNTS[_SECOND] + np.where(
+        (_FIRST == ord(c.PLAIN_TEXT_WORD_GAP)) &
+        (_SECOND == ord(c.PLAIN_TEXT_WORD_GAP)),
+        _CHAR_GAP_UNITS, 0,
+    ).astype(np.uint64)
+    _PAIR_UNIT_COUNTS = _UNIT_COUNTS[_FIRST] + _SECOND_COUNTS
+    _PAIR_CODES = (
+        (_CODES[_FIRST] << _SECOND_COUNTS | _CODES[_SECOND]) <<
+        (np.uint64(64) - _PAIR_UNIT_COUNTS) % np.uint64(64)
+    )
+    del _FIRST, _SECOND, _SECOND_COUNTS
+
+    # The first two set bits of every byte, most significant first, and -1
+    # where there are fewer, as the two bytes of a uint16
+    _BYTE_BITS = np.full((256, 2), -1, dtype=np.int8)
+    for _byte in range(256):
+        _bits = [bit for bit in range(8) if _byte & 0x80 >> bit][:2]
+        _BYTE_BITS[_byte, :len(_bits)] = _bits
+    _BYTE_BITS = _BYTE_BITS.view(np.uint16).ravel()
+
+    # Plain text byte by the units of a character read as a number after a
+    # leading 1, 0 where they are no character
+    _DECODING = np.zeros(1 << (_MAX_CODE_UNITS + 1), dtype=np.uint8)
+    for _binary, _char in c.BINARY_TO_PLAIN_TEXT.items():
+        _DECODING[int('1' + _binary, 2)] = ord(_char)
+
+
+def encode_binary(data):
+    """Encode ASCII plain text to an array of keying units.
+
+    Equivalent to ``Morse.from_plain_text(data).binary`` with every ``'0'``
+    and ``'1'`` as a ``0`` or ``1`` byte.  Returns a ``uint8`` ndarray, or
+    ``bytes`` without NumPy.
+    """
+    processed_value = bytes(data).strip().upper()
+
+    if np is None:
+        morse = Morse.from_plain_text(processed_value.decode('ascii'))
+        return morse.binary.encode('ascii').translate(_BINARY_TO_UNITS)
+
+    chars = np.frombuffer(processed_value, dtype=np.uint8)
+    encodable = _ENCODABLE[chars]
+    if not encodable.all():
+        raise ValueError(
+            'Characters given that cannot be Morse encoded: {}'
+            .format(set(map(chr, np.unique(chars[~encodable]))))
+        )
+    if not len(chars):
+        return np.zeros(0, dtype=np.uint8)
+
+    units = np.concatenate([
+        _encode_block(chars, start, start + _BLOCK_SIZE)
+        for start in range(0, len(chars), _BLOCK_SIZE)
+    ])
+    # Drop the char gap after the last character
+    return units[:-_CHAR_GAP_UNITS]
+
+
+def _encode_block(chars, start, stop):
+    # The units of chars[start:stop], pairs of characters at a time: each
+    # is looked up, shifted to where it starts in a word of the output, and
+    # added to the others starting in the word.  NumPy then unpacks the bits.
+    block = chars[start:stop]
+    if len(block) % 2:
+        # Byte 0 takes no units
+        block = np.append(block, np.uint8(0))
+    pairs = block.view('<u2')
+
+    counts = _PAIR_UNIT_COUNTS[pairs].astype(np.intp)
+    # A word gap after another in the pair before: the extra units go to
+    # the end of that pair, where they are zero in its code already
+    gap = ord(c.PLAIN_TEXT_WORD_GAP)
+    ends_in_gap = block[1::2] == gap
+    counts[:-1][ends_in_gap[:-1] & (block[2::2] == gap)] += _CHAR_GAP_UNITS
+    if ends_in_gap[-1] and stop < len(chars) and chars[stop] == gap:
+        counts[-1] += _CHAR_GAP_UNITS
+
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    shifts = (starts & 63).astype(np.uint64)
+    words = starts >> 6
+    codes = _PAIR_CODES[pairs]
+
+    packed = np.zeros(ends[-1] // 64 + 2, dtype=np.uint64)
+    # Pairs never share units, so adding them up ors them together
+    firsts = np.flatnonzero(np.concatenate(([True], words[1:] != words[:-1])))
+    packed[words[firsts]] = np.add.reduceat(codes >> shifts, firsts)
+    # Only the last pair starting in a word can run on into the next one
+    lasts = np.append(firsts[1:] - 1, len(words) - 1)
+    packed[words[lasts] + 1] |= (codes[lasts] << np.uint64(1)) << (
+        np.uint64(63) - shifts[lasts]
+    )
+    return np.unpackbits(packed.astype('>u8').view(np.uint8))[:ends[-1]]
+
+
+def decode_binary(units):
+    """Decode a sequence of ``0``/``1`` keying units to plain text.
+
+    Equivalent to ``Morse.from_binary(binary).plain_text`` for the ``'0'``
+    and ``'1'`` string of the same units.  Raises the same
+    ``MorseDecodeError``, with the offset of the invalid character or gap.
+    """
+    if np is None:
+        return Morse._binary_to_plain_text(
+            bytes(bytearray(units)).translate(_UNITS_TO_BINARY)
+            .decode('latin-1')
+        )
+
+    units = np.asarray(units).ravel()
+    if not len(units):
+        return ''
+
+    if units.dtype != np.uint8:
+        if ((units != 0) & (units != 1)).any():
+            raise _decode_error(units)
+        units = units.astype(np.uint8)
+    elif (units > 1).any():
+        raise _decode_error(units)
+
+    # Characters are the marks between gaps of three spaces or more, so
+    # they start at the marks after three spaces.  These are found on the
+    # units packed into bits, 64 at a time.
+    size = len(units)
+    packed = np.packbits(units)
+    words = np.zeros((size + 63) // 64 + 1, dtype='>u8')
+    words.view(np.uint8)[8:8 + len(packed)] = packed
+    words = words.astype(np.uint64)
+    marks, before = words[1:], words[:-1]
+    marks_before = np.zeros_like(marks)
+    for shift in range(1, _CHAR_GAP_UNITS + 1):
+        marks_before |= (marks >> np.uint64(shift)) | (
+            before << np.uint64(64 - shift)
+        )
+    char_starts = _bit_positions(marks & ~marks_before)
+
+    # The units from every character on, 32 at a time, which is more than
+    # a character and its char gap.  A character ends at the first mark
+    # followed by three spaces, and with a leading 1 its units give the
+    # entry of _DECODING.
+    padded = np.append(packed, np.zeros(3, dtype=np.uint8))
+    windows = np.ndarray(
+        (len(packed),), dtype='>u4', buffer=padded, strides=(1,)
+    )[char_starts >> 3].astype(np.uint32)
+    windows <<= (char_starts & 7).astype(np.uint32)
+    last_marks = windows & ~(
+        windows << np.uint32(1) |
+        windows << np.uint32(2) |
+        windows << np.uint32(3)
+    )
+    # The exponent is one more than the index of the highest bit, 0 if none
+    lengths = 33 - np.frexp(last_marks)[1]
+    long_chars = lengths > _MAX_CODE_UNITS
+    lengths = np.minimum(lengths, _MAX_CODE_UNITS).astype(np.uint32)
+    windows >>= np.uint32(32) - lengths
+    chars = _DECODING[windows | np.uint32(1) << lengths]
+
+    # Gaps before, between and after the characters must be word gaps and
+    # char gaps
+    gaps = np.append(char_starts, size) - np.concatenate(
+        ([0], char_starts + lengths)
+    )
+    bad_gaps = gaps % _WORD_GAP_UNITS % _CHAR_GAP_UNITS != 0
+
+    if bad_gaps.any() or long_chars.any() or not chars.all():
+        raise _decode_error(units)
+
+    # Every word gap emits a plain text word gap, every character one byte
+    words_before = np.cumsum(gaps // _WORD_GAP_UNITS)
+    plain_text = np.full(
+        len(chars) + words_before[-1],
+        ord(c.PLAIN_TEXT_WORD_GAP),
+        dtype=np.uint8,
+    )
+    plain_text[np.arange(len(chars)) + words_before[:-1]] = chars
+    return plain_text.tobytes().decode('ascii')
+
+
+def _bit_positions(words):
+    # Positions of the set bits of uint64 words, most significant first,
+    # when no byte has more than two, like the first marks of characters,
+    # which are four units apart or more
+    data = words.astype('>u8').view(np.uint8)
+    nonzero = np.flatnonzero(data)
+    bits = _BYTE_BITS[data[nonzero]].view(np.int8).reshape(-1, 2)
+    return ((nonzero * 8)[:, np.newaxis] + bits)[bits >= 0]
+
+
+def _decode_error(units):
+    # Only runs on invalid input, so it locates the error the way Morse
+    # does, on the string the pure Python version decodes.  Values that do
+    # not fit in a byte cannot be told apart there either.
+    in_byte = (units >= 0) & (units <= 255)
+    binary = np.where(in_byte, units, 255).astype(np.uint8).tobytes()
+    return Morse._binary_decode_error(
+        binary.translate(_UNITS_TO_BINARY).decode('latin-1'),
+        0,
+        INTERNATIONAL,
+    )
@@ -0,0 +1,115 @@
+"""Convert files of any size in constant memory.
+
+The input file is memory-mapped rather than read, so the operating system
+pages it in as needed, and pages already converted are dropped again where
+the platform allows.  The file is cut at word gaps into pieces about
+``chunk_size`` bytes long, and only one piece at a time is decoded into a
+string, converted and written.
+"""
+import mmap
+
+from sweetmorse.batch import (
+    DEFAULT_CHUNK_SIZE,
+    _WORD_GAPS,
+    _check_formats,
+    _convert_in_order,
+)
+
+# Bytes buffered before every write to the output file
+WRITE_BUFFER_SIZE = 1024 * 1024
+# mmap.madvise() is new in Python 3.8 and its flags depend on the platform
+_MADV_SEQUENTIAL = getattr(mmap, 'MADV_SEQUENTIAL', None)
+_MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)
+# Every format is ASCII, but UTF-8 keeps error messages about other
+# characters readable.  Pieces are cut before ASCII gap symbols, so a
+# character is never split between two of them.
+_ENCODING = 'utf-8'
+
+
+def convert_file(src, dst, from_format, to_format, jobs=1,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert the file at path ``src`` into ``dst``, a path or a binary
+    file object, like ``Morse.from_<format>(value).<format>``.
+
+    Pieces are converted on ``jobs`` processes (all CPU cores if ``None``).
+    Error offsets count bytes of ``src``.
+    """
+    _check_formats(from_format, to_format)
+
+    with open(src, 'rb') as input_file:
+        if isinstance(dst, (str, bytes)):
+            with open(dst, 'wb', buffering=WRITE_BUFFER_SIZE) as output_file:
+                _convert_mapped(
+                    input_file, output_file, from_format, to_format, jobs,
+                    chunk_size,
+                )
+        else:
+            _convert_mapped(
+                input_file, dst, from_format, to_format, jobs, chunk_size,
+            )
+
+
+def _convert_mapped(input_file, output_file, from_format, to_format, jobs,
+                    chunk_size):
+    try:
+        data = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # An empty file cannot be mapped, and converts to nothing
+        return
+
+    def tasks(view):
+        released = 0
+        for start, end in _pieces(data, from_format, chunk_size):
+            piece = str(view[start:end], _ENCODING)
+            released = _release(data, released, end)
+            yield None, (piece, from_format, to_format, start)
+
+    with data:
+        if _MADV_SEQUENTIAL is not None:
+            data.madvise(_MADV_SEQUENTIAL)
+        with memoryview(data) as view:
+            for _, converted in _convert_in_order(tasks(view), jobs):
+                output_file.write(converted.encode(_ENCODING))
+
+
+def _release(data, released, end):
+    # Drop the pages between released and end from memory, so that they do
+    # not count towards the resident set.  They are read from the file
+    # again if needed.  Returns the new end of the released pages.
+    if _MADV_DONTNEED is None:
+        return released
+
+    end -= end % mmap.PAGESIZE
+    if end > released:
+        data.madvise(_MADV_DONTNEED, released, end - released)
+    return max(released, end)
+
+
+def _pieces(data, from_format, chunk_size):
+    # Yield (start, end) of pieces of the stripped data, cut right before a
+    # word gap within chunk_size bytes of the start of the piece, like
+    # batch._pieces, or the first word gap after that.
+    word_gap = _WORD_GAPS[from_format].encode(_ENCODING)
+    gap_symbol = word_gap[0]
+
+    start = 0
+    end = len(data)
+    while start < end and data[start:start + 1].isspace():
+        start += 1
+    while end > start and data[end - 1:end].isspace():
+        end -= 1
+
+    limit = start + chunk_size
+    while limit < end:
+        cut = data.rfind(word_gap, start + 1, limit)
+        while cut > start and data[cut - 1] == gap_symbol:
+            cut -= 1
+        if cut > start:
+            yield start, cut
+            start = cut
+            limit = start + chunk_size
+        else:
+            limit += chunk_size
+
+    if start < end:
+        yield start, end
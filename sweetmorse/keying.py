@@ -0,0 +1,115 @@
+"""Key Morse out with accurate timing on an asyncio event loop.
+
+Every level change is scheduled against an absolute timeline that starts
+when the transmission does, so the time spent waking up and switching the
+output never adds up over a long message.  There is one wakeup per run of
+equal keying units, not one per unit, and waiting never blocks the loop, so
+one loop can key many outputs at once.
+"""
+import asyncio
+import heapq
+import itertools
+
+
+class LoopClock(object):
+    """The event loop's monotonic clock."""
+
+    def __init__(self, loop=None):
+        self.loop = loop
+
+    def time(self):
+        return self._loop().time()
+
+    async def sleep_until(self, deadline):
+        loop = self._loop()
+        future = loop.create_future()
+        handle = loop.call_at(deadline, _resolve, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    def _loop(self):
+        return self.loop or asyncio.get_event_loop()
+
+
+class FakeClock(object):
+    """A clock that only moves when every transmission is waiting on it.
+
+    Run transmissions through ``run()`` and they finish straight away, yet
+    see the same timeline as on a real clock.  Made for tests.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self._sleepers = []
+        self._order = itertools.count()
+
+    def time(self):
+        return self.now
+
+    async def sleep_until(self, deadline):
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(
+            self._sleepers, (deadline, next(self._order), future)
+        )
+        await future
+
+    async def run(self, *coroutines):
+        """Run ``coroutines`` to completion and return their results."""
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        while not all(task.done() for task in tasks):
+            # Let every task run until it waits on the clock or finishes
+            await asyncio.sleep(0)
+            running = sum(not task.done() for task in tasks)
+            if running and len(self._sleepers) >= running:
+                deadline, _, future = heapq.heappop(self._sleepers)
+                self.now = max(self.now, deadline)
+                _resolve(future)
+        return [task.result() for task in tasks]
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class KeyingTransmitter(object):
+    """Key ``Morse`` through ``output``, a callable taking the new level.
+
+    ``output(True)`` is called at the start of every mark and
+    ``output(False)`` at its end.  ``clock`` defaults to the event loop's
+    clock; pass a ``FakeClock`` to test without waiting or hardware.
+    """
+
+    def __init__(self, output, unit_duration, clock=None):
+        if unit_duration <= 0:
+            raise ValueError(
+                'Unit duration must be positive.  Given: {}'
+                .format(unit_duration)
+            )
+
+        self.output = output
+        self.unit_duration = unit_duration
+        self.clock = clock or LoopClock()
+
+    async def transmit(self, morse, start=None):
+        """Key ``morse`` starting at ``start`` on the clock (now by default)
+        and return when its last mark has ended.
+
+        Returns the time on the clock that the transmission ended at.
+        """
+        if start is None:
+            start = self.clock.time()
+
+        units = 0
+        for level, run_units in morse.iter_keying_events():
+            await self.clock.sleep_until(start + units * self.unit_duration)
+            self.output(level)
+            units += run_units
+
+        end = start + units * self.unit_duration
+        if units:
+            await self.clock.sleep_until(end)
+            self.output(False)
+        return end
@@ -0,0 +1,63 @@
+"""Convert many short messages, one per line, in one process.
+
+Every line is a message of its own and converts to one line of output,
+like ``Morse.from_<format>(line).<format>``.  A million messages then cost
+a million conversions of a few microseconds rather than a million runs of
+the CLI.
+"""
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+# Names of the constructors and properties of Morse, looked up when
+# converting rather than at import, so that sweetmorse.stats can time them
+_DECODERS = {
+    c.PLAIN: 'from_plain_text',
+    c.HUMAN_READABLE: 'from_human_readable',
+    c.BINARY: 'from_binary',
+}
+_ENCODERS = {
+    c.PLAIN: 'plain_text',
+    c.HUMAN_READABLE: 'human_readable',
+    c.BINARY: 'binary',
+}
+
+
+def _converters(from_format, to_format):
+    # (decode, encode) functions of the formats
+    for format_ in (from_format, to_format):
+        if format_ not in _DECODERS:
+            raise ValueError('Unknown format: {}'.format(format_))
+    return (
+        getattr(Morse, _DECODERS[from_format]),
+        getattr(Morse, _ENCODERS[to_format]).fget,
+    )
+
+
+def convert(lines, from_format, to_format, on_error=None):
+    """Yield every line of ``lines`` converted, without line endings.
+
+    A line that cannot be converted raises its ``ValueError``, unless
+    ``on_error`` is given: then ``on_error(line_number, error)`` is called
+    with the 1-based number of the line, and an empty line takes its place
+    so that output lines keep matching input lines.
+    """
+    # Looked up once rather than for every line
+    decode, encode = _converters(from_format, to_format)
+    for line_number, line in enumerate(lines, 1):
+        try:
+            yield encode(decode(line))
+        except ValueError as error:
+            if on_error is None:
+                raise
+            on_error(line_number, error)
+            yield ''
+
+
+def convert_file(input_file, output_file, from_format, to_format,
+                 on_error=None):
+    """Convert between text file objects a line at a time, see convert().
+    """
+    write = output_file.write
+    for converted in convert(input_file, from_format, to_format, on_error):
+        write(converted)
+        write('\n')
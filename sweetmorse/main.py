@@ -1,17 +1,37 @@
 #!/usr/bin/env python3
+import sys
+
 import sweetmorse.constants as c
 from sweetmorse.morse import Morse
 
+# Formats converted without any option, and without anything imported
+# beyond the conversions themselves
+_QUICK_FORMATS = (c.PLAIN, c.HUMAN_READABLE, c.BINARY, c.BINARY_PACKED)
+
 
 def main():
+    # Scripts call ``sweetmorse FROM TO`` on short input over and over, so
+    # that call starts up without argparse or the audio modules.  Anything
+    # else, including --help and bad arguments, goes through argparse.
+    arguments = sys.argv[1:]
+    if arguments[:1] == ['serve']:
+        serve(arguments[1:])
+        return
+    if len(arguments) == 2 and all(
+        argument in _QUICK_FORMATS for argument in arguments
+    ):
+        from_format, to_format = arguments
+        write_morse(sys.stdout, read_morse(sys.stdin, from_format), to_format)
+        return
+
     import argparse
-    import sys
 
-    choices = [c.PLAIN, c.HUMAN_READABLE, c.BINARY]
+    choices = [c.PLAIN, c.HUMAN_READABLE, c.BINARY, c.BINARY_PACKED, c.WAV]
 
     parser = argparse.ArgumentParser(
         description='Convert stdin between plain text and Morse code. '
-                    'Formats are {}'.format(choices)
+                    'Formats are {}.  See `%(prog)s serve --help` to serve '
+                    'conversions over a socket instead.'.format(choices)
     )
     parser.add_argument(
         dest='from_format',
@@ -29,26 +49,297 @@ def main():
         type=str,
         choices=choices,
         help='the format for output data')
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='convert stdin in chunks as it arrives instead of reading it '
+             'all into memory first')
+    parser.add_argument(
+        '--lines',
+        action='store_true',
+        help='convert every line of stdin as a message of its own, into a '
+             'line of output')
+    parser.add_argument(
+        '--skip-errors',
+        action='store_true',
+        help='with --lines, report lines that cannot be converted on stderr '
+             'and write empty lines for them instead of stopping')
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='print throughput and the time spent in every phase of the '
+             'conversions to stderr, not counting --jobs workers')
+    parser.add_argument(
+        '--sample-rate',
+        default=c.DEFAULT_SAMPLE_RATE,
+        type=int,
+        help='samples per second of {} output'.format(c.WAV))
+    parser.add_argument(
+        '--wpm',
+        default=c.DEFAULT_WPM,
+        type=float,
+        help='words per minute of {} output, and the first guess of the '
+             'speed of {} input'.format(c.WAV, c.WAV))
+    parser.add_argument(
+        '--frequency',
+        default=c.DEFAULT_FREQUENCY,
+        type=float,
+        help='tone frequency in Hz of {} data'.format(c.WAV))
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='convert on this many processes, cutting the input at word '
+             'gaps (all CPU cores with --input-dir)')
+    parser.add_argument(
+        '--input',
+        metavar='FILE',
+        help='convert this file instead of stdin, memory-mapped so that '
+             'files of any size convert in constant memory')
+    parser.add_argument(
+        '--input-dir',
+        help='convert every file in this directory instead of stdin')
+    parser.add_argument(
+        '--output-dir',
+        help='where --input-dir writes converted files, under the same names')
     args = parser.parse_args()
 
-    input_str = sys.stdin.read()
+    if not args.stats:
+        convert(args, parser)
+        return
+
+    import time
+    from sweetmorse.stats import collect
+
+    start = time.perf_counter()
+    try:
+        with collect() as stats:
+            convert(args, parser)
+    finally:
+        sys.stderr.write(
+            '{:.6f} seconds, {:.6f} of them converting\n'.format(
+                time.perf_counter() - start, stats.seconds
+            )
+        )
+        stats.report(sys.stderr)
+
+
+def convert(args, parser):
+    if args.skip_errors and not args.lines:
+        parser.error('--skip-errors goes with --lines')
+    if args.lines:
+        if (
+            args.stream or args.jobs is not None or
+            args.input is not None or args.input_dir is not None
+        ):
+            parser.error(
+                '--lines cannot be combined with --stream, --jobs, --input '
+                'or --input-dir'
+            )
+        for unsupported in (c.BINARY_PACKED, c.WAV):
+            if unsupported in (args.from_format, args.to_format):
+                parser.error('--lines does not support {}'.format(unsupported))
+
+        from sweetmorse.lines import convert_file
+
+        errors = []
+
+        def on_error(line_number, error):
+            message = 'line {}: {}'.format(line_number, error)
+            if not args.skip_errors:
+                sys.exit(message)
+            errors.append(message)
+            print(message, file=sys.stderr)
+
+        convert_file(
+            sys.stdin, sys.stdout, args.from_format, args.to_format,
+            on_error=on_error,
+        )
+        if errors:
+            sys.exit(1)
+        return
+
+    if args.input is not None:
+        if args.stream or args.input_dir is not None:
+            parser.error(
+                '--input cannot be combined with --stream or --input-dir'
+            )
+        for unmappable in (c.BINARY_PACKED, c.WAV):
+            if unmappable in (args.from_format, args.to_format):
+                parser.error('--input does not support {}'.format(unmappable))
+
+        from sweetmorse.io import convert_file
+
+        sys.stdout.flush()
+        convert_file(
+            args.input, sys.stdout.buffer, args.from_format, args.to_format,
+            jobs=1 if args.jobs is None else args.jobs,
+        )
+        sys.stdout.buffer.write(b'\n')
+        return
+
+    batched = args.jobs is not None or args.input_dir is not None
+    if batched:
+        if args.stream:
+            parser.error('--stream cannot be combined with --jobs')
+        if (args.input_dir is None) != (args.output_dir is None):
+            parser.error('--input-dir and --output-dir go together')
+        for unbatchable in (c.BINARY_PACKED, c.WAV):
+            if unbatchable in (args.from_format, args.to_format):
+                parser.error('--jobs does not support {}'.format(unbatchable))
+
+    if args.input_dir is not None:
+        import os
+        from sweetmorse.batch import convert_files
+
+        os.makedirs(args.output_dir, exist_ok=True)
+        convert_files(
+            sorted(
+                path
+                for path in (
+                    os.path.join(args.input_dir, name)
+                    for name in os.listdir(args.input_dir)
+                )
+                if os.path.isfile(path)
+            ),
+            args.output_dir,
+            args.from_format,
+            args.to_format,
+            jobs=args.jobs,
+        )
+        return
 
-    morse = (
+    if args.jobs is not None:
+        from sweetmorse.batch import convert_file
+
+        convert_file(
+            sys.stdin, sys.stdout, args.from_format, args.to_format,
+            jobs=args.jobs,
+        )
+        print()
+        return
+
+    for unstreamable in (c.BINARY_PACKED, c.WAV):
+        if args.stream and unstreamable in (args.from_format, args.to_format):
+            parser.error('--stream does not support {}'.format(unstreamable))
+
+    if args.stream:
+        from sweetmorse.stream import convert_file
+
+        convert_file(sys.stdin, sys.stdout, args.from_format, args.to_format)
+        print()
+        return
+
+    if args.from_format == c.WAV:
+        from sweetmorse.timing import AdaptiveTiming, wpm_to_unit_duration
+        from sweetmorse.tone import decode_wav
+
+        errors = []
+        morse = decode_wav(
+            sys.stdin.buffer,
+            frequency=args.frequency,
+            timing=AdaptiveTiming(wpm_to_unit_duration(args.wpm)),
+            errors=errors,
+        )
+        for error in errors:
+            print(
+                'unit {}: left out {}, which is not Morse'
+                .format(error.start, error.value),
+                file=sys.stderr,
+            )
+    else:
+        morse = read_morse(sys.stdin, args.from_format)
+
+    if args.to_format == c.WAV:
+        from sweetmorse import audio
+
+        sys.stdout.flush()
+        audio.write_wav(
+            sys.stdout.buffer,
+            morse.binary,
+            sample_rate=args.sample_rate,
+            wpm=args.wpm,
+            frequency=args.frequency,
+        )
+        return
+
+    write_morse(sys.stdout, morse, args.to_format)
+
+
+def serve(arguments):
+    import argparse
+    from sweetmorse import server
+
+    parser = argparse.ArgumentParser(
+        prog='sweetmorse serve',
+        description='Serve conversions between {}, {} and {} over a Unix '
+                    'socket or TCP, see sweetmorse.server for the protocol '
+                    'and clients'.format(c.PLAIN, c.HUMAN_READABLE, c.BINARY)
+    )
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='listen on a Unix socket at this path instead of TCP')
+    parser.add_argument(
+        '--host',
+        default=server.DEFAULT_HOST,
+        help='TCP address to listen on')
+    parser.add_argument(
+        '--port',
+        default=server.DEFAULT_PORT,
+        type=int,
+        help='TCP port to listen on')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='worker processes for large payloads (all CPU cores by '
+             'default)')
+    parser.add_argument(
+        '--offload-size',
+        default=server.DEFAULT_OFFLOAD_SIZE,
+        type=int,
+        help='characters of payload from which it is converted on a worker '
+             'process')
+    args = parser.parse_args(arguments)
+
+    server.serve(
+        path=args.socket,
+        host=args.host,
+        port=args.port,
+        jobs=args.jobs,
+        offload_size=args.offload_size,
+    )
+
+
+def read_morse(input_file, from_format):
+    if from_format == c.BINARY_PACKED:
+        return Morse.from_binary_bytes(input_file.buffer.read())
+
+    input_str = input_file.read()
+
+    return (
         Morse.from_plain_text(input_str)
-        if args.from_format == c.PLAIN
+        if from_format == c.PLAIN
         else Morse.from_human_readable(input_str)
-        if args.from_format == c.HUMAN_READABLE
+        if from_format == c.HUMAN_READABLE
         else Morse.from_binary(input_str)
     )
 
+
+def write_morse(output_file, morse, to_format):
+    if to_format == c.BINARY_PACKED:
+        output_file.flush()
+        output_file.buffer.write(morse.binary_bytes)
+        return
+
     print(
         morse.plain_text
-        if args.to_format == c.PLAIN
+        if to_format == c.PLAIN
         else
         morse.human_readable
-        if args.to_format == c.HUMAN_READABLE
+        if to_format == c.HUMAN_READABLE
         else
-        morse.binary
+        morse.binary,
+        file=output_file,
     )
 
 
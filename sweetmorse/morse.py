@@ -1,43 +1,299 @@
-import itertools
+import collections
+import functools
+import re
+
+import sweetmorse.alphabet
 import sweetmorse.constants as c
+from sweetmorse.alphabet import (
+    BINARY_WORD_MARK,
+    HUMAN_READABLE_TREE_BRANCHES,
+    HUMAN_READABLE_TREE_ROOT,
+    HUMAN_READABLE_WORD_MARK,
+    INTERNATIONAL,
+    _consists_of,
+)
+
+
+class MorseDecodeError(ValueError):
+    """Input that is not valid in the format it is decoded from.
+
+    ``offset`` is the index of the first invalid symbol in the input.
+    """
+
+    def __init__(self, message, offset):
+        super(MorseDecodeError, self).__init__(message)
+        self.offset = offset
+
+    def __reduce__(self):
+        # Survive pickling, e.g. when raised in a worker process
+        return type(self), (self.args[0], self.offset)
+
+
+# Runs of two or more zeros can only be gaps, single zeros only sit inside
+# characters.
+_BINARY_GAP = re.compile('(00+)')
+_BINARY_MARKED_WORD_GAP = (
+    c.BINARY_CHAR_GAP + BINARY_WORD_MARK + c.BINARY_CHAR_GAP
+)
+_HUMAN_READABLE_MARKED_WORD_GAP = (
+    c.HUMAN_READABLE_CHAR_GAP + HUMAN_READABLE_WORD_MARK +
+    c.HUMAN_READABLE_CHAR_GAP
+)
+
+# Runs of spaces are all valid gaps
+_HUMAN_READABLE_GAP = re.compile('( +)')
+# Lenient decoding reads a binary gap of invalid length as word gaps when
+# it ends at least this close to the length of a word gap
+_BINARY_WORD_GAP_THRESHOLD = (
+    len(c.BINARY_CHAR_GAP) + len(c.BINARY_WORD_GAP)
+) // 2
+
+# Stands in for characters that lenient decoding cannot make out
+REPLACEMENT_CHARACTER = '\ufffd'
+# A stretch of invalid input found by lenient decoding, between the
+# ``start`` and ``end`` indexes of the input, and what it decoded to
+ErrorSpan = collections.namedtuple(
+    'ErrorSpan', ['start', 'end', 'value', 'replacement']
+)
+
+_BITS_PER_BYTE = 8
+
+# Keying events are (level, units) runs, see Alphabet for the characters
+_CHAR_GAP_UNITS = len(c.BINARY_CHAR_GAP)
+_WORD_GAP_UNITS = len(c.BINARY_WORD_GAP)
+_KEYING_LEVELS = {False: '0', True: '1'}
+
+_BINARY_SYMBOL_STRING = ''.join(sorted(c.BINARY_SYMBOLS))
+_BINARY_SYMBOL_BYTES = _BINARY_SYMBOL_STRING.encode('ascii')
+_HUMAN_READABLE_SYMBOL_STRING = ''.join(sorted(c.HUMAN_READABLE_SYMBOLS))
+_HUMAN_READABLE_SYMBOL_BYTES = _HUMAN_READABLE_SYMBOL_STRING.encode('ascii')
+
+
+def _look_up_pieces(processed_value, decoding, word_mark, word_gap,
+                    marked_word_gap, char_gap):
+    # Marking word gaps leaves a char gap on either side of the mark, so
+    # one split cuts the input into characters, word gap marks and empty
+    # strings (doubled char gaps).  One lookup per piece then decodes and
+    # validates at the same time.  Returns the decoded pieces, or None if
+    # any piece is invalid.
+    if word_mark in processed_value:
+        return None
+    chars = list(map(
+        decoding.get,
+        processed_value.replace(word_gap, marked_word_gap).split(char_gap)
+    ))
+    return None if None in chars else chars
+
+
+def _binary_gap_word_gaps(length):
+    # (word gaps, whether valid) in a gap of length zeros: any number of
+    # word gaps followed by any number of char gaps, else the nearest
+    rest = length % len(c.BINARY_WORD_GAP)
+    if rest % len(c.BINARY_CHAR_GAP):
+        return (
+            (
+                length + len(c.BINARY_WORD_GAP) - _BINARY_WORD_GAP_THRESHOLD
+            ) // len(c.BINARY_WORD_GAP),
+            False,
+        )
+    return length // len(c.BINARY_WORD_GAP), True
+
+
+def _human_readable_gap_word_gaps(length):
+    # Every run of spaces is valid
+    return length // len(c.HUMAN_READABLE_WORD_GAP), True
+
+
+def _indexes(values, value):
+    # Indexes of value in values.  list.index() scans in C, so this is
+    # quick when value is rare.
+    indexes = []
+    index = -1
+    while True:
+        try:
+            index = values.index(value, index + 1)
+        except ValueError:
+            return indexes
+        indexes.append(index)
+
+
+# Decoding accepts longer gaps than encoding makes, such as two char gaps
+# in a row.  Counting is enough to tell the encoding of a text apart from
+# the other inputs that decode to it.
+def _is_canonical(pieces, plain_text, alphabet):
+    # Encoded Morse decodes from one piece per character and per word gap,
+    # plus an empty one per empty word.  Longer gaps only add empty pieces.
+    word_gaps = plain_text.count(c.PLAIN_TEXT_WORD_GAP)
+    empty_words = word_gaps + 1 - len(plain_text.split())
+    return len(pieces) == (
+        alphabet.count_chars(plain_text) + word_gaps + empty_words
+    )
+
+
+DEFAULT_WORD_CACHE_SIZE = 4096
+# The word conversions that cache_words() memoizes, by name, and the Morse
+# methods that make them
+_WORD_CONVERSIONS = {
+    'plain_text_to_human_readable': '_plain_text_word_to_human_readable',
+    'plain_text_to_binary': '_plain_text_word_to_binary',
+    'human_readable_to_plain_text': '_human_readable_word_to_plain_text',
+    'binary_to_plain_text': '_binary_word_to_plain_text',
+}
+_word_cache_size = 0
+# (id of an alphabet, conversion name) to (alphabet, memoized conversion).
+# Keeping the alphabet keeps its id from being reused, and ids hash much
+# faster than alphabets.
+_word_caches = {}
+
+
+def cache_words(maxsize=DEFAULT_WORD_CACHE_SIZE):
+    """Memoize conversions a word at a time, keeping the ``maxsize`` most
+    recently used words of every conversion and alphabet.
+
+    Traffic made of a few words over and over, such as calls, signal
+    reports and callsigns, converts about twice as fast once they are
+    cached.  Text of few repeats is slower: it pays for the cache lookups
+    and saves nothing.  ``0`` turns caching off again, and either way the
+    caches start out empty.
+    """
+    global _word_cache_size
+    _word_cache_size = maxsize
+    _word_caches.clear()
+
+
+def word_cache_info(alphabet=None):
+    """``functools.lru_cache`` statistics of every word conversion of
+    ``alphabet``, as a dict by conversion name, such as
+    ``'plain_text_to_binary'``.  Empty while caching is off."""
+    if alphabet is None:
+        alphabet = INTERNATIONAL
+    if not _word_cache_size:
+        return {}
+    return {
+        name: _word_cache(alphabet, name).cache_info()
+        for name in _WORD_CONVERSIONS
+    }
+
+
+def _word_cache(alphabet, name):
+    # The memoized word conversion, or None while caching is off
+    if not _word_cache_size:
+        return None
+    key = (id(alphabet), name)
+    try:
+        return _word_caches[key][1]
+    except KeyError:
+        cache = functools.lru_cache(_word_cache_size)(functools.partial(
+            getattr(Morse, _WORD_CONVERSIONS[name]), alphabet=alphabet
+        ))
+        _word_caches[key] = alphabet, cache
+        return cache
+
+
+def _word_to_plain_text(word, encoded_to_plain_text, char_gap):
+    if not word:
+        return word
+    try:
+        return c.PLAIN_TEXT_CHAR_GAP.join(
+            map(encoded_to_plain_text.__getitem__, word.split(char_gap))
+        )
+    except KeyError:
+        return None
+
+
+def _cached_words_to_plain_text(processed_value, alphabet, name, word_gap):
+    # Plain text decoded a word at a time through the word cache, or None
+    # if caching is off or any word needs the full decoder, which then
+    # handles gaps of other lengths and reports errors.
+    cache = _word_cache(alphabet, name)
+    if cache is None:
+        return None
+    words = list(map(cache, processed_value.split(word_gap)))
+    if None in words:
+        return None
+    return c.PLAIN_TEXT_WORD_GAP.join(words)
+
+
+def _alphabet_repr(alphabet):
+    # An expression that makes ``alphabet``: the name of a standard one
+    # in sweetmorse.alphabet, or its (token, code) pairs with the tokens
+    # that win a shared code last
+    if getattr(sweetmorse.alphabet, str(alphabet.name), None) is alphabet:
+        return alphabet.name
+    pairs = sorted(
+        alphabet.plain_text_to_human_readable.items(),
+        key=lambda pair: (
+            alphabet.human_readable_to_plain_text[pair[1]] == pair[0]
+        ),
+    )
+    return '{}({!r})'.format(alphabet.__class__.__name__, pairs)
 
 
 class Morse(object):
+    """A Morse message, convertible between plain text, human-readable and
+    binary Morse.
+
+    Only the plain text is stored.  The other formats are encoded on first
+    use and kept, and the input a message was decoded from is kept as its
+    own format whenever it is exactly what encoding would make.  Messages
+    are immutable, and equal when their plain text and alphabet are.
+
+    Every constructor takes the ``alphabet`` of the message, a
+    ``sweetmorse.alphabet.Alphabet``, international Morse by default.
+    """
+
+    __slots__ = ('_plain_text', '_human_readable', '_binary', '_alphabet')
 
     @classmethod
-    def parse(cls, value):
+    def parse(cls, value, alphabet=None):
+        """Decode ``value`` from whichever format it is in.
+
+        Input made of binary symbols only is binary, else input made of
+        human-readable symbols only is human-readable, else it is plain
+        text.
+        """
+        if alphabet is None:
+            alphabet = INTERNATIONAL
         if not isinstance(value, str):
             raise TypeError(
                 'Value must be a string.  Given: {}'.format(type(value))
             )
 
-        processed_value = value.strip().upper()
-        distinct_input_symbols = set(processed_value)
-
-        if all(
-            symbol in c.BINARY_SYMBOLS
-            for symbol in distinct_input_symbols
+        # The first symbol rules out all but one format for most input, so
+        # only that one is checked in full.  Empty input is binary, as every
+        # string contains the empty string.
+        processed_value = value.strip()
+        first_symbol = processed_value[:1]
+        if (
+            first_symbol in _BINARY_SYMBOL_STRING and
+            _consists_of(processed_value, _BINARY_SYMBOL_BYTES)
         ):
-            return cls.from_binary(value)
+            return cls._from_binary(
+                processed_value,
+                offset=len(value) - len(value.lstrip()),
+                alphabet=alphabet,
+            )
 
-        elif all(
-            symbol in c.HUMAN_READABLE_SYMBOLS
-            for symbol in distinct_input_symbols
+        elif (
+            first_symbol in _HUMAN_READABLE_SYMBOL_STRING and
+            _consists_of(processed_value, _HUMAN_READABLE_SYMBOL_BYTES)
         ):
-            return cls.from_human_readable(value)
+            return cls._from_human_readable(
+                processed_value,
+                offset=len(value) - len(value.lstrip()),
+                alphabet=alphabet,
+            )
 
-        elif all(
-            symbol in c.PLAIN_TEXT_SYMBOLS
-            for symbol in distinct_input_symbols
-        ):
-            return cls.from_plain_text(value)
+        processed_value = processed_value.upper()
+        if alphabet.is_plain_text(processed_value):
+            return cls._from_plain_text(processed_value, alphabet=alphabet)
 
         else:
             problem_symbols = (
-                distinct_input_symbols
+                set(processed_value)
                 .difference(c.BINARY_SYMBOLS)
                 .difference(c.HUMAN_READABLE_SYMBOLS)
-                .difference(c.PLAIN_TEXT_SYMBOLS)
+                .difference(alphabet.plain_text_symbols)
             )
             raise ValueError(
                 'Characters given that do not belong to any format accepted'
@@ -46,196 +302,721 @@ class Morse(object):
             )
 
     @classmethod
-    def from_plain_text(cls, value):
+    def from_plain_text(cls, value, alphabet=None):
         if not isinstance(value, str):
             raise TypeError(
                 'Value must be a string.  Given: {}'.format(type(value))
             )
 
         processed_value = value.strip().upper()
-        distinct_characters = set(processed_value)
+        cls._validate_plain_text(processed_value, alphabet)
+        return cls._from_plain_text(processed_value, alphabet=alphabet)
 
-        problem_characters = distinct_characters.difference(
-            c.PLAIN_TEXT_ALPHABET
-        )
+    @classmethod
+    def _to_plain_text(cls, processed_value, from_format, offset=0,
+                       alphabet=None):
+        # Decode without stripping, so that pieces of a larger input keep
+        # their leading and trailing gaps.
+        if from_format == c.BINARY:
+            return cls._binary_to_plain_text(
+                processed_value, offset=offset, alphabet=alphabet
+            )
+        elif from_format == c.HUMAN_READABLE:
+            return cls._human_readable_to_plain_text(
+                processed_value, offset=offset, alphabet=alphabet
+            )
+        else:
+            plain_text = processed_value.upper()
+            cls._validate_plain_text(plain_text, alphabet)
+            return plain_text
+
+    @classmethod
+    def _validate_plain_text(cls, processed_value, alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        if alphabet.is_plain_text(processed_value):
+            return
+
+        problem_characters = alphabet.invalid_plain_text(processed_value)
         if problem_characters:
             raise ValueError(
                 'Characters given that cannot be Morse encoded: {}'
                 .format(problem_characters)
             )
 
-        words = [
-            word
-            for word in processed_value.split(c.PLAIN_TEXT_WORD_GAP)
-        ]
-        return cls(words)
-
     @classmethod
-    def from_human_readable(cls, value):
+    def from_human_readable(cls, value, alphabet=None):
         if not isinstance(value, str):
             raise TypeError(
                 'Value must be a string.  Given: {}'.format(type(value))
             )
 
-        words = value.strip().split(c.HUMAN_READABLE_WORD_GAP)
+        return cls._from_human_readable(
+            value.strip(),
+            offset=len(value) - len(value.lstrip()),
+            alphabet=alphabet,
+        )
 
-        distinct_characters = set(
-            itertools.chain(
-                char
-                for word in words
-                for char in word.split(c.HUMAN_READABLE_CHAR_GAP)
-                if char  # Filter empty strings
+    @classmethod
+    def _from_human_readable(cls, processed_value, offset=0, alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        plain_text = _cached_words_to_plain_text(
+            processed_value, alphabet, 'human_readable_to_plain_text',
+            c.HUMAN_READABLE_WORD_GAP,
+        )
+        if plain_text is not None:
+            # Made of whole words, so exactly what encoding would make
+            return cls._from_plain_text(
+                plain_text, human_readable=processed_value, alphabet=alphabet,
             )
+
+        pieces = cls._human_readable_to_pieces(
+            processed_value, offset=offset, alphabet=alphabet
         )
-        problem_characters = (
-            distinct_characters
-            .difference(c.HUMAN_READABLE_CHARS)
-            .difference(c.HUMAN_READABLE_CHAR_GAP)
+        plain_text = c.PLAIN_TEXT_CHAR_GAP.join(pieces)
+        return cls._from_plain_text(
+            plain_text,
+            human_readable=processed_value,
+            source_is_canonical=_is_canonical(pieces, plain_text, alphabet),
+            alphabet=alphabet,
         )
-        if problem_characters:
-            raise ValueError(
-                'Characters given that are not '
-                'human-readable Morse encoded: {problem_characters}\n'
-                'Human-readable Morse characters look like {example}, the '
-                'characters are separated by \'{char_sep}\', and the '
-                'words are separated by \'{word_sep}\'.'
-                .format(
-                    problem_characters=', '.join(problem_characters),
-                    example=c.PLAIN_TEXT_TO_HUMAN_READABLE["L"],
-                    char_sep=c.HUMAN_READABLE_CHAR_GAP,
-                    word_sep=c.HUMAN_READABLE_WORD_GAP,
-                )
+
+    @classmethod
+    def _human_readable_to_plain_text(cls, processed_value, offset=0,
+                                      alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        plain_text = _cached_words_to_plain_text(
+            processed_value, alphabet, 'human_readable_to_plain_text',
+            c.HUMAN_READABLE_WORD_GAP,
+        )
+        if plain_text is not None:
+            return plain_text
+
+        return c.PLAIN_TEXT_CHAR_GAP.join(
+            cls._human_readable_to_pieces(
+                processed_value, offset=offset, alphabet=alphabet
             )
+        )
 
-        plain_text_words = [
-            cls._human_readable_word_to_plain_text(word)
-            for word in words
-        ]
-        return cls(plain_text_words)
+    @classmethod
+    def _human_readable_to_pieces(cls, processed_value, offset=0,
+                                  alphabet=None):
+        # Like _binary_to_pieces()
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        chars = _look_up_pieces(
+            processed_value,
+            alphabet._human_readable_decoding,
+            HUMAN_READABLE_WORD_MARK,
+            c.HUMAN_READABLE_WORD_GAP,
+            _HUMAN_READABLE_MARKED_WORD_GAP,
+            c.HUMAN_READABLE_CHAR_GAP,
+        )
+        if chars is not None:
+            return chars
+
+        # The tree walk raises where the input first goes wrong
+        return [cls._human_readable_tree_to_plain_text(
+            processed_value, offset=offset, alphabet=alphabet
+        )]
 
     @classmethod
-    def _human_readable_word_to_plain_text(cls, word):
-        return c.PLAIN_TEXT_CHAR_GAP.join(
-            c.HUMAN_READABLE_TO_PLAIN_TEXT[char]
-            for char in word.split(c.HUMAN_READABLE_CHAR_GAP)
-            if char  # Filter empty strings
+    def _human_readable_word_to_plain_text(cls, word, alphabet=None):
+        # Like _binary_word_to_plain_text()
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        return _word_to_plain_text(
+            word,
+            alphabet.human_readable_to_plain_text,
+            c.HUMAN_READABLE_CHAR_GAP,
+        )
+
+    @classmethod
+    def _human_readable_tree_to_plain_text(cls, processed_value, offset=0,
+                                           alphabet=None):
+        # Walks the code tree a symbol at a time, decoding and validating in
+        # one pass without cutting the input up.  It always knows where the
+        # current character started, but a loop in Python is several times
+        # slower than splitting, so it only runs on input that did not
+        # split into valid pieces, to find the first invalid symbol.
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        tree = alphabet._human_readable_tree
+        word_gap_spaces = len(c.HUMAN_READABLE_WORD_GAP)
+        pieces = []
+        node = HUMAN_READABLE_TREE_ROOT
+        char_start = 0
+        spaces = 0
+        problem = None
+        for index, symbol in enumerate(processed_value):
+            if symbol == c.HUMAN_READABLE_CHAR_GAP:
+                if node != HUMAN_READABLE_TREE_ROOT:
+                    if tree[node] is None:
+                        problem = char_start
+                        break
+                    pieces.append(tree[node])
+                    node = HUMAN_READABLE_TREE_ROOT
+                spaces += 1
+                continue
+
+            branch = HUMAN_READABLE_TREE_BRANCHES.get(symbol)
+            if branch is None:
+                problem = index
+                break
+            if spaces:
+                pieces.append(
+                    c.PLAIN_TEXT_WORD_GAP * (spaces // word_gap_spaces)
+                )
+                spaces = 0
+            if node == HUMAN_READABLE_TREE_ROOT:
+                char_start = index
+            node = 2 * node + branch
+            if node >= len(tree):
+                problem = char_start
+                break
+        else:
+            if node != HUMAN_READABLE_TREE_ROOT:
+                if tree[node] is None:
+                    problem = char_start
+                else:
+                    pieces.append(tree[node])
+            pieces.append(c.PLAIN_TEXT_WORD_GAP * (spaces // word_gap_spaces))
+
+        if problem is None:
+            return c.PLAIN_TEXT_CHAR_GAP.join(pieces)
+        raise cls._human_readable_decode_error(
+            processed_value, problem, offset, alphabet
+        )
+
+    @classmethod
+    def _human_readable_decode_error(cls, processed_value, index, offset,
+                                     alphabet):
+        symbol = processed_value[index]
+        if symbol in HUMAN_READABLE_TREE_BRANCHES:
+            code = re.match('[._]*', processed_value[index:]).group()
+            problem = (
+                'Character given that is not human-readable Morse encoded: '
+                '{}'.format(code)
+            )
+        else:
+            problem = (
+                'Value given that is not human-readable Morse encoded: {}'
+                .format(symbol)
+            )
+
+        return MorseDecodeError(
+            '{problem} at offset {offset}\n'
+            'Human-readable Morse characters look like {example}, the '
+            'characters are separated by \'{char_sep}\', and the '
+            'words are separated by \'{word_sep}\'.'
+            .format(
+                problem=problem,
+                offset=offset + index,
+                example=alphabet.plain_text_to_human_readable[
+                    alphabet.example
+                ],
+                char_sep=c.HUMAN_READABLE_CHAR_GAP,
+                word_sep=c.HUMAN_READABLE_WORD_GAP,
+            ),
+            offset + index,
         )
 
     @classmethod
-    def from_binary(cls, value):
+    def from_binary(cls, value, alphabet=None):
         if not isinstance(value, str):
             raise TypeError(
                 'Value must be a string.  Given: {}'.format(type(value))
             )
 
-        processed_value = value.strip()
+        return cls._from_binary(
+            value.strip(),
+            offset=len(value) - len(value.lstrip()),
+            alphabet=alphabet,
+        )
 
-        # Do we only have 0 and 1?
-        distinct_values = set(processed_value)
-        problem_values = distinct_values.difference({"0", "1"})
-        if problem_values:
-            raise ValueError(
-                'Values given that are not '
-                'binary Morse encoded: {problem_values}\n'
-                'Binary Morse characters look like {example}, the '
-                'characters are separated by {char_sep}, and the '
-                'words are separated by {word_sep}.'
-                .format(
-                    problem_values=', '.join(problem_values),
-                    example=c.PLAIN_TEXT_TO_BINARY["L"],
-                    char_sep=c.BINARY_CHAR_GAP,
-                    word_sep=c.BINARY_WORD_GAP,
-                )
+    @classmethod
+    def _from_binary(cls, processed_value, offset=0, alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        plain_text = _cached_words_to_plain_text(
+            processed_value, alphabet, 'binary_to_plain_text',
+            c.BINARY_WORD_GAP,
+        )
+        if plain_text is not None:
+            # Made of whole words, so exactly what encoding would make
+            return cls._from_plain_text(
+                plain_text, binary=processed_value, alphabet=alphabet,
             )
 
-        # Do we have a valid sequence of 0 and 1?
-        words = processed_value.split(c.BINARY_WORD_GAP)
-        distinct_characters = set(
-            itertools.chain(
-                char
-                for word in words
-                for char in word.split(c.BINARY_CHAR_GAP)
-                if char  # Filter empty strings
+        pieces = cls._binary_to_pieces(
+            processed_value, offset=offset, alphabet=alphabet
+        )
+        plain_text = c.PLAIN_TEXT_CHAR_GAP.join(pieces)
+        return cls._from_plain_text(
+            plain_text,
+            binary=processed_value,
+            source_is_canonical=_is_canonical(
+                pieces, plain_text, alphabet
+            ),
+            alphabet=alphabet,
+        )
+
+    @classmethod
+    def _binary_to_plain_text(cls, processed_value, offset=0, alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        plain_text = _cached_words_to_plain_text(
+            processed_value, alphabet, 'binary_to_plain_text',
+            c.BINARY_WORD_GAP,
+        )
+        if plain_text is not None:
+            return plain_text
+
+        return c.PLAIN_TEXT_CHAR_GAP.join(
+            cls._binary_to_pieces(
+                processed_value, offset=offset, alphabet=alphabet
             )
         )
-        problem_characters = distinct_characters.difference(c.BINARY_CHARS)
-        if problem_characters:
-            raise ValueError(
-                'Characters given that are not '
-                'binary Morse encoded: {problem_characters}\n'
-                'Binary Morse characters look like {example}, the '
-                'characters are separated by {char_sep}, and the '
-                'words are separated by {word_sep}.'
-                .format(
-                    problem_characters=', '.join(problem_characters),
-                    example=c.PLAIN_TEXT_TO_BINARY["L"],
-                    char_sep=c.BINARY_CHAR_GAP,
-                    word_sep=c.BINARY_WORD_GAP,
-                )
+
+    @classmethod
+    def _binary_to_pieces(cls, processed_value, offset=0, alphabet=None):
+        # ``offset`` is where ``processed_value`` starts in the user's
+        # input.
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        chars = _look_up_pieces(
+            processed_value,
+            alphabet._binary_decoding,
+            BINARY_WORD_MARK,
+            c.BINARY_WORD_GAP,
+            _BINARY_MARKED_WORD_GAP,
+            c.BINARY_CHAR_GAP,
+        )
+        if chars is not None:
+            return chars
+
+        raise cls._binary_decode_error(processed_value, offset, alphabet)
+
+    @classmethod
+    def _binary_decode_error(cls, processed_value, offset, alphabet):
+        # Only runs on invalid input, so it can afford a slower tokenizer
+        # that keeps track of where each piece came from.
+        for index, part in enumerate(
+            _BINARY_GAP.split(processed_value)
+        ):
+            if index % 2:
+                # Any number of word gaps followed by any number of char gaps
+                word_gaps_rest = len(part) % len(c.BINARY_WORD_GAP)
+                if word_gaps_rest % len(c.BINARY_CHAR_GAP):
+                    problem = 'Gap of {} zeros'.format(len(part))
+                    break
+            elif part and part not in alphabet.binary_to_plain_text:
+                problem_values = set(part).difference(c.BINARY_SYMBOLS)
+                if problem_values:
+                    offset += min(map(part.index, problem_values))
+                    problem = (
+                        'Values given that are not binary Morse encoded: {}'
+                        .format(', '.join(sorted(problem_values)))
+                    )
+                else:
+                    problem = (
+                        'Character given that is not binary Morse encoded: {}'
+                        .format(part)
+                    )
+                break
+            offset += len(part)
+
+        return MorseDecodeError(
+            '{problem} at offset {offset}\n'
+            'Binary Morse characters look like {example}, the '
+            'characters are separated by {char_sep}, and the '
+            'words are separated by {word_sep}.'
+            .format(
+                problem=problem,
+                offset=offset,
+                example=alphabet.plain_text_to_binary[alphabet.example],
+                char_sep=c.BINARY_CHAR_GAP,
+                word_sep=c.BINARY_WORD_GAP,
+            ),
+            offset,
+        )
+
+    @classmethod
+    def _binary_word_to_plain_text(cls, word, alphabet=None):
+        # The plain text of a word between word gaps, or None unless it is
+        # characters exactly a char gap apart
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        return _word_to_plain_text(
+            word, alphabet.binary_to_plain_text, c.BINARY_CHAR_GAP
+        )
+
+    @classmethod
+    def from_binary_bytes(cls, value, bit_length=None, alphabet=None):
+        """Decode binary Morse packed 8 keying units per byte, first unit in
+        the most significant bit.
+
+        Without ``bit_length`` the zero bits padding the last byte are
+        dropped along with any trailing word gaps.
+        """
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            raise TypeError(
+                'Value must be bytes-like.  Given: {}'.format(type(value))
             )
 
-        plain_text_words = [
-            c.PLAIN_TEXT_WORD_GAP.join(
-                cls._binary_word_to_plain_text(word)
-                for word in words
+        value = bytes(value)
+        binary = format(
+            int.from_bytes(value, 'big'),
+            '0{}b'.format(len(value) * _BITS_PER_BYTE),
+        ) if value else ''
+
+        if bit_length is None:
+            binary = binary.rstrip('0')
+        elif bit_length > len(binary):
+            raise ValueError(
+                'Bit length {} is longer than the {} bits given'
+                .format(bit_length, len(binary))
             )
-        ]
-        return cls(plain_text_words)
+        else:
+            binary = binary[:bit_length]
+
+        return cls._from_binary(binary, alphabet=alphabet)
 
     @classmethod
-    def _binary_word_to_plain_text(cls, word):
-        return c.PLAIN_TEXT_CHAR_GAP.join(
-            c.BINARY_TO_PLAIN_TEXT[char]
-            for char in word.split(c.BINARY_CHAR_GAP)
-            if char  # Filter empty strings
+    def from_keying_events(cls, events, alphabet=None):
+        """Decode ``(level, units)`` runs of keying, as made by
+        ``iter_keying_events()``.
+
+        Equivalent to ``from_binary()`` on the runs spelled out as binary,
+        with offsets in units.  Levels are anything ``int()`` accepts.
+        """
+        # Repeating a string runs in C, so spelling the runs out and
+        # splitting them like binary beats decoding event by event.
+        binary = ''.join(
+            _KEYING_LEVELS[bool(int(level))] * units
+            for level, units in events
         )
+        return cls._from_binary(binary, alphabet=alphabet)
+
+    @classmethod
+    def decode_lenient(cls, value, from_format,
+                       replacement=REPLACEMENT_CHARACTER, nearest=False,
+                       alphabet=None):
+        """Decode binary or human-readable ``value``, carrying on past
+        anything invalid.
+
+        Returns ``(plain_text, errors)``, where ``errors`` has an
+        ``ErrorSpan`` for every invalid stretch of ``value``, in order.
+        Unknown characters decode to ``replacement``, or with ``nearest``
+        to the token whose code is the fewest edits away.  Binary gaps of
+        an invalid length decode to the nearest gap.  Valid input decodes
+        to what ``from_<format>()`` would make of it, without errors.
+        """
+        if not isinstance(value, str):
+            raise TypeError(
+                'Value must be a string.  Given: {}'.format(type(value))
+            )
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+
+        if from_format == c.BINARY:
+            decoding = alphabet._binary_decoding
+            word_mark = BINARY_WORD_MARK
+            word_gap = c.BINARY_WORD_GAP
+            marked_word_gap = _BINARY_MARKED_WORD_GAP
+            char_gap = c.BINARY_CHAR_GAP
+            gap_pattern = _BINARY_GAP
+            gap_word_gaps = _binary_gap_word_gaps
+            encoded_to_plain_text = alphabet.binary_to_plain_text
+            nearest_token = alphabet.nearest_binary
+        elif from_format == c.HUMAN_READABLE:
+            decoding = alphabet._human_readable_decoding
+            word_mark = HUMAN_READABLE_WORD_MARK
+            word_gap = c.HUMAN_READABLE_WORD_GAP
+            marked_word_gap = _HUMAN_READABLE_MARKED_WORD_GAP
+            char_gap = c.HUMAN_READABLE_CHAR_GAP
+            gap_pattern = _HUMAN_READABLE_GAP
+            gap_word_gaps = _human_readable_gap_word_gaps
+            encoded_to_plain_text = alphabet.human_readable_to_plain_text
+            nearest_token = alphabet.nearest_human_readable
+        else:
+            raise ValueError(
+                'Lenient decoding is from {} or {}.  Given: {}'
+                .format(c.BINARY, c.HUMAN_READABLE, from_format)
+            )
 
-    def __init__(self, plain_text_words):
-        self.plain_text_words = plain_text_words
+        errors = []
+        nearest_tokens = {}
+
+        def decode_region(region, region_offset):
+            # Decode characters and gaps one by one, keeping track of where
+            # each came from.  Every distinct unknown code is matched to its
+            # nearest token once.
+            pieces = []
+            start = region_offset
+            for index, part in enumerate(gap_pattern.split(region)):
+                end = start + len(part)
+                if index % 2:
+                    word_gaps, valid = gap_word_gaps(len(part))
+                    decoded = c.PLAIN_TEXT_WORD_GAP * word_gaps
+                elif not part:
+                    # Before a gap at the start or after one at the end
+                    decoded, valid = c.PLAIN_TEXT_CHAR_GAP, True
+                else:
+                    decoded = encoded_to_plain_text.get(part)
+                    valid = decoded is not None
+                    if not valid and nearest:
+                        if part not in nearest_tokens:
+                            nearest_tokens[part] = nearest_token(part)
+                        decoded = nearest_tokens[part]
+                    elif not valid:
+                        decoded = replacement
+                if not valid:
+                    errors.append(ErrorSpan(start, end, part, decoded))
+                pieces.append(decoded)
+                start = end
+            return c.PLAIN_TEXT_CHAR_GAP.join(pieces)
+
+        processed_value = value.strip()
+        offset = len(value) - len(value.lstrip())
+        if word_mark in processed_value:
+            return decode_region(processed_value, offset), errors
+
+        # Most input is valid, and decodes at full speed like strict
+        # decoding
+        encoded = processed_value.replace(word_gap, marked_word_gap).split(
+            char_gap
+        )
+        pieces = list(map(decoding.get, encoded))
+        invalid = _indexes(pieces, None)
+
+        # Else every run of invalid pieces, with the gaps on either side of
+        # it, is decoded one by one.  Marked word gaps are as long as word
+        # gaps, so pieces are where they were in the input.
+        gap_pieces = {c.PLAIN_TEXT_CHAR_GAP, word_mark}
+        done = 0
+        position = 0  # Where piece done starts
+        for index in invalid:
+            if index < done:
+                # Part of the last run
+                continue
+            first = index
+            while first > done and encoded[first - 1] in gap_pieces:
+                first -= 1
+            last = index
+            while last + 1 < len(encoded) and (
+                pieces[last + 1] is None or encoded[last + 1] in gap_pieces
+            ):
+                last += 1
+
+            start = position + sum(map(len, encoded[done:first])) + (
+                len(char_gap) * (first - done)
+            )
+            end = start + sum(map(len, encoded[first:last + 1])) + (
+                len(char_gap) * (last - first)
+            )
+            if first:
+                start -= len(char_gap)
+            if last + 1 < len(encoded):
+                end += len(char_gap)
+
+            pieces[first:last + 1] = (
+                [decode_region(processed_value[start:end], offset + start)] +
+                [c.PLAIN_TEXT_CHAR_GAP] * (last - first)
+            )
+            done = last + 1
+            position = end
+
+        return c.PLAIN_TEXT_CHAR_GAP.join(pieces), errors
+
+    @classmethod
+    def _from_plain_text(cls, plain_text, human_readable=None, binary=None,
+                         source_is_canonical=True, alphabet=None):
+        # Build from valid, upper-case plain text, keeping whichever other
+        # format it was decoded from if that is canonical.
+        morse = cls.__new__(cls)
+        morse._plain_text = plain_text
+        morse._alphabet = INTERNATIONAL if alphabet is None else alphabet
+        morse._human_readable = None
+        morse._binary = None
+        if source_is_canonical:
+            morse._human_readable = human_readable
+            morse._binary = binary
+        return morse
+
+    def __init__(self, plain_text_words, alphabet=None):
+        self._plain_text = c.PLAIN_TEXT_WORD_GAP.join(plain_text_words)
+        self._human_readable = None
+        self._binary = None
+        self._alphabet = INTERNATIONAL if alphabet is None else alphabet
 
     def __str__(self):
         return self.plain_text
 
     def __repr__(self):
-        return '{class_name}({plain_text_words})'.format(
+        if self._alphabet == INTERNATIONAL:
+            alphabet = ''
+        else:
+            alphabet = ', alphabet={}'.format(_alphabet_repr(self._alphabet))
+        return '{class_name}({plain_text_words}{alphabet})'.format(
             class_name=self.__class__.__name__,
             plain_text_words=self.plain_text_words,
+            alphabet=alphabet,
         )
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return repr(self) == repr(other)
+            return (
+                self._plain_text == other._plain_text and
+                self._alphabet == other._alphabet
+            )
         else:
             return NotImplemented
 
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self._plain_text)
+
+    @property
+    def plain_text_words(self):
+        return self._plain_text.split(c.PLAIN_TEXT_WORD_GAP)
+
     @property
     def plain_text(self):
-        return c.PLAIN_TEXT_WORD_GAP.join(self.plain_text_words)
+        return self._plain_text
+
+    @property
+    def alphabet(self):
+        return self._alphabet
 
     @property
     def human_readable(self):
+        if self._human_readable is None:
+            self._human_readable = self._encode_human_readable()
+        return self._human_readable
+
+    def _encode_human_readable(self):
+        words = self.plain_text_words
+        cache = _word_cache(self._alphabet, 'plain_text_to_human_readable')
+        if cache is not None:
+            return c.HUMAN_READABLE_WORD_GAP.join(map(cache, words))
+
+        if all(words):
+            return self._plain_text_to_encoded(
+                self._alphabet.tokens(self._plain_text),
+                self._alphabet._human_readable_table,
+                c.HUMAN_READABLE_CHAR_GAP,
+            )
+
         return c.HUMAN_READABLE_WORD_GAP.join(
-            self._plain_text_word_to_human_readable(word)
-            for word in self.plain_text_words
+            self._plain_text_word_to_human_readable(word, self._alphabet)
+            for word in words
         )
 
     @classmethod
-    def _plain_text_word_to_human_readable(cls, word):
-        return c.HUMAN_READABLE_CHAR_GAP.join(
-            c.PLAIN_TEXT_TO_HUMAN_READABLE[char]
-            for char in word
+    def _plain_text_word_to_human_readable(cls, word, alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        return cls._plain_text_to_encoded(
+            alphabet.tokens(word),
+            alphabet._human_readable_table,
+            c.HUMAN_READABLE_CHAR_GAP,
         )
 
     @property
     def binary(self):
+        if self._binary is None:
+            self._binary = self._encode_binary()
+        return self._binary
+
+    def _encode_binary(self):
+        words = self.plain_text_words
+        cache = _word_cache(self._alphabet, 'plain_text_to_binary')
+        if cache is not None:
+            return c.BINARY_WORD_GAP.join(map(cache, words))
+
+        if all(words):
+            return self._plain_text_to_encoded(
+                self._alphabet.tokens(self._plain_text),
+                self._alphabet._binary_table,
+                c.BINARY_CHAR_GAP,
+            )
+
         return c.BINARY_WORD_GAP.join(
-            self._plain_text_word_to_binary(word)
-            for word in self.plain_text_words
+            self._plain_text_word_to_binary(word, self._alphabet)
+            for word in words
         )
 
     @classmethod
-    def _plain_text_word_to_binary(cls, word):
-        return c.BINARY_CHAR_GAP.join(
-            c.PLAIN_TEXT_TO_BINARY[char]
-            for char in word
+    def _plain_text_word_to_binary(cls, word, alphabet=None):
+        if alphabet is None:
+            alphabet = INTERNATIONAL
+        return cls._plain_text_to_encoded(
+            alphabet.tokens(word),
+            alphabet._binary_table,
+            c.BINARY_CHAR_GAP,
         )
+
+    @property
+    def binary_bytes(self):
+        """``binary`` packed 8 keying units per byte, first unit in the most
+        significant bit, and padded with zero bits.
+
+        ``len(morse.binary)`` is the exact number of units.
+        """
+        binary = self.binary
+        if not binary:
+            return b''
+
+        padding = -len(binary) % _BITS_PER_BYTE
+        return (int(binary, 2) << padding).to_bytes(
+            (len(binary) + padding) // _BITS_PER_BYTE, 'big'
+        )
+
+    def to_pcm(self, sample_rate=c.DEFAULT_SAMPLE_RATE, wpm=c.DEFAULT_WPM,
+               frequency=c.DEFAULT_FREQUENCY):
+        """``binary`` keyed as a tone of ``frequency`` Hz at ``wpm`` words
+        per minute, in signed 16-bit little-endian mono PCM samples.
+
+        To write long transmissions without holding all of their audio in
+        memory, use ``sweetmorse.audio.write_wav()``.
+        """
+        from sweetmorse import audio
+
+        return b''.join(
+            audio.iter_pcm(self.binary, sample_rate, wpm, frequency)
+        )
+
+    def iter_keying_events(self):
+        """Yield ``(level, units)`` for every run of equal keying units.
+
+        ``True`` runs are marks and ``False`` runs are spaces, in the same
+        order and of the same lengths as the runs in ``binary``, which is
+        never built.
+        """
+        alphabet = self._alphabet
+        space = 0
+        for word_index, word in enumerate(self.plain_text_words):
+            if word_index:
+                space += _WORD_GAP_UNITS
+            for char_index, char in enumerate(alphabet.tokens(word)):
+                if char_index:
+                    space += _CHAR_GAP_UNITS
+                if space:
+                    yield False, space
+                    space = 0
+                for event in alphabet._keying_events[char]:
+                    yield event
+        if space:
+            yield False, space
+
+    @staticmethod
+    def _plain_text_to_encoded(tokens, table, char_gap):
+        # Only valid when no word is empty: an empty word has no character
+        # to carry the char gap that the word gap relies on.
+        return ''.join(map(table.__getitem__, tokens))[:-len(char_gap)]
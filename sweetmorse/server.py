@@ -0,0 +1,401 @@
+"""Serve conversions over a Unix socket or localhost TCP.
+
+One long-running process holds the alphabet tables once and answers many
+services over connections they keep open, instead of every request paying
+for starting the CLI.
+
+Requests and responses are a line of ASCII followed by a UTF-8 body of
+the length in bytes that the line gives::
+
+    PLAIN BINARY 3\\n
+    sos
+    OK 27\\n
+    101010001110111011100010101
+
+A request that cannot be converted gets ``ERROR <length>`` and the error
+message instead.  Clients may send many requests without waiting for the
+responses, which come back in request order.  Payloads of
+``offload_size`` characters or more are converted on a pool of worker
+processes, so that they do not hold up the small requests of other
+connections.
+"""
+import asyncio
+import collections
+import os
+import socket
+
+from sweetmorse.lines import _DECODERS, _converters
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7373
+# Characters, below which converting takes less time than handing the
+# payload over to a worker process
+DEFAULT_OFFLOAD_SIZE = 256 * 1024
+# Bytes of the largest payload accepted
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+OK = 'OK'
+ERROR = 'ERROR'
+
+_ENCODING = 'utf-8'
+# Requests of one connection read ahead of their responses being written
+_PIPELINE_DEPTH = 1024
+# Requests the blocking client sends ahead of reading their responses.
+# Less than _PIPELINE_DEPTH, so that the server always reads them all and
+# neither side can end up waiting for the other to read.
+_CLIENT_PIPELINE_DEPTH = 64
+
+
+class _ProtocolError(ValueError):
+    """A request that breaks the protocol, after which the connection
+    cannot be trusted to be in step."""
+
+
+def _convert(value, from_format, to_format):
+    # Run in the server, or in a worker process for large payloads
+    decode, encode = _converters(from_format, to_format)
+    return encode(decode(value))
+
+
+def _message(status, body):
+    data = body.encode(_ENCODING)
+    return '{} {}\n'.format(status, len(data)).encode('ascii') + data
+
+
+def _parse_header(line, field_count):
+    # (fields, length) of a header line of ``field_count`` fields before
+    # the length
+    try:
+        fields = line.decode('ascii').split()
+        length = int(fields.pop())
+    except (UnicodeDecodeError, ValueError, IndexError):
+        length = -1
+    if length < 0 or len(fields) != field_count:
+        raise _ProtocolError('Malformed header: {!r}'.format(line))
+    return fields, length
+
+
+class Server(object):
+    """Answer conversion requests on connections that ``start()`` accepts.
+
+    Payloads of ``offload_size`` characters or more are converted on
+    ``jobs`` worker processes (all CPU cores by default), started on first
+    use.  Larger payloads than ``max_size`` bytes are refused and the
+    connection closed.
+    """
+
+    def __init__(self, jobs=None, offload_size=DEFAULT_OFFLOAD_SIZE,
+                 max_size=DEFAULT_MAX_SIZE):
+        self.jobs = jobs
+        self.offload_size = offload_size
+        self.max_size = max_size
+        self.path = None
+        self._server = None
+        self._executor = None
+
+    async def start(self, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Listen on the Unix socket at ``path``, or on ``host`` and
+        ``port`` if there is none.  Returns the server."""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path
+            )
+            self.path = path
+        else:
+            self._server = await asyncio.start_server(
+                self._handle, host, port
+            )
+        return self
+
+    @property
+    def sockets(self):
+        return self._server.sockets
+
+    def close(self):
+        """Stop accepting connections and shut the worker processes down.
+        """
+        self._server.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    async def wait_closed(self):
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        responses = asyncio.Queue(_PIPELINE_DEPTH)
+        writing = asyncio.ensure_future(
+            self._write_responses(responses, writer)
+        )
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ValueError as error:
+                    # Including header lines too long to read
+                    await responses.put((None, _message(ERROR, str(error))))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                await responses.put(self._respond(*request))
+            await responses.put(None)
+            await writing
+        except BaseException:
+            # Cancelled with the server, or failed: nothing more will be
+            # written, and waiting for the writer could wait forever
+            writing.cancel()
+            _discard(responses)
+            raise
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        # (value, from_format, to_format), or None at the end of the input
+        line = await reader.readline()
+        if not line:
+            return None
+        fields, length = _parse_header(line, 2)
+        if length > self.max_size:
+            raise _ProtocolError(
+                'Payload of {} bytes is larger than the limit of {}'
+                .format(length, self.max_size)
+            )
+        payload = await reader.readexactly(length)
+        return (payload,) + tuple(fields)
+
+    def _respond(self, payload, from_format, to_format):
+        # (future, None) for a conversion running on a worker process, or
+        # (None, response) when it is already done
+        try:
+            value = payload.decode(_ENCODING)
+            for format_ in (from_format, to_format):
+                if format_ not in _DECODERS:
+                    raise ValueError('Unknown format: {}'.format(format_))
+            if len(value) < self.offload_size:
+                return None, _message(OK, _convert(
+                    value, from_format, to_format
+                ))
+        except ValueError as error:
+            return None, _message(ERROR, str(error))
+
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(self.jobs)
+        try:
+            return asyncio.get_event_loop().run_in_executor(
+                self._executor, _convert, value, from_format, to_format
+            ), None
+        except Exception as error:
+            # A pool that a worker process died in takes no more work
+            return None, self._failed(error)
+
+    def _failed(self, error):
+        # The ERROR response for a conversion that failed on a worker
+        # process other than by being invalid
+        from concurrent.futures.process import BrokenProcessPool
+
+        if isinstance(error, BrokenProcessPool) and self._executor is not None:
+            # Start a new pool for the next conversion
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return _message(ERROR, 'Conversion failed: {}'.format(
+            str(error) or type(error).__name__
+        ))
+
+    async def _write_responses(self, responses, writer):
+        broken = False
+        while True:
+            item = await responses.get()
+            if item is None:
+                break
+            future, response = item
+            if future is not None:
+                try:
+                    response = _message(OK, await future)
+                except asyncio.CancelledError:
+                    raise
+                except ValueError as error:
+                    response = _message(ERROR, str(error))
+                except Exception as error:
+                    response = self._failed(error)
+            if broken:
+                # Keep taking responses, so that the reader never waits
+                continue
+            writer.write(response)
+            if responses.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    broken = True
+
+
+def _discard(responses):
+    # Responses that will never be written, cancelling their conversions
+    while not responses.empty():
+        item = responses.get_nowait()
+        if item is not None and item[0] is not None:
+            item[0].cancel()
+
+
+def serve(path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """Serve until interrupted, see Server for the options."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = loop.run_until_complete(
+        Server(**options).start(path=path, host=host, port=port)
+    )
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Without waiting for clients, which may keep their connections
+        server.close()
+        loop.close()
+
+
+def _request(value, from_format, to_format):
+    data = value.encode(_ENCODING)
+    return '{} {} {}\n'.format(
+        from_format, to_format, len(data)
+    ).encode('ascii') + data
+
+
+def _result(status, body):
+    text = body.decode(_ENCODING)
+    if status == ERROR:
+        raise ValueError(text)
+    return text
+
+
+class Client(object):
+    """A blocking connection to a server, for converting many values.
+
+    Raises ``ValueError`` with the server's message for a value that
+    cannot be converted.  Use it as a context manager, or ``close()`` it.
+    """
+
+    def __init__(self, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 timeout=None):
+        if path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = path
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (host, port)
+        self._socket.settimeout(timeout)
+        self._socket.connect(address)
+        self._file = self._socket.makefile('rwb')
+
+    def convert(self, value, from_format, to_format):
+        """Convert a string like ``Morse.from_<format>(value).<format>``."""
+        return self.convert_many([(value, from_format, to_format)])[0]
+
+    def convert_many(self, requests):
+        """Convert an iterable of ``(value, from_format, to_format)``,
+        sending requests ahead of their responses, and return the list of
+        results.
+
+        If any value cannot be converted, all the responses are still
+        read, and then the first error is raised.
+        """
+        bodies = []
+        sent = 0
+        for request in requests:
+            if sent - len(bodies) >= _CLIENT_PIPELINE_DEPTH:
+                self._file.flush()
+                bodies.append(self._read_response())
+            self._file.write(_request(*request))
+            sent += 1
+        self._file.flush()
+        while len(bodies) < sent:
+            bodies.append(self._read_response())
+        return [_result(*body) for body in bodies]
+
+    def _read_response(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError('Connection closed by the server')
+        fields, length = _parse_header(line, 1)
+        body = self._file.read(length)
+        if len(body) < length:
+            raise ConnectionError('Connection closed by the server')
+        return fields[0], body
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncClient(object):
+    """An asyncio connection to a server.
+
+    Concurrent ``convert()`` calls share the connection, their requests
+    sent ahead of the responses.  Make one with ``connect()``.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = collections.deque()
+        self._draining = asyncio.Lock()
+        self._reading = asyncio.ensure_future(self._read_responses())
+
+    @classmethod
+    async def connect(cls, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def convert(self, value, from_format, to_format):
+        """Convert a string like ``Morse.from_<format>(value).<format>``."""
+        if self._reading.done():
+            raise ConnectionError('Connection closed')
+
+        future = asyncio.get_event_loop().create_future()
+        self._waiting.append(future)
+        self._writer.write(_request(value, from_format, to_format))
+        # Older versions of asyncio allow only one drain() at a time
+        async with self._draining:
+            await self._writer.drain()
+        return _result(*await future)
+
+    async def _read_responses(self):
+        error = ConnectionError('Connection closed by the server')
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                fields, length = _parse_header(line, 1)
+                body = await self._reader.readexactly(length)
+                self._waiting.popleft().set_result((fields[0], body))
+        except (
+            ValueError, IndexError, asyncio.IncompleteReadError
+        ) as exception:
+            error = ConnectionError(str(exception))
+        finally:
+            for future in self._waiting:
+                if not future.done():
+                    future.set_exception(error)
+            self._waiting.clear()
+
+    def close(self):
+        self._reading.cancel()
+        self._writer.close()
@@ -0,0 +1,236 @@
+"""Find where conversions spend their time.
+
+``collect()`` instruments the conversions of ``Morse`` while it is
+active, timing every call and counting the characters it converts, and
+timing the phases within: validation, splitting and table lookups,
+tokenizing and so on.  Outside of it nothing is instrumented, so the
+usual code paths cost exactly what they cost without this module.
+
+Only conversions in this process are measured, not those of worker
+processes, and collecting from several threads at once mixes their
+numbers up.
+"""
+import contextlib
+import functools
+import time
+
+import sweetmorse.morse
+from sweetmorse.alphabet import Alphabet
+from sweetmorse.morse import Morse
+
+# Constructors, timed with the characters (or bytes) of their input
+_DECODERS = (
+    'parse',
+    'from_plain_text',
+    'from_human_readable',
+    'from_binary',
+    'from_binary_bytes',
+    'from_keying_events',
+    'decode_lenient',
+    '_to_plain_text',
+)
+# Properties, timed with the characters (or bytes) of their output
+_ENCODERS = ('plain_text', 'human_readable', 'binary', 'binary_bytes')
+# Names in the report of conversions that are not public.  Streams and
+# files decode their pieces with _to_plain_text().
+_NAMES = {'_to_plain_text': 'pieces to plain text'}
+# Phases that streams call outside of every conversion, timed then as a
+# conversion of the name given, with the characters of their input.  The
+# stream encoder validates its pieces before looking them up.
+_PIECES = {'_validate_plain_text': 'pieces from plain text'}
+# (phase, owner, attribute) of the functions that make up the phases.
+# Splitting and looking up, and looking up and joining, each happen in one
+# pass in C, so they cannot be told apart.
+_PHASES = (
+    ('validate', Morse, '_validate_plain_text'),
+    ('split and look up', sweetmorse.morse, '_look_up_pieces'),
+    ('canonical check', sweetmorse.morse, '_is_canonical'),
+    ('word cache', sweetmorse.morse, '_cached_words_to_plain_text'),
+    ('locate error', Morse, '_binary_decode_error'),
+    ('locate error', Morse, '_human_readable_tree_to_plain_text'),
+    ('tokenize', Alphabet, 'tokens'),
+    ('look up and join', Morse, '_plain_text_to_encoded'),
+)
+# Time in conversions outside of every phase
+OTHER = 'other (joins and objects)'
+
+_collecting = False
+
+
+class Stats(object):
+    """What ``collect()`` measured.
+
+    ``conversions`` maps the name of every conversion called, such as
+    ``'from_binary'``, to ``[calls, chars, seconds]``, and ``phases`` maps
+    the name of every phase to ``[calls, seconds]``.  Conversions made by
+    other conversions, such as ``parse()`` calling ``from_binary()``, are
+    counted under both, but only once in ``seconds``, the total time spent
+    converting.  Phases only count within conversions, and a phase called by
+    another counts towards that one only its own time, so that the phases
+    never add up to more than ``seconds``.
+    """
+
+    def __init__(self):
+        self.conversions = {}
+        self.phases = {}
+        self.seconds = 0.0
+        self._depth = 0
+        # Seconds of the phases called by every phase running
+        self._nested = []
+
+    def report(self, output_file):
+        """Write a table of throughput and time by phase to
+        ``output_file``."""
+        output_file.write(
+            '{:<28} {:>8} {:>14} {:>10} {:>14}\n'.format(
+                'conversion', 'calls', 'chars', 'seconds', 'chars/s'
+            )
+        )
+        for name, (calls, chars, seconds) in sorted(self.conversions.items()):
+            output_file.write(
+                '{:<28} {:>8,} {:>14,} {:>10.6f} {:>14,.0f}\n'.format(
+                    name, calls, chars, seconds,
+                    chars / seconds if seconds else 0,
+                )
+            )
+
+        phases = sorted(self.phases.items(), key=lambda item: -item[1][1])
+        other = self.seconds - sum(seconds for _, (_, seconds) in phases)
+        output_file.write('{:<28} {:>8} {:>14} {:>10} {:>14}\n'.format(
+            'phase', 'calls', '', 'seconds', 'share'
+        ))
+        for name, (calls, seconds) in phases + [(OTHER, ('', other))]:
+            output_file.write(
+                '{:<28} {:>8} {:>14} {:>10.6f} {:>14.1%}\n'.format(
+                    name,
+                    calls if calls == '' else '{:,}'.format(calls),
+                    '',
+                    seconds,
+                    seconds / self.seconds if self.seconds else 0,
+                )
+            )
+
+    def _time_conversion(self, name, func, count_input):
+        stats = self
+        if count_input:
+            # The value counted, the first parameter after cls
+            parameter = _unwrapped(func).__code__.co_varnames[1]
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            stats._depth += 1
+            result = None
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                seconds = time.perf_counter() - start
+                stats._depth -= 1
+                if not stats._depth:
+                    stats.seconds += seconds
+                if count_input:
+                    # Keying events may have no length
+                    value = args[1] if len(args) > 1 else kwargs.get(parameter)
+                    chars = len(value) if hasattr(value, '__len__') else 0
+                else:
+                    chars = 0 if result is None else len(result)
+                totals = stats.conversions.setdefault(name, [0, 0, 0.0])
+                totals[0] += 1
+                totals[1] += chars
+                totals[2] += seconds
+
+        return timed
+
+    def _time_phase(self, name, func, pieces=None):
+        stats = self
+
+        @functools.wraps(func)
+        def timed_phase(*args, **kwargs):
+            stats._nested.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                nested = stats._nested.pop()
+                if stats._nested:
+                    stats._nested[-1] += seconds
+                totals = stats.phases.setdefault(name, [0, 0.0])
+                totals[0] += 1
+                totals[1] += seconds - nested
+
+        if pieces is None:
+            outside = func
+        else:
+            outside = stats._time_conversion(pieces, timed_phase, True)
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if not stats._depth:
+                # Such as streams validating, which only converts with
+                # ``pieces``
+                return outside(*args, **kwargs)
+            return timed_phase(*args, **kwargs)
+
+        return timed
+
+
+def _unwrapped(func):
+    # The function wrapped by timers, if ``func`` is one
+    while hasattr(func, '__wrapped__'):
+        func = func.__wrapped__
+    return func
+
+
+def _instrumented(descriptor, timer):
+    # ``descriptor`` as found in a class or module dict, with its function
+    # wrapped by ``timer``
+    if isinstance(descriptor, classmethod):
+        return classmethod(timer(descriptor.__func__))
+    elif isinstance(descriptor, staticmethod):
+        return staticmethod(timer(descriptor.__func__))
+    elif isinstance(descriptor, property):
+        return property(timer(descriptor.fget))
+    return timer(descriptor)
+
+
+@contextlib.contextmanager
+def collect():
+    """Measure conversions until the end of the ``with`` block, into the
+    ``Stats`` it returns."""
+    global _collecting
+    if _collecting:
+        raise RuntimeError('Already collecting stats')
+
+    stats = Stats()
+    replaced = []
+    for names, count_input in ((_DECODERS, True), (_ENCODERS, False)):
+        for name in names:
+            replaced.append((Morse, name, _instrumented(
+                vars(Morse)[name],
+                lambda func, name=name, count_input=count_input:
+                    stats._time_conversion(
+                        _NAMES.get(name, name), func, count_input
+                    ),
+            )))
+    for phase, owner, attribute in _PHASES:
+        replaced.append((owner, attribute, _instrumented(
+            vars(owner)[attribute],
+            lambda func, phase=phase, attribute=attribute:
+                stats._time_phase(phase, func, _PIECES.get(attribute)),
+        )))
+
+    originals = [
+        (owner, attribute, vars(owner)[attribute])
+        for owner, attribute, _ in replaced
+    ]
+    _collecting = True
+    try:
+        for owner, attribute, instrumented in replaced:
+            setattr(owner, attribute, instrumented)
+        yield stats
+    finally:
+        for owner, attribute, original in originals:
+            setattr(owner, attribute, original)
+        _collecting = False
@@ -0,0 +1,169 @@
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _IncrementalCoder(object):
+    """Carries whitespace stripping across chunk boundaries.
+
+    Like the ``Morse.from_*`` constructors, leading and trailing whitespace
+    of the whole stream is ignored.  Trailing whitespace can only be told
+    apart from inner whitespace once more input arrives, so it is held back
+    until then.
+    """
+
+    def __init__(self, strip=True):
+        self._strip = strip
+        self._started = not strip
+        self._buffer = ''
+        # Position of the start of the buffer in the whole stream
+        self._offset = 0
+
+    def feed(self, chunk):
+        if not isinstance(chunk, str):
+            raise TypeError(
+                'Value must be a string.  Given: {}'.format(type(chunk))
+            )
+
+        buffer = self._buffer + chunk
+        if not self._started:
+            stripped = buffer.lstrip()
+            self._offset += len(buffer) - len(stripped)
+            buffer = stripped
+            self._started = bool(buffer)
+
+        if self._strip:
+            ready = len(buffer.rstrip())
+        else:
+            ready = len(buffer)
+        ready = self._safe_length(buffer, ready)
+
+        self._buffer = buffer[ready:]
+        return self._advance(buffer[:ready])
+
+    def finish(self):
+        buffer = self._buffer.rstrip() if self._strip else self._buffer
+        self._buffer = ''
+        return self._advance(buffer)
+
+    def _advance(self, value):
+        if not value:
+            return ''
+
+        processed = self._process(value, self._offset)
+        self._offset += len(value)
+        return processed
+
+    def _safe_length(self, buffer, ready):
+        return ready
+
+    def _process(self, value, offset):
+        raise NotImplementedError
+
+
+class MorseDecoder(_IncrementalCoder):
+    """Incrementally decode a stream in ``from_format`` to plain text.
+
+    Feed it chunks of any size; the concatenated return values of ``feed()``
+    and ``finish()`` equal ``Morse.from_<format>(whole_input).plain_text``.
+    Partial characters and gaps are carried over to the next chunk.
+    """
+
+    def __init__(self, from_format):
+        if from_format not in (c.PLAIN, c.HUMAN_READABLE, c.BINARY):
+            raise ValueError('Unknown format: {}'.format(from_format))
+
+        super(MorseDecoder, self).__init__(strip=True)
+        self.from_format = from_format
+
+    def _safe_length(self, buffer, ready):
+        # Everything before the last character that directly follows a
+        # complete gap can be decoded without knowing what comes next.
+        if self.from_format == c.BINARY:
+            gap_end = buffer.rfind('001', 0, ready)
+            return gap_end + 2 if gap_end >= 0 else 0
+        elif self.from_format == c.HUMAN_READABLE:
+            gap_end = max(
+                buffer.rfind(' .', 0, ready),
+                buffer.rfind(' _', 0, ready),
+            )
+            return gap_end + 1 if gap_end >= 0 else 0
+        else:
+            return ready
+
+    def _process(self, value, offset):
+        return Morse._to_plain_text(value, self.from_format, offset=offset)
+
+
+class MorseEncoder(_IncrementalCoder):
+    """Incrementally encode a plain text stream to ``to_format``.
+
+    The concatenated return values of ``feed()`` and ``finish()`` equal
+    ``Morse.from_plain_text(whole_input).<format>``.  Pass ``strip=False``
+    when feeding text that is already normalized, such as the output of a
+    ``MorseDecoder``, to keep leading and trailing word gaps.
+    """
+
+    def __init__(self, to_format, strip=True):
+        if to_format not in (c.PLAIN, c.HUMAN_READABLE, c.BINARY):
+            raise ValueError('Unknown format: {}'.format(to_format))
+
+        super(MorseEncoder, self).__init__(strip=strip)
+        self.to_format = to_format
+        self._ends_in_char = False
+
+    def _process(self, value, offset):
+        processed_value = value.upper()
+        Morse._validate_plain_text(processed_value)
+
+        morse = Morse._from_plain_text(processed_value)
+        if self.to_format == c.BINARY:
+            char_gap = c.BINARY_CHAR_GAP
+            encoded = morse.binary
+        elif self.to_format == c.HUMAN_READABLE:
+            char_gap = c.HUMAN_READABLE_CHAR_GAP
+            encoded = morse.human_readable
+        else:
+            char_gap = c.PLAIN_TEXT_CHAR_GAP
+            encoded = morse.plain_text
+
+        # A character split from its neighbour by a chunk boundary still
+        # needs its char gap.
+        if (
+            self._ends_in_char and
+            not processed_value.startswith(c.PLAIN_TEXT_WORD_GAP)
+        ):
+            encoded = char_gap + encoded
+        self._ends_in_char = not processed_value.endswith(
+            c.PLAIN_TEXT_WORD_GAP
+        )
+        return encoded
+
+
+def convert(chunks, from_format, to_format):
+    """Yield pieces of ``to_format`` output for an iterable of input chunks.
+
+    Only a bounded amount of input is held in memory at once, so this works
+    for inputs of any length.
+    """
+    decoder = MorseDecoder(from_format)
+    encoder = MorseEncoder(to_format, strip=False)
+
+    for chunk in chunks:
+        piece = encoder.feed(decoder.feed(chunk))
+        if piece:
+            yield piece
+
+    piece = encoder.feed(decoder.finish()) + encoder.finish()
+    if piece:
+        yield piece
+
+
+def convert_file(input_file, output_file, from_format, to_format,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert between text file objects, ``chunk_size`` characters at a time.
+    """
+    chunks = iter(lambda: input_file.read(chunk_size), '')
+    for piece in convert(chunks, from_format, to_format):
+        output_file.write(piece)
@@ -0,0 +1,283 @@
+"""Turn durations of marks and spaces into keying units.
+
+``EdgeDecoder`` asks a timing object how many units every mark and space it
+sees lasted.  ``FixedTiming`` assumes a known, steady speed.
+``AdaptiveTiming`` follows senders that drift or key by hand, learning the
+speed from the signal itself with constant work per edge.
+
+Until a timing object is ``acquired``, the decoder hands it the durations
+through ``acquire()`` instead and holds them back, to be classified once it
+is, or once ``settle()`` is called at the end of the signal.
+"""
+import math
+
+import sweetmorse.constants as c
+
+# "PARIS " is 50 units long, the standard word for words per minute
+_UNITS_PER_WORD = 50
+
+_DOT_UNITS = 1
+_DASH_UNITS = 3
+_INTRA_CHAR_GAP_UNITS = 1
+_CHAR_GAP_UNITS = len(c.BINARY_CHAR_GAP)
+_WORD_GAP_UNITS = len(c.BINARY_WORD_GAP)
+
+
+def wpm_to_unit_duration(wpm):
+    """Seconds per keying unit at ``wpm`` words per minute."""
+    return 60.0 / (_UNITS_PER_WORD * wpm)
+
+
+def unit_duration_to_wpm(unit_duration):
+    """Words per minute when a keying unit lasts ``unit_duration`` seconds.
+    """
+    return 60.0 / (_UNITS_PER_WORD * unit_duration)
+
+
+def _word_gap_units(units):
+    # A space of several word gaps keeps its count, any leftover char gaps
+    # inside it don't change what it decodes to.
+    word_gaps = max(1, int(round(units)) // _WORD_GAP_UNITS)
+    return word_gaps * _WORD_GAP_UNITS
+
+
+class FixedTiming(object):
+    """Classify durations against a known unit duration.
+
+    The boundaries sit halfway between the nominal lengths: marks of 2 units
+    or more are dashes, spaces of 2 units or more end a character and spaces
+    of 5 units or more end a word.
+    """
+
+    # Knows the speed from the start
+    acquired = True
+
+    def __init__(self, unit_duration):
+        if unit_duration <= 0:
+            raise ValueError(
+                'Unit duration must be positive.  Given: {}'
+                .format(unit_duration)
+            )
+
+        self.unit_duration = unit_duration
+
+    def mark_units(self, duration):
+        if duration / self.unit_duration >= 2:
+            return _DASH_UNITS
+        return _DOT_UNITS
+
+    def space_units(self, duration, final=True):
+        """Units of a space, counting a partial space when not ``final``."""
+        units = duration / self.unit_duration
+        if units < 2:
+            return _INTRA_CHAR_GAP_UNITS
+        elif units < 5:
+            return _CHAR_GAP_UNITS
+        return _word_gap_units(units)
+
+
+class AdaptiveTiming(object):
+    """Learn the keying speed while classifying durations.
+
+    Marks are clustered around two centres, one for dots and one for dashes,
+    that follow the durations assigned to them by exponential decay.  A
+    centre moves quickly (``attack``) towards durations beyond it and slowly
+    (``decay``) back, so one odd mark cannot throw the boundary off for long.
+    Each centre also drifts slowly towards 3:1 with the other, so the one
+    that gets no marks (e.g. after a bad first guess) is not left behind.
+
+    Spaces are split into intra-character gaps, char gaps and word gaps by
+    the dot centre and a third centre tracking char gaps, which lets
+    Farnsworth-style stretched spacing decode too.
+
+    The centres start from the durations of the first ``acquire_marks``
+    marks and the spaces between them, which are held back until then:
+    the unit duration that fits them best as dots, dashes and gaps.  A
+    pause of more than eight times the longest mark so far ends the
+    acquisition early.  ``unit_duration`` is only a first guess of the
+    speed, so senders from half to twice the guessed speed decode from the
+    first character.  The guess only decides between speeds that fit a
+    signal equally well, which takes one made of only dots or only dashes:
+    ``TTTT`` at twice the speed is ``H``.
+    """
+
+    # Smallest ratio kept between the dash or char gap and the dot centre
+    _MIN_RATIO = 2.0
+    # Largest ratio kept between the char gap and the dot centre
+    _MAX_SPACE_RATIO = 6.0
+    # A pause this many times the longest mark held ends the acquisition
+    _PAUSE_RATIO = 8.0
+    # Weight of the first guess against the fit of the held durations
+    _GUESS_WEIGHT = 0.05
+
+    def __init__(self, unit_duration=wpm_to_unit_duration(20), attack=0.5,
+                 decay=0.1, acquire_marks=8):
+        if unit_duration <= 0:
+            raise ValueError(
+                'Unit duration must be positive.  Given: {}'
+                .format(unit_duration)
+            )
+
+        self.attack = attack
+        self.decay = decay
+        self.acquire_marks = acquire_marks
+        self.acquired = acquire_marks <= 0
+        self.dot = float(unit_duration)
+        self.dash = unit_duration * float(_DASH_UNITS)
+        self.char_gap = unit_duration * float(_CHAR_GAP_UNITS)
+        # Durations held while acquiring
+        self._marks = []
+        self._spaces = []
+
+    @property
+    def unit_duration(self):
+        """Current estimate of the seconds per keying unit."""
+        return (self.dot + self.dash / _DASH_UNITS) / 2
+
+    def acquire(self, duration, mark, final=True):
+        """Hold the duration of a mark, or of a space, until the speed is
+        known.  Returns whether it is, after which the held durations are
+        classified through ``mark_units()`` and ``space_units()``.
+
+        Only final spaces are held, but a long enough partial one also
+        ends the acquisition.
+        """
+        if duration <= 0:
+            # Edges at the same instant tell nothing of the speed
+            pass
+        elif mark:
+            self._marks.append(duration)
+        elif final:
+            self._spaces.append(duration)
+        if len(self._marks) >= self.acquire_marks or (
+            not mark and self._marks and
+            duration > self._PAUSE_RATIO * max(self._marks)
+        ):
+            self.settle()
+        return self.acquired
+
+    def settle(self):
+        """Start the centres from the durations held so far, however few.
+        """
+        if self.acquired:
+            return
+        self.acquired = True
+        marks, spaces = self._marks, self._spaces
+        self._marks, self._spaces = [], []
+        if not marks:
+            return
+
+        guess = self.unit_duration
+        best = None
+        for duration in marks:
+            for units in (_DOT_UNITS, _DASH_UNITS):
+                unit_duration, cost, fitted = _fit(
+                    marks, spaces, duration / units
+                )
+                cost += self._GUESS_WEIGHT * math.log(
+                    unit_duration / guess
+                ) ** 2
+                if best is None or cost < best[1]:
+                    best = unit_duration, cost, fitted
+        unit_duration, _, (dots, dashes, char_gaps) = best
+
+        self.dot = _mean(dots) or unit_duration
+        self.dash = _mean(dashes) or unit_duration * _DASH_UNITS
+        self.dash = max(self.dash, self.dot * self._MIN_RATIO)
+        self.char_gap = _mean(char_gaps) or unit_duration * _CHAR_GAP_UNITS
+        self._couple_char_gap()
+
+    def mark_units(self, duration):
+        if duration + duration >= self.dot + self.dash:
+            self.dash = self._follow(self.dash, duration, below=False)
+            self.dot += self.decay * (self.dash / _DASH_UNITS - self.dot)
+            self.dot = min(self.dot, self.dash / self._MIN_RATIO)
+            self._couple_char_gap()
+            return _DASH_UNITS
+        else:
+            self.dot = self._follow(self.dot, duration, below=True)
+            self.dash += self.decay * (self.dot * _DASH_UNITS - self.dash)
+            self.dash = max(self.dash, self.dot * self._MIN_RATIO)
+            self._couple_char_gap()
+            return _DOT_UNITS
+
+    def space_units(self, duration, final=True):
+        """Units of a space, counting a partial space when not ``final``.
+
+        Only final spaces teach the estimates.
+        """
+        if duration + duration < self.dot + self.char_gap:
+            if final:
+                self.dot = self._follow(self.dot, duration, below=True)
+            return _INTRA_CHAR_GAP_UNITS
+
+        # Word gaps are 7/3 of a char gap
+        word_gap = self.char_gap * _WORD_GAP_UNITS / _CHAR_GAP_UNITS
+        if duration + duration < self.char_gap + word_gap:
+            if final:
+                self.char_gap += self.attack * (duration - self.char_gap)
+                self._couple_char_gap()
+            return _CHAR_GAP_UNITS
+
+        return _word_gap_units(duration / self.char_gap * _CHAR_GAP_UNITS)
+
+    def _couple_char_gap(self):
+        self.char_gap += self.decay * (
+            self.dot * _CHAR_GAP_UNITS - self.char_gap
+        )
+        self.char_gap = min(
+            max(self.char_gap, self.dot * self._MIN_RATIO),
+            self.dot * self._MAX_SPACE_RATIO,
+        )
+
+    def _follow(self, centre, duration, below):
+        # Move fast towards durations on the far side of the centre, slowly
+        # back towards the middle
+        far = duration < centre if below else duration > centre
+        rate = self.attack if far else self.decay
+        return centre + rate * (duration - centre)
+
+
+def _mean(durations):
+    return sum(durations) / len(durations) if durations else None
+
+
+def _nearest_units(units, choices):
+    # Of ``choices``, the number of units nearest to ``units``
+    return min(choices, key=lambda choice: abs(units - choice))
+
+
+def _fit(marks, spaces, unit_duration):
+    # (unit_duration, cost, (dots, dashes, char_gaps)) of the durations
+    # classified by ``unit_duration``, then refined to fit them best.  The
+    # cost is the sum of the squared errors in units, as keying and
+    # detecting edges are off by about as much for long runs as for short.
+    classified = [
+        (duration, _nearest_units(
+            duration / unit_duration, (_DOT_UNITS, _DASH_UNITS)
+        ))
+        for duration in marks
+    ]
+    for duration in spaces:
+        units = duration / unit_duration
+        classified.append((duration, _nearest_units(units, (
+            _INTRA_CHAR_GAP_UNITS,
+            _CHAR_GAP_UNITS,
+            _word_gap_units(units),
+        ))))
+
+    unit_duration = (
+        sum(duration * units for duration, units in classified) /
+        sum(units * units for _, units in classified)
+    )
+    cost = sum(
+        (duration / unit_duration - units) ** 2
+        for duration, units in classified
+    )
+    dots = [duration for duration, units in classified[:len(marks)]
+            if units == _DOT_UNITS]
+    dashes = [duration for duration, units in classified[:len(marks)]
+              if units == _DASH_UNITS]
+    char_gaps = [duration for duration, units in classified[len(marks):]
+                 if units == _CHAR_GAP_UNITS]
+    return unit_duration, cost, (dots, dashes, char_gaps)
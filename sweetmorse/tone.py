@@ -0,0 +1,372 @@
+"""Decode Morse keyed as a tone in 16-bit PCM audio.
+
+The audio is cut into short blocks and the strength of the tone in each is
+measured with the Goertzel algorithm, a single bin of a discrete Fourier
+transform.  Blocks are Hann windowed so that tones more than two bins
+(``sample_rate / block_size`` Hz each) away are not heard.  Blocks where
+the tone is present are marks, the changes between marks and spaces are
+edges, and an ``EdgeDecoder`` turns those into text.
+NumPy is optional: with it the blocks are measured as one matrix product
+instead of a Python loop over samples.
+"""
+import math
+import sys
+import wave
+from array import array
+
+from sweetmorse import audio
+from sweetmorse.edges import EdgeDecoder
+from sweetmorse.morse import REPLACEMENT_CHARACTER, Morse
+from sweetmorse.timing import AdaptiveTiming
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Seconds of audio per measurement of the tone, the resolution of edges
+_BLOCK_DURATION = 0.005
+# The tone is on in blocks at least this fraction of the recent peak ...
+_THRESHOLD = 0.5
+# ... and the peak halves after this many seconds without a stronger block
+_PEAK_HALF_LIFE = 2.0
+# Quietest tone amplitude heard, as a sample value
+_MIN_MAGNITUDE = 100.0
+# With many channels, a tone must also be at least this fraction of the
+# loudest recent peak, as keying spreads every tone over nearby bins
+_CROSSTALK = 0.2
+_SAMPLE_WIDTH = 2
+# Frames read from a WAV file at a time
+_CHUNK_FRAMES = 64 * 1024
+# Fourier transforms taken at once, to bound memory for long chunks
+_BATCH_FRAMES = 1024
+
+
+class ToneDecoder(object):
+    """Decode the tone at ``frequency`` Hz in PCM audio as it is fed in.
+
+    Audio is signed 16-bit little-endian mono, as made by
+    ``Morse.to_pcm()``.  ``timing`` and ``replacement`` are passed on to
+    the ``EdgeDecoder``, and ``timing`` defaults to an ``AdaptiveTiming``
+    that learns the keying speed.  Characters misheard as something that
+    is not Morse decode to ``replacement`` and are listed in ``errors``.
+    """
+
+    def __init__(self, sample_rate=audio.DEFAULT_SAMPLE_RATE,
+                 frequency=audio.DEFAULT_FREQUENCY, timing=None,
+                 replacement=REPLACEMENT_CHARACTER):
+        self.sample_rate = sample_rate
+        self.frequency = frequency
+        self.block_size = max(1, int(round(sample_rate * _BLOCK_DURATION)))
+        self.block_duration = self.block_size / float(sample_rate)
+        self.edges = EdgeDecoder(
+            timing=timing or AdaptiveTiming(), replacement=replacement
+        )
+
+        self._omega = 2 * math.pi * frequency / sample_rate
+        self._window = _hann(self.block_size)
+        self._basis = None
+        if np is not None:
+            phases = self._omega * np.arange(self.block_size)
+            self._basis = np.stack(
+                (np.cos(phases), np.sin(phases)), axis=1
+            ) * np.array(self._window)[:, np.newaxis]
+        self._decay = 0.5 ** (self.block_duration / _PEAK_HALF_LIFE)
+        self._peak = 0.0
+        self._level = False
+        self._blocks = 0
+        self._pending = b''
+
+    @property
+    def errors(self):
+        """An ``ErrorSpan`` of keying units for every character received
+        that is not Morse."""
+        return self.edges.errors
+
+    def feed(self, pcm):
+        """Decode a chunk of PCM and return the newly completed text.
+
+        Chunks may end anywhere, even within a sample.
+        """
+        block_bytes = self.block_size * _SAMPLE_WIDTH
+        data = self._pending + bytes(pcm) if self._pending else pcm
+        usable = len(data) - len(data) % block_bytes
+        self._pending = bytes(data[usable:])
+
+        for magnitude in _magnitudes(
+            memoryview(data)[:usable], self._omega, self._window,
+            self._basis,
+        ):
+            self._peak = max(magnitude, self._peak * self._decay)
+            level = magnitude >= max(self._peak * _THRESHOLD, _MIN_MAGNITUDE)
+            if level != self._level:
+                self.edges.push(self._blocks * self.block_duration, level)
+                self._level = level
+            self._blocks += 1
+
+        return self.edges.read(now=self._blocks * self.block_duration)
+
+    def finish(self):
+        """Decode the rest of the audio, ending a tone still sounding."""
+        if self._level:
+            self.edges.push(self._blocks * self.block_duration, False)
+            self._level = False
+        return self.edges.finish()
+
+
+def _hann(size):
+    return [
+        0.5 - 0.5 * math.cos(2 * math.pi * (index + 0.5) / size)
+        for index in range(size)
+    ]
+
+
+def _magnitudes(data, omega, window, basis):
+    # Amplitude of the tone in every block of samples
+    block_size = len(window)
+    scale = 2.0 / sum(window)
+    if basis is not None:
+        samples = np.frombuffer(data, dtype='<i2').reshape(-1, block_size)
+        return (scale * np.hypot(*np.dot(samples, basis).T)).tolist()
+
+    samples = _samples(data)
+    coefficient = 2 * math.cos(omega)
+    return [
+        scale * _goertzel(
+            samples[start:start + block_size], window, coefficient
+        )
+        for start in range(0, len(samples), block_size)
+    ]
+
+
+def _samples(data):
+    samples = array('h')
+    samples.frombytes(data)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples
+
+
+def _goertzel(samples, window, coefficient):
+    # Magnitude of one DFT bin of windowed samples, with coefficient
+    # 2 cos(omega) for the bin at omega radians per sample
+    s1 = s2 = 0.0
+    for sample, weight in zip(samples, window):
+        s1, s2 = sample * weight + coefficient * s1 - s2, s1
+    return math.sqrt(max(s1 * s1 + s2 * s2 - coefficient * s1 * s2, 0.0))
+
+
+class MultiToneDecoder(object):
+    """Decode the tones at many ``frequencies`` Hz in one PCM stream.
+
+    Every channel is read from the same short-time Fourier transform of
+    the audio: frames of ``frame_size`` samples, one every 5 ms, so the
+    cost of measuring the tones grows with the frame size rather than the
+    number of channels.  The frame size defaults to the smallest power of
+    two that keeps neighbouring channels two bins apart.  A channel is only
+    heard within 14 dB of the loudest one of the last few seconds.
+
+    Without NumPy every channel is measured by its own Goertzel filter,
+    which is much slower.
+
+    ``timing`` is called for a new timing object for every channel, and
+    defaults to ``AdaptiveTiming``.  ``feed()`` and ``finish()`` return the
+    text completed on every channel, in the order of ``frequencies``.
+    """
+
+    def __init__(self, frequencies, sample_rate=audio.DEFAULT_SAMPLE_RATE,
+                 timing=AdaptiveTiming, frame_size=None):
+        self.frequencies = list(frequencies)
+        self.sample_rate = sample_rate
+        self.hop_size = max(1, int(round(sample_rate * _BLOCK_DURATION)))
+        self.block_duration = self.hop_size / float(sample_rate)
+        self.frame_size = frame_size or _frame_size(
+            self.frequencies, sample_rate, self.hop_size
+        )
+        self.channels = [
+            EdgeDecoder(timing=timing()) for _ in self.frequencies
+        ]
+
+        self._bins = [
+            int(round(frequency * self.frame_size / sample_rate))
+            for frequency in self.frequencies
+        ]
+        if len(set(self._bins)) != len(self._bins):
+            raise ValueError(
+                'Frequencies too close together to tell apart with frames '
+                'of {} samples: {}'.format(self.frame_size, self.frequencies)
+            )
+        self._window = _hann(self.frame_size)
+        self._scale = 2.0 / sum(self._window)
+        self._decay = 0.5 ** (self.block_duration / _PEAK_HALF_LIFE)
+        self._peaks = [0.0] * len(self.frequencies)
+        self._levels = [False] * len(self.frequencies)
+        self._blocks = 0
+        # Audio from the start of the next frame on
+        self._pending = b''
+
+    def feed(self, pcm):
+        """Decode a chunk of PCM and return the newly completed text of
+        every channel.
+
+        Chunks may end anywhere, even within a sample.
+        """
+        data = self._pending + bytes(pcm) if self._pending else pcm
+        sample_count = len(data) // _SAMPLE_WIDTH
+        frame_count = max(
+            0, (sample_count - self.frame_size) // self.hop_size + 1
+        )
+        self._pending = bytes(
+            data[frame_count * self.hop_size * _SAMPLE_WIDTH:]
+        )
+
+        if np is not None:
+            self._feed_array(data, sample_count, frame_count)
+        else:
+            self._feed_list(data, sample_count, frame_count)
+
+        now = self._blocks * self.block_duration
+        return [channel.read(now=now) for channel in self.channels]
+
+    def finish(self):
+        """Decode the rest of the audio, ending tones still sounding."""
+        now = self._blocks * self.block_duration
+        for channel, level in zip(self.channels, self._levels):
+            if level:
+                channel.push(now, False)
+        self._levels = [False] * len(self.channels)
+        return [channel.finish() for channel in self.channels]
+
+    def _feed_array(self, data, sample_count, frame_count):
+        samples = np.frombuffer(data, dtype='<i2', count=sample_count)
+        window = np.array(self._window)
+        for start in range(0, frame_count, _BATCH_FRAMES):
+            count = min(_BATCH_FRAMES, frame_count - start)
+            frames = np.lib.stride_tricks.as_strided(
+                samples[start * self.hop_size:],
+                shape=(count, self.frame_size),
+                strides=(
+                    self.hop_size * samples.strides[0], samples.strides[0]
+                ),
+            )
+            magnitudes = self._scale * np.abs(
+                np.fft.rfft(frames * window, axis=1)[:, self._bins]
+            )
+
+            # Each peak is the largest magnitude so far decayed by its age,
+            # a running maximum once the decay is divided out.
+            decays = self._decay ** np.arange(1, count + 1)[:, np.newaxis]
+            peaks = decays * np.maximum(
+                self._peaks,
+                np.maximum.accumulate(magnitudes / decays, axis=0),
+            )
+            levels = magnitudes >= np.maximum(
+                np.maximum(peaks * _THRESHOLD, _MIN_MAGNITUDE),
+                _CROSSTALK * peaks.max(axis=1, keepdims=True),
+            )
+            changed = levels != np.vstack((self._levels, levels[:-1]))
+            for block, channel in zip(*np.nonzero(changed)):
+                self.channels[channel].push(
+                    (self._blocks + block) * self.block_duration,
+                    bool(levels[block, channel]),
+                )
+
+            self._peaks = peaks[-1]
+            self._levels = levels[-1].tolist()
+            self._blocks += count
+
+    def _feed_list(self, data, sample_count, frame_count):
+        samples = _samples(data[:sample_count * _SAMPLE_WIDTH])
+        coefficients = [
+            2 * math.cos(2 * math.pi * bin_ / self.frame_size)
+            for bin_ in self._bins
+        ]
+        for frame in range(frame_count):
+            start = frame * self.hop_size
+            frame_samples = samples[start:start + self.frame_size]
+            timestamp = self._blocks * self.block_duration
+            magnitudes = [
+                self._scale * _goertzel(
+                    frame_samples, self._window, coefficient
+                )
+                for coefficient in coefficients
+            ]
+            self._peaks = [
+                max(magnitude, peak * self._decay)
+                for magnitude, peak in zip(magnitudes, self._peaks)
+            ]
+            crosstalk = _CROSSTALK * max(self._peaks)
+            for channel, magnitude in enumerate(magnitudes):
+                level = magnitude >= max(
+                    self._peaks[channel] * _THRESHOLD,
+                    _MIN_MAGNITUDE,
+                    crosstalk,
+                )
+                if level != self._levels[channel]:
+                    self.channels[channel].push(timestamp, level)
+                    self._levels[channel] = level
+            self._blocks += 1
+
+
+def _frame_size(frequencies, sample_rate, hop_size):
+    spacings = [
+        higher - lower
+        for lower, higher in zip(sorted(frequencies), sorted(frequencies)[1:])
+        if higher > lower
+    ]
+    # A Hann window leaks into the two bins either side of a tone
+    size = 2.0 * sample_rate / min(spacings) if spacings else hop_size
+    return 1 << max(0, int(math.ceil(math.log(max(size, hop_size), 2))))
+
+
+def decode_pcm(pcm, sample_rate=audio.DEFAULT_SAMPLE_RATE,
+               frequency=audio.DEFAULT_FREQUENCY, timing=None, errors=None):
+    """Decode all of a PCM recording to ``Morse``.
+
+    Characters received that are not Morse are left out, so that one
+    misheard character does not lose the recording.  Pass a list as
+    ``errors`` to have an ``ErrorSpan`` of keying units added to it for
+    every one.
+    """
+    decoder = ToneDecoder(sample_rate, frequency, timing, replacement='')
+    plain_text = decoder.feed(pcm) + decoder.finish()
+    if errors is not None:
+        errors.extend(decoder.errors)
+    return Morse.from_plain_text(plain_text)
+
+
+def decode_wav(input_file, frequency=audio.DEFAULT_FREQUENCY, timing=None,
+               chunk_frames=_CHUNK_FRAMES, errors=None):
+    """Decode a 16-bit mono WAV file, or a binary file object of one.
+
+    The file is read ``chunk_frames`` at a time, so recordings of any
+    length decode in bounded memory.  Characters that are not Morse are
+    left out and listed in ``errors`` as by ``decode_pcm()``.
+    """
+    wav = wave.open(input_file, 'rb')
+    try:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != _SAMPLE_WIDTH:
+            raise ValueError(
+                'Only 16-bit mono WAV audio can be decoded.  Given: {} '
+                'channels of {} bytes'.format(
+                    wav.getnchannels(), wav.getsampwidth()
+                )
+            )
+
+        decoder = ToneDecoder(
+            wav.getframerate(), frequency, timing, replacement=''
+        )
+        plain_text = []
+        while True:
+            pcm = wav.readframes(chunk_frames)
+            if not pcm:
+                break
+            plain_text.append(decoder.feed(pcm))
+        plain_text.append(decoder.finish())
+    finally:
+        wav.close()
+
+    if errors is not None:
+        errors.extend(decoder.errors)
+
+    return Morse.from_plain_text(''.join(plain_text))
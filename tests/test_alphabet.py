@@ -0,0 +1,211 @@
+import sys
+import threading
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import lists, sampled_from
+
+import sweetmorse.constants as c
+from sweetmorse import alphabet
+from sweetmorse.alphabet import Alphabet
+from sweetmorse.morse import Morse, MorseDecodeError
+
+STANDARD_ALPHABETS = (
+    alphabet.INTERNATIONAL,
+    alphabet.PROSIGNS,
+    alphabet.CYRILLIC,
+    alphabet.GREEK,
+    alphabet.WABUN,
+)
+
+
+def words_of(alphabet_):
+    # Tokens that lose a shared code to another do not decode to themselves
+    return lists(
+        lists(
+            sampled_from(sorted(
+                alphabet_.human_readable_to_plain_text.values()
+            )),
+            min_size=1,
+        ).map(''.join),
+        min_size=1,
+    )
+
+
+def test_international_matches_constants():
+    international = alphabet.INTERNATIONAL
+    assert international.plain_text_to_binary == c.PLAIN_TEXT_TO_BINARY
+    assert international.binary_chars == c.BINARY_CHARS
+    assert international.human_readable_chars == c.HUMAN_READABLE_CHARS
+    assert international.plain_text_alphabet == c.PLAIN_TEXT_ALPHABET
+
+
+@pytest.mark.parametrize('table', (
+    c.PROSIGNS_TO_HUMAN_READABLE,
+    c.CYRILLIC_TO_HUMAN_READABLE,
+    c.GREEK_TO_HUMAN_READABLE,
+    c.WABUN_TO_HUMAN_READABLE,
+))
+def test_tables_have_unique_codes(table):
+    assert len(set(table.values())) == len(table)
+
+
+def test_prosigns_win_shared_codes():
+    assert alphabet.PROSIGNS.human_readable_to_plain_text['._._.'] == '<AR>'
+    assert alphabet.PROSIGNS.plain_text_to_human_readable['+'] == '._._.'
+    prosigns = {
+        code: token for token, code in c.PROSIGNS_TO_HUMAN_READABLE.items()
+    }
+    for code in ('._._.', '_..._', '._...', '_.__.'):
+        assert alphabet.PROSIGNS.human_readable_to_plain_text[code] == (
+            prosigns[code]
+        )
+
+
+@pytest.mark.parametrize('pairs, decoded', [
+    ([('A', '._'), ('B', '._')], 'B'),
+    ([('B', '._'), ('A', '._')], 'A'),
+    # A token given again takes its code back
+    ([('A', '._'), ('B', '._'), ('B', '_...')], 'A'),
+])
+def test_last_token_given_wins_shared_codes(pairs, decoded):
+    assert Alphabet(pairs).human_readable_to_plain_text['._'] == decoded
+    one, other = Alphabet(pairs[:1]), Alphabet(pairs[1:])
+    assert one.union(other).human_readable_to_plain_text['._'] == decoded
+
+
+def compile_in_threads():
+    # The encoding table of a new alphabet, as four threads read it at once
+    alphabet_ = Alphabet(c.PLAIN_TEXT_TO_HUMAN_READABLE)
+    barrier = threading.Barrier(4)
+    tables = []
+
+    def look_up():
+        barrier.wait()
+        tables.append(alphabet_._binary_table)
+
+    threads = [threading.Thread(target=look_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return tables
+
+
+def test_compiles_once_for_threads_at_once():
+    # Switching threads often, so that they meet in the middle of compiling
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        tables_of_threads = [compile_in_threads() for _ in range(100)]
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    for tables in tables_of_threads:
+        assert len(tables) == 4
+        assert all(table == tables[0] for table in tables)
+
+
+def test_tokens_take_longest_match():
+    assert alphabet.PROSIGNS.tokens('<AR> A<SK>') == [
+        '<AR>', ' ', 'A', '<SK>',
+    ]
+    assert alphabet.INTERNATIONAL.tokens('AR') == 'AR'
+
+
+def test_is_plain_text():
+    assert alphabet.PROSIGNS.is_plain_text('CQ <AR>')
+    assert not alphabet.PROSIGNS.is_plain_text('CQ <A')
+    assert alphabet.CYRILLIC.is_plain_text('ПРИВЕТ МИР')
+    assert not alphabet.CYRILLIC.is_plain_text('ПРИВЕТ W')
+    assert alphabet.PROSIGNS.invalid_plain_text('<A <AR> <') == {'<'}
+
+
+@pytest.mark.parametrize('table', (
+    {'': '.'},
+    {'A B': '.'},
+    {'a': '.'},
+    {'A': ''},
+    {'A': '.-'},
+    {'A': '. _'},
+    {'A': '.', 'AB': '._'},
+    {'<A': '.', '<AB>': '._'},
+))
+def test_invalid_tables(table):
+    with pytest.raises(ValueError):
+        Alphabet(table)
+
+
+def test_equality():
+    assert Alphabet(c.PLAIN_TEXT_TO_HUMAN_READABLE) == alphabet.INTERNATIONAL
+    assert alphabet.CYRILLIC != alphabet.GREEK
+    assert hash(Alphabet(c.PLAIN_TEXT_TO_HUMAN_READABLE)) == hash(
+        alphabet.INTERNATIONAL
+    )
+
+
+def test_sos_prosign():
+    morse = Morse.from_plain_text('cq <sos>', alphabet=alphabet.PROSIGNS)
+
+    assert morse.human_readable == '_._. __._   ...___...'
+    assert morse.binary == (
+        '111010111010001110111010111000000010101011101110111010101'
+    )
+    assert Morse.from_binary(
+        morse.binary, alphabet=alphabet.PROSIGNS
+    ).plain_text == 'CQ <SOS>'
+
+
+def test_alphabet_is_part_of_the_message():
+    plus = Morse.from_human_readable('._._.')
+    end_of_message = Morse.from_human_readable(
+        '._._.', alphabet=alphabet.PROSIGNS
+    )
+
+    assert plus.plain_text == '+'
+    assert end_of_message.plain_text == '<AR>'
+    assert end_of_message.alphabet is alphabet.PROSIGNS
+    assert Morse.from_plain_text('E') != Morse.from_plain_text(
+        'E', alphabet=alphabet.PROSIGNS
+    )
+
+
+def test_parse_with_alphabet():
+    assert Morse.parse('привет', alphabet=alphabet.CYRILLIC) == Morse(
+        ['ПРИВЕТ'], alphabet=alphabet.CYRILLIC
+    )
+    with pytest.raises(ValueError):
+        Morse.parse('HELLO', alphabet=alphabet.CYRILLIC)
+
+
+def test_errors_show_alphabet_codes():
+    with pytest.raises(ValueError, match='Б'):
+        Morse.from_plain_text('БW', alphabet=alphabet.GREEK)
+    with pytest.raises(MorseDecodeError) as error:
+        Morse.from_binary('1110111011101110111', alphabet=alphabet.GREEK)
+    assert error.value.offset == 0
+
+
+@pytest.mark.parametrize('alphabet_', STANDARD_ALPHABETS)
+def test_there_and_back(alphabet_):
+    @given(words_of(alphabet_))
+    def there_and_back(words):
+        morse = Morse(words, alphabet=alphabet_)
+        plain_text = morse.plain_text
+
+        for decoded in (
+            Morse.from_plain_text(plain_text.lower(), alphabet=alphabet_),
+            Morse.from_human_readable(
+                morse.human_readable, alphabet=alphabet_
+            ),
+            Morse.from_binary(morse.binary, alphabet=alphabet_),
+            Morse.from_keying_events(
+                morse.iter_keying_events(), alphabet=alphabet_
+            ),
+        ):
+            assert decoded == morse
+            assert decoded.human_readable == morse.human_readable
+            assert decoded.binary == morse.binary
+
+    there_and_back()
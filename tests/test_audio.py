@@ -0,0 +1,81 @@
+import io
+import sys
+import wave
+from array import array
+
+from hypothesis import given
+from hypothesis.strategies import text
+
+import sweetmorse.constants as c
+from sweetmorse import audio
+from sweetmorse.morse import Morse
+
+UNIT = audio.samples_per_unit()
+
+
+def samples(pcm):
+    pcm = array('h', pcm)
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm
+
+
+def test_samples_per_unit():
+    # 20 WPM is 60 ms a unit
+    assert audio.samples_per_unit(8000, 20) == 480
+    assert audio.samples_per_unit(44100, 20) == 2646
+
+
+def test_sos_is_keyed():
+    morse = Morse.from_plain_text('SOS')
+
+    pcm = samples(morse.to_pcm())
+
+    assert len(pcm) == len(morse.binary) * UNIT
+    for index, unit in enumerate(morse.binary):
+        block = pcm[index * UNIT:(index + 1) * UNIT]
+        if unit == '1':
+            assert max(block) > 0.7 * 32767
+        else:
+            assert not any(block)
+
+
+def test_marks_fade_in_and_out():
+    pcm = samples(Morse.from_plain_text('E').to_pcm())
+
+    assert abs(pcm[0]) < 0.01 * 32767
+    assert abs(pcm[-1]) < 0.01 * 32767
+
+
+@given(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+def test_chunks_join_to_pcm(value):
+    morse = Morse.from_plain_text(value)
+
+    chunks = list(audio.iter_pcm(morse.binary))
+
+    assert b''.join(chunks) == morse.to_pcm()
+
+
+def test_long_input_is_chunked():
+    morse = Morse.from_plain_text('SOS ' * 2000)
+
+    chunks = list(audio.iter_pcm(morse.binary))
+
+    assert len(chunks) > 1
+    assert sum(map(len, chunks)) == len(morse.binary) * UNIT * 2
+
+
+def test_write_wav():
+    morse = Morse.from_plain_text('SOS')
+    output_file = io.BytesIO()
+
+    audio.write_wav(output_file, morse.binary, sample_rate=11025, wpm=15)
+
+    output_file.seek(0)
+    wav = wave.open(output_file)
+    assert wav.getnchannels() == 1
+    assert wav.getsampwidth() == 2
+    assert wav.getframerate() == 11025
+    assert wav.readframes(wav.getnframes()) == morse.to_pcm(
+        sample_rate=11025, wpm=15
+    )
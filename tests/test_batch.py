@@ -0,0 +1,102 @@
+import io
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import data, integers, sampled_from, text
+
+import sweetmorse.constants as c
+from sweetmorse import batch
+from sweetmorse.morse import Morse, MorseDecodeError
+
+from test_stream import FORMATS, from_format, to_format
+
+TRAILING_WHITESPACE = (' \n', '\n ', '\r\n   ')
+
+
+@given(data())
+def test_convert_matches_morse(data):
+    plain = data.draw(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+    source = data.draw(sampled_from(FORMATS))
+    target = data.draw(sampled_from(FORMATS))
+    value = '\n' + to_format(Morse.from_plain_text(plain), source) + (
+        data.draw(sampled_from(TRAILING_WHITESPACE))
+    )
+    chunk_size = data.draw(integers(min_value=1, max_value=40))
+
+    output = batch.convert(value, source, target, jobs=1,
+                           chunk_size=chunk_size)
+
+    assert output == to_format(from_format(value, source), target)
+
+
+@pytest.mark.parametrize('value, source', [
+    ('SOS\n ', c.PLAIN),
+    ('... ___ ...\r\n   ', c.HUMAN_READABLE),
+])
+def test_trailing_whitespace_after_a_word_gap(value, source):
+    output = batch.convert(value, source, c.BINARY, jobs=1)
+
+    assert output == Morse.from_plain_text('SOS').binary
+
+
+def test_convert_in_processes():
+    value = Morse.from_plain_text('Hello, Morse World!  ' * 500).binary
+
+    output = batch.convert(value, c.BINARY, c.HUMAN_READABLE, jobs=2,
+                           chunk_size=1000)
+
+    assert output == Morse.from_binary(value).human_readable
+
+
+def test_error_offset_from_a_worker():
+    # A gap of four zeros near the end
+    value = '\n' + Morse.from_plain_text('SOS ' * 100).binary + '00001'
+
+    with pytest.raises(MorseDecodeError) as error:
+        batch.convert(value, c.BINARY, c.PLAIN, jobs=2, chunk_size=100)
+
+    assert error.value.offset == len(value) - 5
+
+
+def test_convert_file_reads_in_chunks():
+    class Input(io.StringIO):
+        largest_read = 0
+
+        def read(self, size=-1):
+            self.largest_read = max(self.largest_read, size)
+            return super(Input, self).read(size)
+
+    input_file = Input('SOS ' * 1000)
+    output_file = io.StringIO()
+
+    batch.convert_file(input_file, output_file, c.PLAIN, c.BINARY, jobs=1,
+                       chunk_size=64)
+
+    assert input_file.largest_read == 64
+    assert output_file.getvalue() == Morse.from_plain_text(
+        input_file.getvalue()
+    ).binary
+
+
+def test_convert_files(tmpdir):
+    inputs = {'a.txt': 'Hello, Morse World!\n', 'b.txt': 'SOS ' * 300,
+              'empty.txt': ''}
+    input_paths = []
+    for name, value in sorted(inputs.items()):
+        tmpdir.join('in', name).write(value, ensure=True)
+        input_paths.append(str(tmpdir.join('in', name)))
+    tmpdir.mkdir('out')
+
+    batch.convert_files(input_paths, str(tmpdir.join('out')), c.PLAIN,
+                        c.BINARY, jobs=2, chunk_size=50)
+
+    for name, value in inputs.items():
+        assert tmpdir.join('out', name).read() == (
+            Morse.from_plain_text(value).binary + '\n'
+        )
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        batch.convert('SOS', c.PLAIN, c.BINARY_PACKED)
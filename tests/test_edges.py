@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import text
+
+import sweetmorse.constants as c
+from sweetmorse.edges import EdgeDecoder, decode_edges
+from sweetmorse.morse import ErrorSpan, Morse, MorseDecodeError
+
+UNIT = 0.01
+
+
+def to_edges(binary, unit=UNIT, start=100.0, jitter=0.0, seed=0):
+    """Edges of a signal keying ``binary``, optionally with timing noise."""
+    rng = random.Random(seed)
+    edges = []
+    level = '0'
+    for index, value in enumerate(binary + '0'):
+        if value != level:
+            noise = rng.uniform(-jitter, jitter) * unit
+            edges.append((start + index * unit + noise, value))
+            level = value
+    return edges
+
+
+def test_sos():
+    edges = to_edges(Morse.from_plain_text('SOS').binary)
+
+    assert decode_edges(edges, UNIT) == 'SOS'
+
+
+@given(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+def test_edges_match_morse(value):
+    morse = Morse.from_plain_text(value)
+
+    edges = to_edges(morse.binary, jitter=0.2)
+
+    assert decode_edges(edges, UNIT) == morse.plain_text
+
+
+def test_read_completes_characters_after_silence():
+    decoder = EdgeDecoder(UNIT)
+    for timestamp, level in to_edges('10111' + '000' + '111', start=0.0):
+        decoder.push(timestamp, level)
+
+    # The A is complete, the T could still become an M
+    assert decoder.read() == 'A'
+    # 'T' plus three silent units ends the character ...
+    assert decoder.read(now=0.145) == 'T'
+    # ... and seven make a word gap, reported once
+    assert decoder.read(now=0.185) == ' '
+    assert decoder.read(now=0.5) == ''
+
+    # Only the end of the space tells how many word gaps it held: 42 units
+    # make 6, one of them reported already.
+    decoder.push(0.53, 1)
+    decoder.push(0.54, 0)
+    assert decoder.finish() == '     E'
+
+
+def test_levels_can_be_strings_ints_or_bools():
+    decoder = EdgeDecoder(UNIT)
+    for timestamp, level in ((0.0, True), (0.01, 0), (0.02, '1'),
+                             (0.03, False), (0.04, 1), (0.045, 1)):
+        decoder.push(timestamp, level)
+    decoder.push(0.05, '0')
+
+    assert decoder.finish() == 'S'
+
+
+def test_invalid_character():
+    edges = to_edges('1010101010101010101')
+
+    with pytest.raises(MorseDecodeError) as error:
+        decode_edges(edges, UNIT, replacement=None)
+
+    assert error.value.offset == 0
+
+
+def test_decodes_past_invalid_characters():
+    # S, an invalid run of dots, then O
+    binary = '10101' + '000' + '1010101010101010101' + '000' + '11101110111'
+    decoder = EdgeDecoder(UNIT)
+    for timestamp, level in to_edges(binary, start=0.0):
+        decoder.push(timestamp, level)
+
+    assert decoder.finish() == 'S\ufffdO'
+    assert decoder.errors == [
+        ErrorSpan(8, 27, '1010101010101010101', '\ufffd'),
+    ]
+
+
+def test_read_keeps_text_before_an_invalid_character():
+    decoder = EdgeDecoder(UNIT, replacement='#')
+    for timestamp, level in to_edges('1' + '000' + '10101010101', start=0.0):
+        decoder.push(timestamp, level)
+
+    assert decoder.read(now=0.18) == 'E#'
+    assert decoder.errors[0].start == 4
+
+
+def test_unit_duration_must_be_positive():
+    with pytest.raises(ValueError):
+        EdgeDecoder(0)
@@ -0,0 +1,124 @@
+import contextlib
+
+import pytest
+
+from hypothesis import given, example
+from hypothesis.strategies import (
+    text,
+    lists,
+    sampled_from,
+)
+
+import sweetmorse.constants as c
+from sweetmorse import fast
+from sweetmorse.morse import Morse, MorseDecodeError
+
+BACKENDS = ('numpy', 'python')
+
+
+@contextlib.contextmanager
+def backend(name):
+    if name == 'numpy':
+        if fast.np is None:
+            pytest.skip('NumPy is not installed')
+        yield
+    else:
+        np, fast.np = fast.np, None
+        try:
+            yield
+        finally:
+            fast.np = np
+
+
+def as_binary(units):
+    return ''.join(str(unit) for unit in bytearray(units))
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_sos(name):
+    with backend(name):
+        units = fast.encode_binary(b'sos\n')
+
+        assert as_binary(units) == '101010001110111011100010101'
+        assert fast.decode_binary(units) == 'SOS'
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@given(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+def test_encode_matches_morse(name, value):
+    with backend(name):
+        units = fast.encode_binary(value.encode('ascii'))
+
+    assert as_binary(units) == Morse.from_plain_text(value).binary
+
+
+@pytest.mark.parametrize("value", ['A  B', 'AB  C', 'E E  E   E', 'SOS'])
+@pytest.mark.parametrize("block_size", [2, 4])
+def test_encode_across_blocks(monkeypatch, value, block_size):
+    monkeypatch.setattr(fast, '_BLOCK_SIZE', block_size)
+
+    with backend('numpy'):
+        units = fast.encode_binary(value.encode('ascii'))
+
+    assert as_binary(units) == Morse.from_plain_text(value).binary
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@given(
+    lists(
+        elements=sampled_from(
+            ['0', '1', '111', c.BINARY_CHAR_GAP, c.BINARY_WORD_GAP] +
+            list(c.BINARY_CHARS)
+        )
+    ).map(''.join)
+)
+@example(c.BINARY_WORD_GAP)
+@example('')
+@example('10')
+@example('101110')
+@example('0000001110101010')
+@example('1' * 30)
+@example('0' * 40 + '1')
+@example('1110111011101110111011100010001')
+def test_decode_matches_morse(name, value):
+    units = bytearray(int(unit) for unit in value)
+
+    try:
+        expected = Morse.from_binary(value).plain_text
+    except MorseDecodeError as error:
+        expected = None
+        expected_offset = error.offset
+
+    with backend(name):
+        if expected is None:
+            with pytest.raises(MorseDecodeError) as error:
+                fast.decode_binary(units)
+            assert error.value.offset == expected_offset
+        else:
+            assert fast.decode_binary(units) == expected
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize(
+    "value,offset",
+    (
+        ([1, 0, 1, 2], 3),
+        ([1, 0, 0, 0, 0, 1, 1, 1], 1),
+        ([1, 0, 1, 1, 0, 0, 0, 1], 0),
+        ([0, 1], 0),
+        ([1, 0, 0, 0, 1, 1, 1, 0, 1, 1, 0], 4),
+    )
+)
+def test_decode_error_offset(name, value, offset):
+    with backend(name):
+        with pytest.raises(MorseDecodeError) as error:
+            fast.decode_binary(bytearray(value))
+
+    assert error.value.offset == offset
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_encode_invalid_characters(name):
+    with backend(name):
+        with pytest.raises(ValueError):
+            fast.encode_binary(b'SOS\tSOS')
@@ -0,0 +1,112 @@
+import io
+import os
+import tempfile
+import tracemalloc
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import data, integers, sampled_from, text
+
+import sweetmorse.constants as c
+from sweetmorse import io as sweetmorse_io
+from sweetmorse.morse import Morse, MorseDecodeError
+
+from test_stream import FORMATS, from_format, to_format
+
+TRAILING_WHITESPACE = (' \n', '\n ', '\r\n   ')
+
+
+def write_input(directory, value):
+    path = os.path.join(directory, 'input')
+    with open(path, 'wb') as input_file:
+        input_file.write(value.encode('utf-8'))
+    return path
+
+
+@given(data())
+def test_convert_file_matches_morse(data):
+    plain = data.draw(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+    source = data.draw(sampled_from(FORMATS))
+    target = data.draw(sampled_from(FORMATS))
+    value = '\n' + to_format(Morse.from_plain_text(plain), source) + (
+        data.draw(sampled_from(TRAILING_WHITESPACE))
+    )
+    chunk_size = data.draw(integers(min_value=1, max_value=40))
+
+    output_file = io.BytesIO()
+    with tempfile.TemporaryDirectory() as directory:
+        sweetmorse_io.convert_file(
+            write_input(directory, value), output_file, source, target,
+            chunk_size=chunk_size,
+        )
+
+    assert output_file.getvalue().decode('ascii') == to_format(
+        from_format(value, source), target
+    )
+
+
+def test_convert_file_to_path(tmpdir):
+    value = 'Hello, Morse World!  ' * 500
+    output_path = str(tmpdir.join('output'))
+
+    sweetmorse_io.convert_file(
+        write_input(str(tmpdir), value), output_path, c.PLAIN, c.BINARY,
+        jobs=2, chunk_size=1000,
+    )
+
+    with open(output_path) as output_file:
+        assert output_file.read() == Morse.from_plain_text(value).binary
+
+
+def test_convert_file_in_constant_memory(tmpdir):
+    class Output(object):
+        def write(self, value):
+            pass
+
+    value = Morse.from_plain_text('SOS ' * 50000).binary
+    input_path = write_input(str(tmpdir), value)
+    chunk_size = 4096
+
+    tracemalloc.start()
+    try:
+        sweetmorse_io.convert_file(
+            input_path, Output(), c.BINARY, c.PLAIN, chunk_size=chunk_size,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(value) > 100 * chunk_size
+    assert peak < 20 * chunk_size
+
+
+def test_empty_file(tmpdir):
+    output_file = io.BytesIO()
+
+    sweetmorse_io.convert_file(
+        write_input(str(tmpdir), ''), output_file, c.BINARY, c.PLAIN,
+    )
+
+    assert output_file.getvalue() == b''
+
+
+def test_error_offset_in_file(tmpdir):
+    # A gap of four zeros near the end
+    value = '\n' + Morse.from_plain_text('SOS ' * 100).binary + '00001'
+
+    with pytest.raises(MorseDecodeError) as error:
+        sweetmorse_io.convert_file(
+            write_input(str(tmpdir), value), io.BytesIO(), c.BINARY,
+            c.PLAIN, chunk_size=100,
+        )
+
+    assert error.value.offset == len(value) - 5
+
+
+def test_unknown_format(tmpdir):
+    with pytest.raises(ValueError):
+        sweetmorse_io.convert_file(
+            write_input(str(tmpdir), '1'), io.BytesIO(), c.BINARY,
+            c.BINARY_PACKED,
+        )
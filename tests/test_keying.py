@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from sweetmorse.edges import decode_edges
+from sweetmorse.keying import FakeClock, KeyingTransmitter, LoopClock
+from sweetmorse.morse import Morse
+
+UNIT = 0.1
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class Recorder(object):
+    """Output that records when the level changed."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.edges = []
+
+    def __call__(self, level):
+        self.edges.append((self.clock.time(), level))
+
+
+def test_one_change_per_run():
+    clock = FakeClock()
+    output = Recorder(clock)
+    transmitter = KeyingTransmitter(output, UNIT, clock=clock)
+
+    # A is 10111
+    end, = run(clock.run(transmitter.transmit(Morse.from_plain_text('A'))))
+
+    assert output.edges == [
+        (0.0, True),
+        (pytest.approx(0.1), False),
+        (pytest.approx(0.2), True),
+        (pytest.approx(0.5), False),
+    ]
+    assert end == pytest.approx(0.5)
+
+
+def test_timeline_is_absolute():
+    clock = FakeClock(start=1000.0)
+    output = Recorder(clock)
+    transmitter = KeyingTransmitter(output, UNIT, clock=clock)
+    morse = Morse.from_plain_text('Hello, Morse World! ' * 20)
+
+    run(clock.run(transmitter.transmit(morse)))
+
+    # Edges land exactly on the unit grid, however long the message
+    for timestamp, _ in output.edges:
+        units = (timestamp - 1000.0) / UNIT
+        assert units == pytest.approx(round(units), abs=1e-6)
+    assert decode_edges(output.edges, UNIT) == morse.plain_text
+
+
+def test_channels_key_concurrently():
+    clock = FakeClock()
+    messages = ['SOS', 'CQ CQ', 'HELLO WORLD']
+    outputs = [Recorder(clock) for _ in messages]
+    transmitters = [
+        KeyingTransmitter(output, UNIT * (index + 1), clock=clock)
+        for index, output in enumerate(outputs)
+    ]
+
+    ends = run(clock.run(*(
+        transmitter.transmit(Morse.from_plain_text(message))
+        for transmitter, message in zip(transmitters, messages)
+    )))
+
+    assert clock.time() == pytest.approx(max(ends))
+    for index, (output, message) in enumerate(zip(outputs, messages)):
+        assert decode_edges(output.edges, UNIT * (index + 1)) == message
+
+
+def test_loop_clock():
+    unit = 0.005
+    clock = LoopClock()
+    output = Recorder(clock)
+    transmitter = KeyingTransmitter(output, unit, clock=clock)
+
+    async def transmit():
+        start = clock.time()
+        end = await transmitter.transmit(
+            Morse.from_plain_text('SOS'), start=start
+        )
+        return start, end
+
+    start, end = run(transmit())
+
+    assert end == pytest.approx(start + 27 * unit)
+    # On time, give or take scheduling noise
+    for (timestamp, _), units in zip(output.edges, [0, 1, 2, 3, 4, 5, 8]):
+        assert timestamp == pytest.approx(start + units * unit, abs=0.05)
+
+
+def test_unit_duration_must_be_positive():
+    with pytest.raises(ValueError):
+        KeyingTransmitter(print, 0)
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import data, lists, sampled_from, text
+
+import sweetmorse.constants as c
+from sweetmorse.lines import convert, convert_file
+from sweetmorse.morse import Morse, MorseDecodeError
+
+from test_stream import FORMATS, from_format, to_format
+
+
+@given(data())
+def test_convert_lines_one_by_one(data):
+    messages = data.draw(lists(text(alphabet=list(c.PLAIN_TEXT_ALPHABET))))
+    source = data.draw(sampled_from(FORMATS))
+    target = data.draw(sampled_from(FORMATS))
+    lines = [
+        ' ' + to_format(Morse.from_plain_text(message), source) + '\n'
+        for message in messages
+    ]
+
+    assert list(convert(lines, source, target)) == [
+        to_format(from_format(line, source), target) for line in lines
+    ]
+
+
+def test_convert_file():
+    output_file = io.StringIO()
+
+    convert_file(
+        io.StringIO('sos\n\nhello world'), output_file, c.PLAIN,
+        c.HUMAN_READABLE,
+    )
+
+    assert output_file.getvalue() == (
+        '... ___ ...\n'
+        '\n'
+        '.... . ._.. ._.. ___   .__ ___ ._. ._.. _..\n'
+    )
+
+
+def test_invalid_line_raises():
+    with pytest.raises(MorseDecodeError) as error:
+        list(convert(['10101', '10101000111111'], c.BINARY, c.PLAIN))
+    assert error.value.offset == 8
+
+
+def test_invalid_lines_go_to_on_error():
+    errors = []
+
+    converted = list(convert(
+        ['... ___ ...', '._ ~', '', '_._ _.__'], c.HUMAN_READABLE, c.PLAIN,
+        on_error=lambda line_number, error: errors.append(
+            (line_number, type(error))
+        ),
+    ))
+
+    assert converted == ['SOS', '', '', 'KY']
+    assert errors == [(2, MorseDecodeError)]
+
+
+@pytest.mark.parametrize('formats', (
+    (c.BINARY_PACKED, c.PLAIN),
+    (c.PLAIN, c.WAV),
+))
+def test_unknown_formats(formats):
+    with pytest.raises(ValueError):
+        list(convert(['sos'], *formats))
@@ -1,4 +1,5 @@
 import itertools
+import re
 import pytest
 
 from hypothesis import given, example
@@ -10,7 +11,14 @@ from hypothesis.strategies import (
 )
 
 import sweetmorse.constants as c
-from sweetmorse.morse import Morse
+from sweetmorse.alphabet import CYRILLIC, PROSIGNS, Alphabet
+from sweetmorse.morse import (
+    ErrorSpan,
+    Morse,
+    MorseDecodeError,
+    cache_words,
+    word_cache_info,
+)
 
 
 @pytest.mark.parametrize(
@@ -60,6 +68,112 @@ def test_repr_makes_object():
     assert from_repr == m
 
 
+@pytest.mark.parametrize('alphabet, human_readable', [
+    (PROSIGNS, '._._.   .'),
+    (CYRILLIC, '._._   .'),
+    (Alphabet(c.GREEK_TO_HUMAN_READABLE, name='MINE'), '.__   .'),
+    # '.' decodes to A, given again after B
+    (Alphabet([('A', '.'), ('B', '.'), ('A', '.'), ('N', '_.')]), '.   _.'),
+])
+def test_repr_makes_object_in_other_alphabets(alphabet, human_readable):
+    m = Morse.from_human_readable(human_readable, alphabet=alphabet)
+
+    from_repr = eval(repr(m))
+
+    assert from_repr == m
+    assert from_repr.alphabet == alphabet
+
+
+def test_equal_messages_hash_equal():
+    one = Morse.from_plain_text("same text")
+    other = Morse.from_binary(one.binary)
+
+    assert hash(one) == hash(other)
+    assert len({one, other, Morse.from_plain_text("other text")}) == 2
+    assert not one != other
+
+
+def test_formats_are_encoded_once():
+    morse = Morse(["SOS", "SOS"])
+
+    assert morse.binary is morse.binary
+    assert morse.human_readable is morse.human_readable
+    with pytest.raises(AttributeError):
+        morse.plain_text_words = ["E"]
+
+
+@pytest.mark.parametrize(
+    "from_format,value",
+    (
+        (c.HUMAN_READABLE, "... ___ ...   ._"),
+        (c.BINARY, "10101" + c.BINARY_WORD_GAP * 2 + "10111"),
+    )
+)
+def test_canonical_source_is_kept(from_format, value):
+    if from_format == c.BINARY:
+        morse = Morse.from_binary(value + "\n")
+        assert morse.binary is morse.binary
+        assert morse.binary == value
+    else:
+        morse = Morse.from_human_readable(value + "\n")
+        assert morse.human_readable is morse.human_readable
+        assert morse.human_readable == value
+
+
+@pytest.mark.parametrize(
+    "value",
+    (
+        "1" + c.BINARY_CHAR_GAP * 2 + "1",
+        "1" + c.BINARY_WORD_GAP + c.BINARY_CHAR_GAP + "1",
+        c.BINARY_CHAR_GAP + "1",
+        "1" + c.BINARY_CHAR_GAP,
+    )
+)
+def test_longer_binary_gaps_are_reencoded(value):
+    morse = Morse.from_binary(value)
+
+    assert morse.binary == Morse.from_plain_text(morse.plain_text).binary
+    assert morse.binary != value
+
+
+@given(data(), sampled_from([c.HUMAN_READABLE, c.BINARY]))
+def test_kept_source_is_what_encoding_makes(data, from_format):
+    if from_format == c.BINARY:
+        chars, gap_symbol = c.PLAIN_TEXT_TO_BINARY.values(), '0'
+    else:
+        chars, gap_symbol = c.PLAIN_TEXT_TO_HUMAN_READABLE.values(), ' '
+    value = data.draw(lists(
+        sampled_from(
+            sorted(chars) + [gap_symbol * n for n in (2, 3, 4, 6, 7, 10, 14)]
+        ),
+    ).map(''.join)).strip()
+    try:
+        morse = Morse.from_human_readable(value) \
+            if from_format == c.HUMAN_READABLE else Morse.from_binary(value)
+    except ValueError:
+        return
+
+    canonical = Morse(morse.plain_text_words)
+    assert morse.human_readable == canonical.human_readable
+    assert morse.binary == canonical.binary
+
+
+@pytest.mark.parametrize(
+    "words",
+    (
+        ["SOS", "sos"],
+        ["", "sos"],
+    )
+)
+def test_unencodable_words_raise(words):
+    morse = Morse(words)
+
+    with pytest.raises(KeyError):
+        morse.binary
+    with pytest.raises(KeyError):
+        morse.human_readable
+
+
 def test_sos_from_all_formats():
     assert Morse.from_plain_text("SOS").plain_text == "SOS"
 
@@ -85,6 +199,13 @@ def test_sos_from_all_formats_with_newline():
     ).plain_text == "SOS"
 
 
+def test_binary_keeps_words_apart():
+    morse = Morse.from_binary("1" + c.BINARY_WORD_GAP + "111")
+
+    assert morse == Morse.from_plain_text("E T")
+    assert morse.binary == "1" + c.BINARY_WORD_GAP + "111"
+
+
 @given(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
 @example('O  O')
 def test_there_and_back_plain_text(value):
@@ -180,9 +301,377 @@ def test_there_and_back_binary(data):
     assert morse_from_human_readable.binary == value
 
 
+@pytest.mark.parametrize(
+    "value,offset",
+    (
+        ("1010x", 4),
+        ("  10101\t1", 7),
+        ("10101000111011101110000101", 19),
+        ("1000010101", 1),
+        ("1000 0001", 4),
+        ("101010001111", 8),
+    )
+)
+def test_binary_error_offset(value, offset):
+    with pytest.raises(MorseDecodeError) as error:
+        Morse.from_binary(value)
+
+    assert error.value.offset == offset
+
+
+def split_binary(value):
+    """The original multi-pass binary decoder, as a reference."""
+    words = [
+        [char for char in word.split(c.BINARY_CHAR_GAP) if char]
+        for word in value.split(c.BINARY_WORD_GAP)
+    ]
+    if not all(char in c.BINARY_CHARS for word in words for char in word):
+        return None
+    return c.PLAIN_TEXT_WORD_GAP.join(
+        ''.join(c.BINARY_TO_PLAIN_TEXT[char] for char in word)
+        for word in words
+    )
+
+
+@given(
+    lists(
+        elements=sampled_from(['0', '1', '000', '0000000', '101', '111'])
+    ).map(''.join)
+)
+def test_binary_matches_split_decoder(value):
+    expected = split_binary(value.strip())
+
+    if expected is None:
+        with pytest.raises(MorseDecodeError):
+            Morse.from_binary(value)
+    else:
+        assert Morse.from_binary(value).plain_text == expected
+
+
+@pytest.mark.parametrize(
+    "value,offset",
+    (
+        (".... x", 5),
+        ("  ._ .......", 5),
+        (".... .   ._._._._._._._", 9),
+        (".... / .", 5),
+    )
+)
+def test_human_readable_error_offset(value, offset):
+    with pytest.raises(MorseDecodeError) as error:
+        Morse.from_human_readable(value)
+
+    assert error.value.offset == offset
+
+
+def split_human_readable(value):
+    """The original multi-pass human-readable decoder, as a reference."""
+    words = [
+        [char for char in word.split(c.HUMAN_READABLE_CHAR_GAP) if char]
+        for word in value.split(c.HUMAN_READABLE_WORD_GAP)
+    ]
+    if not all(
+        char in c.HUMAN_READABLE_CHARS for word in words for char in word
+    ):
+        return None
+    return c.PLAIN_TEXT_WORD_GAP.join(
+        ''.join(c.HUMAN_READABLE_TO_PLAIN_TEXT[char] for char in word)
+        for word in words
+    )
+
+
+@given(
+    lists(
+        elements=sampled_from([' ', '   ', '.', '_', '._', '...', '/'])
+    ).map(''.join)
+)
+def test_human_readable_matches_split_decoder(value):
+    expected = split_human_readable(value.strip())
+
+    for decode in (
+        lambda value: Morse.from_human_readable(value).plain_text,
+        Morse._human_readable_tree_to_plain_text,
+    ):
+        if expected is None:
+            with pytest.raises(MorseDecodeError):
+                decode(value.strip())
+        else:
+            assert decode(value.strip()) == expected
+
+
+def test_decode_lenient_binary():
+    plain_text, errors = Morse.decode_lenient(
+        ' 10101000111011111110001010100000', c.BINARY
+    )
+
+    assert plain_text == 'S\ufffdS '
+    assert errors == [
+        ErrorSpan(9, 20, '11101111111', '\ufffd'),
+        ErrorSpan(28, 33, '00000', ' '),
+    ]
+
+
+def test_decode_lenient_human_readable_nearest():
+    plain_text, errors = Morse.decode_lenient(
+        '... _-_ ...   ..._.__', c.HUMAN_READABLE, nearest=True
+    )
+
+    assert plain_text == 'SMS $'
+    assert errors == [
+        ErrorSpan(4, 7, '_-_', 'M'),
+        ErrorSpan(14, 21, '..._.__', '$'),
+    ]
+
+
+@given(data())
+def test_decode_lenient_valid_input(data):
+    morse = Morse.from_plain_text(data.draw(text(
+        alphabet=sorted(c.PLAIN_TEXT_CHARS), min_size=1
+    )))
+    from_format = data.draw(sampled_from([c.BINARY, c.HUMAN_READABLE]))
+    value = morse.binary if from_format == c.BINARY else morse.human_readable
+
+    assert Morse.decode_lenient(value, from_format) == (morse.plain_text, [])
+
+
+def lenient_binary(value):
+    """Lenient binary decoding a gap or character at a time, as a
+    reference."""
+    plain_text = ''
+    errors = []
+    start = len(value) - len(value.lstrip())
+    for index, part in enumerate(re.split('(00+)', value.strip())):
+        if index % 2:
+            word_gaps = len(part) // 7
+            if len(part) % 7 % 3:
+                word_gaps = (len(part) + 2) // 7
+                errors.append((start, part, ' ' * word_gaps))
+            plain_text += ' ' * word_gaps
+        elif part in c.BINARY_TO_PLAIN_TEXT:
+            plain_text += c.BINARY_TO_PLAIN_TEXT[part]
+        elif part:
+            plain_text += '?'
+            errors.append((start, part, '?'))
+        start += len(part)
+    return plain_text, errors
+
+
+@given(
+    lists(
+        elements=sampled_from(
+            ['0', '1', '00', '000', '00000', '0000000', '1011', 'x', ' ']
+        )
+    ).map(''.join),
+)
+def test_decode_lenient_noisy_binary(value):
+    plain_text, errors = Morse.decode_lenient(
+        value, c.BINARY, replacement='?'
+    )
+
+    assert (plain_text, [
+        (error.start, error.value, error.replacement) for error in errors
+    ]) == lenient_binary(value)
+    assert all(
+        value[error.start:error.end] == error.value for error in errors
+    )
+    if errors:
+        with pytest.raises(MorseDecodeError):
+            Morse.from_binary(value)
+    Morse.from_plain_text(
+        Morse.decode_lenient(value, c.BINARY, nearest=True)[0]
+    )
+
+
+@given(
+    lists(
+        elements=sampled_from([' ', '   ', '.', '_', '._', '-', '/'])
+    ).map(''.join),
+)
+def test_decode_lenient_noisy_human_readable(value):
+    plain_text, errors = Morse.decode_lenient(value, c.HUMAN_READABLE)
+
+    assert all(
+        value[error.start:error.end] == error.value and
+        c.HUMAN_READABLE_CHAR_GAP not in error.value
+        for error in errors
+    )
+    if not errors:
+        assert plain_text == Morse.from_human_readable(value).plain_text
+
+
+def with_word_cache(func, *args):
+    cache_words(4)
+    try:
+        return func(*args)
+    finally:
+        cache_words(0)
+
+
+def decoded(decode, value):
+    # Everything decoding keeps, or where it failed
+    try:
+        morse = decode(value)
+    except MorseDecodeError as error:
+        return error.offset
+    return morse.plain_text, morse._human_readable, morse._binary
+
+
+@given(
+    lists(
+        elements=sampled_from(
+            ['0', '1', '000', '0000000', '00000000000000', '1011', '10111']
+        )
+    ).map(''.join),
+    lists(
+        elements=sampled_from([' ', '   ', '      ', '.', '_', '._', '-'])
+    ).map(''.join),
+)
+def test_word_cache_decodes_like_the_decoder(binary, human_readable):
+    for decode, value in (
+        (Morse.from_binary, binary),
+        (Morse.from_human_readable, human_readable),
+    ):
+        assert with_word_cache(decoded, decode, value) == decoded(
+            decode, value
+        )
+
+
+@given(lists(sampled_from(['', 'CQ', 'DE', 'W1AW', '73'])))
+def test_word_cache_encodes_like_the_encoder(words):
+    def encoded():
+        morse = Morse(words)
+        return morse.human_readable, morse.binary
+
+    assert with_word_cache(encoded) == encoded()
+
+
+def test_word_cache_info():
+    assert word_cache_info() == {}
+
+    def convert():
+        for _ in range(3):
+            Morse.from_plain_text('cq cq de w1aw').binary
+        Morse.from_binary('1110111').plain_text
+        return word_cache_info()
+
+    info = with_word_cache(convert)
+
+    binary = info['plain_text_to_binary']
+    assert (binary.hits, binary.misses, binary.currsize) == (9, 3, 3)
+    assert info['binary_to_plain_text'].misses == 1
+    assert info['human_readable_to_plain_text'].misses == 0
+
+
+def test_sos_binary_bytes():
+    morse = Morse.from_plain_text("SOS")
+
+    # 101010001110111011100010101 padded to 32 bits
+    assert morse.binary_bytes == bytes([0xa8, 0xee, 0xe2, 0xa0])
+    assert Morse.from_binary_bytes(morse.binary_bytes) == morse
+    assert Morse.from_binary_bytes(bytearray()) == Morse.from_binary("")
+
+
+@given(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+def test_there_and_back_binary_bytes(value):
+    morse = Morse.from_plain_text(value)
+
+    packed = morse.binary_bytes
+    assert len(packed) == (len(morse.binary) + 7) // 8
+    assert Morse.from_binary_bytes(packed) == morse
+
+
+def test_binary_bytes_bit_length_keeps_trailing_gaps():
+    morse = Morse(["E", "", ""])
+
+    assert Morse.from_binary_bytes(morse.binary_bytes) == Morse(["E"])
+    assert Morse.from_binary_bytes(
+        morse.binary_bytes, bit_length=len(morse.binary)
+    ) == morse
+
+    with pytest.raises(ValueError):
+        Morse.from_binary_bytes(morse.binary_bytes, bit_length=100)
+
+
+def binary_runs(binary):
+    return [
+        (level == '1', len(list(units)))
+        for level, units in itertools.groupby(binary)
+    ]
+
+
+def test_sos_keying_events():
+    events = list(Morse.from_plain_text("SOS").iter_keying_events())
+
+    assert events == [
+        (True, 1), (False, 1), (True, 1), (False, 1), (True, 1),
+        (False, 3),
+        (True, 3), (False, 1), (True, 3), (False, 1), (True, 3),
+        (False, 3),
+        (True, 1), (False, 1), (True, 1), (False, 1), (True, 1),
+    ]
+
+
+@given(lists(sampled_from(sorted(c.PLAIN_TEXT_ALPHABET))).map(''.join))
+def test_keying_events_are_binary_runs(value):
+    morse = Morse.from_plain_text(value)
+    # Keep empty words, e.g. from double spaces
+    morse = Morse(morse.plain_text_words + ['', 'E'])
+
+    events = list(morse.iter_keying_events())
+
+    assert events == binary_runs(morse.binary)
+    assert Morse.from_keying_events(events) == morse
+
+
+@given(
+    lists(
+        elements=sampled_from(['0', '1', '000', '0000000', '101', '111'])
+    ).map(''.join)
+)
+def test_keying_events_decode_like_binary(value):
+    try:
+        expected = Morse.from_binary(value)
+    except MorseDecodeError as error:
+        with pytest.raises(MorseDecodeError) as keying_error:
+            Morse.from_keying_events(binary_runs(value))
+        assert keying_error.value.offset == error.offset
+    else:
+        assert Morse.from_keying_events(binary_runs(value)) == expected
+
+
+def test_keying_events_merge_and_accept_any_levels():
+    events = [(1, 1), ('0', 1), (True, 2), (1, 1), (0, 0), (False, 3)]
+
+    assert Morse.from_keying_events(events) == Morse.from_plain_text('A')
+
+
 def test_parse_finds_correct_format():
     assert (
         Morse.parse("SOS") ==
         Morse.parse("... ___ ...") ==
         Morse.parse("101010001110111011100010101")
     )
+
+
+@given(text(alphabet=sorted(
+    c.BINARY_SYMBOLS | c.HUMAN_READABLE_SYMBOLS | {'E', 'e', '\n', 'é'}
+)))
+@example('')
+@example('1.')
+@example('. E')
+def test_parse_picks_format_by_symbols(value):
+    symbols = set(value.strip().upper())
+    if symbols <= c.BINARY_SYMBOLS:
+        decode = Morse.from_binary
+    elif symbols <= c.HUMAN_READABLE_SYMBOLS:
+        decode = Morse.from_human_readable
+    else:
+        decode = Morse.from_plain_text
+
+    try:
+        expected = decode(value)
+    except ValueError as error:
+        with pytest.raises(type(error)):
+            Morse.parse(value)
+    else:
+        assert Morse.parse(value) == expected
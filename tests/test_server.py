@@ -0,0 +1,169 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+import sweetmorse.constants as c
+import sweetmorse.server
+from sweetmorse.morse import Morse
+from sweetmorse.server import AsyncClient, Client, Server
+
+SOS_BINARY = '101010001110111011100010101'
+# asyncio.all_tasks() is new in Python 3.7
+ALL_TASKS = getattr(asyncio, 'all_tasks', None) or asyncio.Task.all_tasks
+
+
+class RunningServer(object):
+    """A Server on its own event loop in a background thread."""
+
+    def __init__(self, **options):
+        self.loop = asyncio.new_event_loop()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'socket')
+        self.server = self.loop.run_until_complete(
+            Server(**options).start(path=self.path)
+        )
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.server.close()
+        # Connections that are still being handled
+        for task in ALL_TASKS(self.loop):
+            task.cancel()
+            self.loop.run_until_complete(asyncio.wait([task]))
+        self.loop.close()
+        os.rmdir(self.directory)
+
+
+@pytest.fixture
+def server():
+    running = RunningServer()
+    yield running
+    running.stop()
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_convert(server):
+    with Client(path=server.path) as client:
+        assert client.convert('sos', c.PLAIN, c.BINARY) == SOS_BINARY
+        assert client.convert(SOS_BINARY, c.BINARY, c.HUMAN_READABLE) == (
+            '... ___ ...'
+        )
+
+
+def test_convert_many_pipelines(server):
+    messages = ['message {}'.format(number) for number in range(500)]
+
+    with Client(path=server.path) as client:
+        converted = client.convert_many(
+            (message, c.PLAIN, c.HUMAN_READABLE) for message in messages
+        )
+
+    assert converted == [
+        Morse.from_plain_text(message).human_readable for message in messages
+    ]
+
+
+def test_errors_keep_the_connection(server):
+    with Client(path=server.path) as client:
+        with pytest.raises(ValueError, match='not binary Morse'):
+            client.convert_many([
+                ('sos', c.PLAIN, c.BINARY),
+                ('10101000111111', c.BINARY, c.PLAIN),
+            ])
+        with pytest.raises(ValueError, match='Unknown format'):
+            client.convert('sos', c.PLAIN, c.WAV)
+        assert client.convert(SOS_BINARY, c.BINARY, c.PLAIN) == 'SOS'
+
+
+def test_malformed_header_closes_the_connection(server):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(server.path)
+        connection.sendall(b'PLAIN BINARY lots\nsos')
+        with connection.makefile('rb') as responses:
+            assert responses.readline().startswith(b'ERROR ')
+            responses.readline()
+            assert responses.read() == b''
+
+
+def test_async_client_shares_the_connection(server):
+    messages = ['cq {}'.format(number) for number in range(100)]
+
+    async def convert_all():
+        client = await AsyncClient.connect(path=server.path)
+        try:
+            return await asyncio.gather(*(
+                client.convert(message, c.PLAIN, c.BINARY)
+                for message in messages
+            ))
+        finally:
+            client.close()
+
+    assert run(convert_all()) == [
+        Morse.from_plain_text(message).binary for message in messages
+    ]
+
+
+def test_large_payloads_go_to_workers():
+    running = RunningServer(jobs=1, offload_size=10)
+    try:
+        with Client(path=running.path) as client:
+            assert client.convert_many([
+                ('sos', c.PLAIN, c.BINARY),
+                ('sos sos sos sos', c.PLAIN, c.BINARY),
+            ]) == [
+                SOS_BINARY,
+                Morse.from_plain_text('sos sos sos sos').binary,
+            ]
+            with pytest.raises(ValueError, match='cannot be Morse encoded'):
+                client.convert('sos sos sos sos ~', c.PLAIN, c.BINARY)
+    finally:
+        running.stop()
+
+
+def failing_convert(value, from_format, to_format):
+    # Run on a worker process in place of the conversion
+    if value.startswith('exit'):
+        os._exit(1)
+    raise RuntimeError('worker failed')
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != 'fork',
+    reason='workers only see the patched conversion when forked',
+)
+def test_worker_failures_become_errors(monkeypatch):
+    monkeypatch.setattr(sweetmorse.server, '_convert', failing_convert)
+    running = RunningServer(jobs=1, offload_size=10)
+    try:
+        with Client(path=running.path) as client:
+            with pytest.raises(ValueError, match='worker failed'):
+                client.convert('raise sos sos sos', c.PLAIN, c.BINARY)
+            with pytest.raises(ValueError, match='Conversion failed'):
+                client.convert('exit sos sos sos', c.PLAIN, c.BINARY)
+
+            # A new pool takes over from the one the worker died in
+            monkeypatch.undo()
+            assert client.convert_many([
+                ('sos', c.PLAIN, c.BINARY),
+                ('sos sos sos sos', c.PLAIN, c.BINARY),
+            ]) == [
+                SOS_BINARY,
+                Morse.from_plain_text('sos sos sos sos').binary,
+            ]
+    finally:
+        running.stop()
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import sweetmorse
+from sweetmorse.alphabet import Alphabet
+
+# Milliseconds that importing sweetmorse.main may take, measured by
+# ``python -X importtime``.  It takes about 3 on a laptop, and about 13
+# when it imported argparse and the audio modules up front.
+IMPORT_BUDGET_MS = 8
+# Never needed to convert between the text formats, and not imported by
+# the interpreter itself
+HEAVY_MODULES = (
+    'argparse', 'numpy', 'wave', 'sweetmorse.audio', 'sweetmorse.tone',
+)
+
+
+def run_python(code, stdin='', options=()):
+    env = dict(os.environ)
+    # Written bytecode, so that only the first run compiles the source
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.path.dirname(
+        os.path.dirname(os.path.abspath(sweetmorse.__file__))
+    )
+    return subprocess.run(
+        [sys.executable] + list(options) + ['-c', code],
+        input=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, env=env, check=True,
+    )
+
+
+def import_time_ms(stderr, module):
+    # Cumulative microseconds from lines like
+    # ``import time:   self [us] | cumulative | imported package``
+    for line in stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000.0
+    raise AssertionError('{} was not imported'.format(module))
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason='-X importtime is new in Python 3.7'
+)
+def test_import_within_budget():
+    best = min(
+        import_time_ms(
+            run_python(
+                'import sweetmorse.main', options=('-X', 'importtime')
+            ).stderr,
+            'sweetmorse.main',
+        )
+        for _ in range(5)
+    )
+
+    assert best < IMPORT_BUDGET_MS
+
+
+def test_text_conversion_imports_nothing_heavy():
+    result = run_python(
+        'import sys\n'
+        'sys.argv = ["sweetmorse", "PLAIN", "BINARY"]\n'
+        'from sweetmorse.main import main\n'
+        'main()\n'
+        'print(sorted(sys.modules))\n',
+        stdin='sos\n',
+    )
+    output, modules = result.stdout.splitlines()
+
+    assert output == '101010001110111011100010101'
+    for module in HEAVY_MODULES:
+        assert repr(module) not in modules
+
+
+def test_alphabet_tables_are_made_on_first_use():
+    alphabet = Alphabet({'A': '._', 'B': '_...'})
+
+    assert 'plain_text_to_binary' not in vars(alphabet)
+    assert alphabet.plain_text_to_binary == {
+        'A': '10111', 'B': '111010101',
+    }
+    assert 'plain_text_to_binary' in vars(alphabet)
@@ -0,0 +1,176 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import sweetmorse
+import sweetmorse.constants as c
+import sweetmorse.morse
+from sweetmorse.alphabet import Alphabet
+from sweetmorse.morse import Morse, MorseDecodeError
+from sweetmorse.lines import convert
+from sweetmorse.stats import OTHER, collect
+from sweetmorse.stream import MorseEncoder
+
+MESSAGE = 'THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG 0123456789 ' * 200
+
+
+def run_cli(arguments, stdin=''):
+    # Standard error of the CLI run with ``arguments``
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.path.dirname(
+        os.path.dirname(os.path.abspath(sweetmorse.__file__))
+    )
+    return subprocess.run(
+        [sys.executable, '-m', 'sweetmorse.main'] + arguments,
+        input=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, env=env, check=True,
+    ).stderr
+
+
+def phase_shares(report):
+    # Shares in percent of every phase in a report, the last one OTHER's
+    lines = report.splitlines()
+    start = [line.split()[0] for line in lines].index('phase') + 1
+    return [float(line.split()[-1].rstrip('%')) for line in lines[start:]]
+
+
+def test_counts_conversions_and_phases():
+    with collect() as stats:
+        morse = Morse.from_plain_text('sos sos')
+        binary_bytes = morse.binary_bytes
+        assert Morse.parse(morse.binary) == morse
+
+    assert stats.conversions['from_plain_text'][:2] == [1, 7]
+    assert stats.conversions['binary_bytes'][:2] == [1, len(binary_bytes)]
+    # Once by binary_bytes and once above
+    assert stats.conversions['binary'][:2] == [2, 2 * len(morse.binary)]
+    assert stats.conversions['parse'][:2] == [1, len(morse.binary)]
+    assert stats.phases['validate'][0] == 1
+    assert stats.phases['split and look up'][0] == 1
+    assert stats.phases['look up and join'][0] == 1
+    # Time in binary within binary_bytes only counts once
+    assert 0 < stats.seconds < sum(
+        seconds for _, _, seconds in stats.conversions.values()
+    )
+
+
+def test_errors_are_timed_and_raised():
+    with collect() as stats:
+        with pytest.raises(MorseDecodeError):
+            Morse.from_binary('1111')
+
+    assert stats.conversions['from_binary'][0] == 1
+    assert stats.phases['locate error'][0] == 1
+
+
+def test_counts_values_given_by_name():
+    binary = Morse.from_plain_text('sos').binary
+
+    with collect() as stats:
+        assert Morse.from_binary(value=binary).plain_text == 'SOS'
+        with pytest.raises(MorseDecodeError):
+            Morse.from_binary(value='1111')
+
+    assert stats.conversions['from_binary'][:2] == [2, len(binary) + 4]
+
+
+def test_stream_encoder_is_timed():
+    with collect() as stats:
+        encoder = MorseEncoder(c.BINARY)
+        binary = encoder.feed('sos sos') + encoder.finish()
+
+    assert binary == Morse.from_plain_text('sos sos').binary
+    calls, chars, _ = stats.conversions['pieces from plain text']
+    assert chars == 7
+    assert stats.phases['validate'][0] == calls
+    assert stats.seconds > 0
+
+
+def test_nothing_is_instrumented_outside():
+    originals = (
+        vars(Morse)['from_binary'],
+        vars(Morse)['binary'],
+        vars(Alphabet)['tokens'],
+        sweetmorse.morse._look_up_pieces,
+    )
+
+    with collect():
+        assert vars(Morse)['from_binary'] is not originals[0]
+        with pytest.raises(RuntimeError):
+            with collect():
+                pass
+
+    assert (
+        vars(Morse)['from_binary'],
+        vars(Morse)['binary'],
+        vars(Alphabet)['tokens'],
+        sweetmorse.morse._look_up_pieces,
+    ) == originals
+
+
+def test_report():
+    with collect() as stats:
+        Morse.from_human_readable('... ___ ...').binary_bytes
+    report = io.StringIO()
+
+    stats.report(report)
+
+    lines = report.getvalue().splitlines()
+    assert lines[0].split() == [
+        'conversion', 'calls', 'chars', 'seconds', 'chars/s',
+    ]
+    assert [line.split()[0] for line in lines[1:4]] == [
+        'binary', 'binary_bytes', 'from_human_readable',
+    ]
+    assert lines[-1].startswith(OTHER)
+
+
+def test_lines_imported_before_collecting_are_counted():
+    with collect() as stats:
+        assert list(convert(['sos', 'cq'], 'PLAIN', 'BINARY')) == [
+            Morse.from_plain_text('sos').binary,
+            Morse.from_plain_text('cq').binary,
+        ]
+
+    # Twice by the lines, and twice above
+    assert stats.conversions['from_plain_text'][0] == 4
+    assert stats.conversions['binary'][0] == 4
+    assert stats.seconds > 0
+
+
+@pytest.mark.parametrize('arguments', [
+    ['BINARY', 'PLAIN', '--stream'],
+    ['PLAIN', 'HUMAN_READABLE', '--stream'],
+    ['BINARY', 'PLAIN', '--jobs', '1'],
+    ['BINARY', 'PLAIN', '--input'],
+    ['BINARY', 'PLAIN', '--input', '--jobs', '1'],
+    ['PLAIN', 'BINARY', '--lines'],
+])
+def test_cli_shares_add_up(arguments, tmpdir):
+    from_format = arguments[0]
+    value = (
+        MESSAGE if from_format == 'PLAIN'
+        else Morse.from_plain_text(MESSAGE).binary
+    )
+    stdin = value
+    if '--input' in arguments:
+        path = tmpdir.join('input')
+        path.write(value)
+        index = arguments.index('--input') + 1
+        arguments = arguments[:index] + [str(path)] + arguments[index:]
+        stdin = ''
+    elif '--lines' in arguments:
+        stdin = value.replace(' ', '\n')
+
+    report = run_cli(arguments + ['--stats'], stdin=stdin)
+
+    pieces = 'pieces {} plain text'.format(
+        'from' if from_format == 'PLAIN' else 'to'
+    )
+    assert pieces in report or '--lines' in arguments
+    shares = phase_shares(report)
+    assert all(share >= 0 for share in shares)
+    assert sum(shares) == pytest.approx(100, abs=0.1 * len(shares))
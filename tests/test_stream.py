@@ -0,0 +1,153 @@
+import io
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import (
+    text,
+    lists,
+    data,
+    integers,
+    sampled_from,
+)
+
+import sweetmorse.constants as c
+from sweetmorse.morse import Morse, MorseDecodeError
+from sweetmorse.stream import (
+    MorseDecoder,
+    MorseEncoder,
+    convert,
+    convert_file,
+)
+
+FORMATS = (c.PLAIN, c.HUMAN_READABLE, c.BINARY)
+
+
+def to_format(morse, format):
+    return (
+        morse.plain_text
+        if format == c.PLAIN
+        else morse.human_readable
+        if format == c.HUMAN_READABLE
+        else morse.binary
+    )
+
+
+def from_format(value, format):
+    return (
+        Morse.from_plain_text(value)
+        if format == c.PLAIN
+        else Morse.from_human_readable(value)
+        if format == c.HUMAN_READABLE
+        else Morse.from_binary(value)
+    )
+
+
+def split_at(value, cuts):
+    cuts = sorted(set(cut % (len(value) + 1) for cut in cuts))
+    return [
+        value[start:end]
+        for start, end in zip([0] + cuts, cuts + [len(value)])
+    ]
+
+
+def test_sos_in_single_characters():
+    decoder = MorseDecoder(c.BINARY)
+    pieces = [decoder.feed(char) for char in '101010001110111011100010101\n']
+    pieces.append(decoder.finish())
+
+    assert ''.join(pieces) == 'SOS'
+    # Output arrives before the input is exhausted
+    assert ''.join(pieces[:-1]) == 'SO'
+
+
+def test_encoder_carries_char_gap():
+    encoder = MorseEncoder(c.HUMAN_READABLE)
+    pieces = [encoder.feed('S'), encoder.feed('O'), encoder.feed('S\n')]
+    pieces.append(encoder.finish())
+
+    assert ''.join(pieces) == '... ___ ...'
+
+
+@given(data())
+def test_decoder_matches_morse(data):
+    plain = data.draw(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+    format = data.draw(sampled_from(FORMATS))
+    value = '\n ' + to_format(Morse.from_plain_text(plain), format) + ' \n'
+    cuts = data.draw(lists(integers(min_value=0)))
+
+    decoder = MorseDecoder(format)
+    pieces = [decoder.feed(chunk) for chunk in split_at(value, cuts)]
+    pieces.append(decoder.finish())
+
+    assert ''.join(pieces) == from_format(value, format).plain_text
+
+
+@given(data())
+def test_convert_matches_morse(data):
+    plain = data.draw(text(alphabet=list(c.PLAIN_TEXT_ALPHABET)))
+    source = data.draw(sampled_from(FORMATS))
+    target = data.draw(sampled_from(FORMATS))
+    value = to_format(Morse.from_plain_text(plain), source)
+    cuts = data.draw(lists(integers(min_value=0)))
+
+    output = ''.join(convert(split_at(value, cuts), source, target))
+
+    assert output == to_format(from_format(value, source), target)
+
+
+@given(data())
+def test_leading_word_gaps_survive(data):
+    value = (
+        c.BINARY_WORD_GAP * 2 +
+        c.PLAIN_TEXT_TO_BINARY['E'] +
+        c.BINARY_WORD_GAP
+    )
+    cuts = data.draw(lists(integers(min_value=0)))
+
+    output = ''.join(convert(split_at(value, cuts), c.BINARY, c.BINARY))
+
+    assert output == value
+
+
+@pytest.mark.parametrize(
+    "format,value",
+    (
+        (c.PLAIN, 'SOS\tSOS'),
+        (c.HUMAN_READABLE, '... ___ ...\n...'),
+        (c.BINARY, '10101000011101110111'),
+    )
+)
+def test_invalid_input_raises(format, value):
+    with pytest.raises(ValueError):
+        list(convert(split_at(value, [3, 7]), format, c.PLAIN))
+
+
+@given(lists(integers(min_value=0)))
+def test_binary_error_offset_across_chunks(cuts):
+    value = '\n1010100011101110111000101010000101'
+
+    with pytest.raises(MorseDecodeError) as error:
+        list(convert(split_at(value, cuts), c.BINARY, c.PLAIN))
+
+    assert error.value.offset == 28
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        MorseDecoder('MORSE')
+    with pytest.raises(ValueError):
+        MorseEncoder('MORSE')
+
+
+def test_convert_file():
+    input_file = io.StringIO('Hello, Morse World! ' * 100 + '\n')
+    output_file = io.StringIO()
+
+    convert_file(
+        input_file, output_file, c.PLAIN, c.BINARY, chunk_size=7
+    )
+
+    assert output_file.getvalue() == Morse.from_plain_text(
+        input_file.getvalue()
+    ).binary
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from hypothesis import given
+from hypothesis.strategies import floats, text
+
+import sweetmorse.constants as c
+from sweetmorse.edges import EdgeDecoder, decode_edges
+from sweetmorse.morse import Morse
+from sweetmorse.timing import (
+    AdaptiveTiming,
+    FixedTiming,
+    unit_duration_to_wpm,
+    wpm_to_unit_duration,
+)
+
+MESSAGE = 'THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG 0123456789'
+
+
+def to_edges(binary, start_wpm, end_wpm=None, jitter=0.0, seed=0):
+    """Edges of ``binary`` keyed at a speed moving from ``start_wpm`` to
+    ``end_wpm``, with every run off by up to ``jitter`` of a unit."""
+    if end_wpm is None:
+        end_wpm = start_wpm
+    rng = random.Random(seed)
+    edges = []
+    timestamp = 0.0
+    level = '0'
+    for index, value in enumerate(binary + '0'):
+        wpm = start_wpm + (end_wpm - start_wpm) * index / max(1, len(binary))
+        if value != level:
+            noise = rng.uniform(-jitter, jitter)
+            edges.append((timestamp + noise * wpm_to_unit_duration(wpm),
+                          value))
+            level = value
+        timestamp += wpm_to_unit_duration(wpm)
+    return edges
+
+
+def test_paris_at_20_wpm():
+    assert wpm_to_unit_duration(20) == pytest.approx(0.06)
+    assert unit_duration_to_wpm(0.06) == pytest.approx(20)
+
+
+@pytest.mark.parametrize('guess_wpm', [15, 25, 30])
+def test_close_guess(guess_wpm):
+    edges = to_edges(Morse.from_plain_text(MESSAGE).binary, 20, jitter=0.2)
+    timing = AdaptiveTiming(wpm_to_unit_duration(guess_wpm))
+
+    assert decode_edges(edges, timing=timing) == MESSAGE
+
+
+@pytest.mark.parametrize('guess_wpm, wpm', [
+    (20, 10), (20, 40), (10, 20), (40, 20), (12, 20),
+])
+@pytest.mark.parametrize('jitter', [0.0, 0.1, 0.2])
+def test_acquires_the_speed_within_twice_the_guess(guess_wpm, wpm, jitter):
+    binary = Morse.from_plain_text(MESSAGE).binary
+
+    for seed in range(10):
+        edges = to_edges(binary, wpm, jitter=jitter, seed=seed)
+        timing = AdaptiveTiming(wpm_to_unit_duration(guess_wpm))
+
+        assert decode_edges(edges, timing=timing) == MESSAGE
+        assert unit_duration_to_wpm(timing.unit_duration) == pytest.approx(
+            wpm, rel=0.1
+        )
+
+
+@pytest.mark.parametrize('wpm', [10, 16, 24, 33, 36, 38, 40])
+def test_short_calls_at_the_default_guess(wpm):
+    for message in ('CQ', 'CQ CQ DE K1ABC K', 'SOS', '73'):
+        edges = to_edges(
+            Morse.from_plain_text(message).binary, wpm, jitter=0.1
+        )
+
+        assert decode_edges(edges, timing=AdaptiveTiming()) == message
+
+
+def test_holds_characters_until_the_speed_is_acquired():
+    # At 40 WPM, twice the guess, the dashes of C would pass for dots
+    edges = to_edges(Morse.from_plain_text('CQ').binary, 40)
+    timing = AdaptiveTiming()
+    decoder = EdgeDecoder(timing=timing)
+    for timestamp, level in edges[:4]:
+        decoder.push(timestamp, level)
+
+    assert decoder.read() == ''
+    assert not timing.acquired
+    for timestamp, level in edges[4:]:
+        decoder.push(timestamp, level)
+    assert decoder.read() == 'C'
+    assert timing.acquired
+    assert decoder.finish() == 'Q'
+
+
+def test_a_long_pause_ends_the_acquisition():
+    edges = to_edges(Morse.from_plain_text('K').binary, 40)
+    decoder = EdgeDecoder(timing=AdaptiveTiming())
+    for timestamp, level in edges:
+        decoder.push(timestamp, level)
+    end = edges[-1][0]
+
+    assert decoder.read(now=end + wpm_to_unit_duration(40) * 5) == ''
+    assert decoder.read(now=end + wpm_to_unit_duration(40) * 30) == 'K '
+
+
+@pytest.mark.parametrize('start_wpm, end_wpm', [(15, 30), (30, 15)])
+def test_follows_drifting_speed(start_wpm, end_wpm):
+    message = ' '.join([MESSAGE] * 3)
+    edges = to_edges(
+        Morse.from_plain_text(message).binary, start_wpm, end_wpm, jitter=0.1
+    )
+    timing = AdaptiveTiming(wpm_to_unit_duration(start_wpm))
+
+    assert decode_edges(edges, timing=timing) == message
+    assert unit_duration_to_wpm(timing.unit_duration) == pytest.approx(
+        end_wpm, rel=0.15
+    )
+
+
+@given(
+    text(alphabet=list(c.PLAIN_TEXT_ALPHABET)),
+    floats(min_value=10, max_value=40),
+)
+def test_adaptive_matches_morse_with_jitter(value, wpm):
+    morse = Morse.from_plain_text(value)
+
+    edges = to_edges(morse.binary, wpm, jitter=0.2)
+    timing = AdaptiveTiming(wpm_to_unit_duration(wpm))
+
+    assert decode_edges(edges, timing=timing) == morse.plain_text
+
+
+def test_fixed_timing_is_the_default():
+    edges = to_edges(Morse.from_plain_text(MESSAGE).binary, 20)
+
+    assert decode_edges(edges, wpm_to_unit_duration(20)) == MESSAGE
+    assert decode_edges(
+        edges, timing=FixedTiming(wpm_to_unit_duration(20))
+    ) == MESSAGE
+
+
+def test_unit_duration_or_timing():
+    with pytest.raises(ValueError):
+        decode_edges([], wpm_to_unit_duration(20), timing=AdaptiveTiming())
+    with pytest.raises(ValueError):
+        decode_edges([])
+    with pytest.raises(ValueError):
+        AdaptiveTiming(0)
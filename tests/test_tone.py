@@ -0,0 +1,204 @@
+import contextlib
+import io
+import random
+import sys
+from array import array
+
+import pytest
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, sampled_from
+
+import sweetmorse.constants as c
+from sweetmorse import audio, tone
+from sweetmorse.morse import Morse
+from sweetmorse.timing import (
+    AdaptiveTiming,
+    FixedTiming,
+    wpm_to_unit_duration,
+)
+
+BACKENDS = ('numpy', 'python')
+MESSAGE = 'THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG 0123456789'
+
+
+@contextlib.contextmanager
+def backend(name):
+    if name == 'numpy':
+        if tone.np is None:
+            pytest.skip('NumPy is not installed')
+        yield
+    else:
+        np, tone.np = tone.np, None
+        try:
+            yield
+        finally:
+            tone.np = np
+
+
+def with_noise(pcm, deviation, seed=0):
+    rng = random.Random(seed)
+    samples = array('h', pcm)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    noisy = array('h', (
+        max(-32768, min(32767, int(sample + rng.gauss(0, deviation))))
+        for sample in samples
+    ))
+    if sys.byteorder == 'big':
+        noisy.byteswap()
+    return noisy.tobytes()
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+@pytest.mark.parametrize('wpm', [5, 20, 40])
+def test_round_trip(name, wpm):
+    morse = Morse.from_plain_text(MESSAGE)
+    pcm = morse.to_pcm(wpm=wpm)
+
+    with backend(name):
+        decoded = tone.decode_pcm(
+            pcm, timing=FixedTiming(wpm_to_unit_duration(wpm))
+        )
+
+    assert decoded == morse
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+@pytest.mark.parametrize('wpm', [10, 13, 20, 27, 33, 36, 40])
+def test_round_trip_with_the_default_timing(name, wpm):
+    morse = Morse.from_plain_text(MESSAGE)
+
+    with backend(name):
+        decoded = tone.decode_pcm(morse.to_pcm(wpm=wpm))
+
+    assert decoded == morse
+
+
+def test_decodes_past_characters_that_are_not_morse():
+    # SO, eight dots, then S
+    binary = Morse.from_plain_text('SO').binary + '000' + '10' * 7 + '1' + (
+        '000' + Morse.from_plain_text('S').binary
+    )
+    pcm = b''.join(audio.iter_pcm(binary))
+    errors = []
+
+    decoded = tone.decode_pcm(pcm, errors=errors)
+
+    assert decoded == Morse.from_plain_text('SOS')
+    assert [(error.start, error.value) for error in errors] == [
+        (len(Morse.from_plain_text('SO').binary) + 3, '10' * 7 + '1'),
+    ]
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_noisy_round_trip(name):
+    morse = Morse.from_plain_text(MESSAGE)
+    pcm = with_noise(morse.to_pcm(frequency=550, sample_rate=11025), 8000)
+
+    with backend(name):
+        decoded = tone.decode_pcm(
+            pcm, sample_rate=11025, frequency=550, timing=AdaptiveTiming()
+        )
+
+    assert decoded == morse
+
+
+@settings(max_examples=20)
+@given(
+    lists(sampled_from(sorted(c.PLAIN_TEXT_CHARS)), min_size=1)
+    .map(''.join),
+    lists(integers(min_value=1, max_value=5000), max_size=5),
+)
+def test_feed_in_chunks(value, cuts):
+    morse = Morse.from_plain_text(value)
+    pcm = morse.to_pcm()
+    decoder = tone.ToneDecoder(
+        timing=FixedTiming(wpm_to_unit_duration(audio.DEFAULT_WPM))
+    )
+
+    decoded = []
+    start = 0
+    for cut in sorted(cuts):
+        decoded.append(decoder.feed(pcm[start:cut]))
+        start = max(start, cut)
+    decoded.append(decoder.feed(pcm[start:]))
+    decoded.append(decoder.finish())
+
+    assert ''.join(decoded) == morse.plain_text
+
+
+def test_other_tones_are_not_heard():
+    pcm = Morse.from_plain_text('SOS').to_pcm(frequency=2000)
+
+    assert tone.decode_pcm(pcm, frequency=700).plain_text == ''
+
+
+def test_decode_wav():
+    morse = Morse.from_plain_text(MESSAGE)
+    wav_file = io.BytesIO()
+    audio.write_wav(wav_file, morse.binary, sample_rate=16000, wpm=25)
+    wav_file.seek(0)
+
+    decoded = tone.decode_wav(
+        wav_file,
+        timing=AdaptiveTiming(wpm_to_unit_duration(25)),
+        chunk_frames=1000,
+    )
+
+    assert decoded == morse
+
+
+def mix(*pcms):
+    channels = [_samples(pcm) for pcm in pcms]
+    length = max(map(len, channels))
+    mixed = array('h', [0] * length)
+    for samples in channels:
+        for index, sample in enumerate(samples):
+            mixed[index] += sample // len(channels)
+    if sys.byteorder == 'big':
+        mixed.byteswap()
+    return mixed.tobytes()
+
+
+def _samples(pcm):
+    samples = array('h', pcm)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_multiple_tones(name):
+    messages = {500: 'CQ CQ DE K1ABC', 650: 'SOS', 800: MESSAGE}
+    pcm = mix(*(
+        Morse.from_plain_text(message).to_pcm(frequency=frequency, wpm=15)
+        for frequency, message in sorted(messages.items())
+    ))
+
+    with backend(name):
+        decoder = tone.MultiToneDecoder(
+            sorted(messages),
+            timing=lambda: FixedTiming(wpm_to_unit_duration(15)),
+        )
+        decoded = [
+            fed + finished
+            for fed, finished in zip(decoder.feed(pcm), decoder.finish())
+        ]
+
+    # Channels that finish first hear the rest as a word gap
+    assert [text.rstrip() for text in decoded] == [
+        message for _, message in sorted(messages.items())
+    ]
+
+
+def test_frame_size_separates_channels():
+    decoder = tone.MultiToneDecoder([400, 460, 1000], sample_rate=8000)
+
+    # 400 and 460 Hz are two bins apart with 267 samples a frame
+    assert decoder.frame_size == 512
+
+
+def test_frequencies_too_close():
+    with pytest.raises(ValueError):
+        tone.MultiToneDecoder([700, 710], frame_size=64)